@@ -0,0 +1,30 @@
+-- Background job queue
+-- Workers claim batches with FOR UPDATE SKIP LOCKED (see app/db/job_store.py)
+
+SET search_path TO app, public;
+
+CREATE TABLE IF NOT EXISTS app.jobs (
+    id BIGSERIAL PRIMARY KEY,
+    queue VARCHAR(100) NOT NULL,
+    task VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_until TIMESTAMP WITH TIME ZONE,
+    locked_by VARCHAR(255),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT jobs_status_valid CHECK (status IN ('queued', 'running', 'done', 'failed'))
+);
+
+-- Partial index covering only claimable jobs keeps dequeue scans small
+CREATE INDEX IF NOT EXISTS idx_jobs_dequeue
+    ON app.jobs (queue, priority DESC, run_at)
+    WHERE status IN ('queued', 'running');
+
+GRANT ALL PRIVILEGES ON app.jobs TO CURRENT_USER;
+GRANT ALL PRIVILEGES ON SEQUENCE app.jobs_id_seq TO CURRENT_USER;
@@ -0,0 +1,22 @@
+-- Keep last_login writes cheap
+-- last_login is flushed in bulk by a write-behind buffer (see app/services/last_login.py);
+-- it records activity, not a change to the user, so it should not bump updated_at
+
+SET search_path TO app, public;
+
+CREATE OR REPLACE FUNCTION app.trigger_set_user_timestamp()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF to_jsonb(NEW) - 'last_login' - 'updated_at'
+      IS DISTINCT FROM to_jsonb(OLD) - 'last_login' - 'updated_at' THEN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_timestamp ON app.users;
+CREATE TRIGGER set_timestamp
+    BEFORE UPDATE ON app.users
+    FOR EACH ROW
+    EXECUTE FUNCTION app.trigger_set_user_timestamp();
@@ -0,0 +1,73 @@
+-- Per-owner item aggregates
+-- Kept current by a trigger on app.items and reconciled periodically
+-- (see app/services/item_stats.py), so dashboards read one row per owner
+-- instead of grouping app.items
+
+SET search_path TO app, public;
+
+CREATE TABLE IF NOT EXISTS app.owner_item_stats (
+    owner_id UUID PRIMARY KEY REFERENCES app.users(id) ON DELETE CASCADE,
+    item_count BIGINT NOT NULL DEFAULT 0,
+    active_count BIGINT NOT NULL DEFAULT 0,
+    price_total DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    tax_total DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION app.apply_owner_item_delta(
+    p_owner_id UUID,
+    p_items BIGINT,
+    p_active BIGINT,
+    p_price DECIMAL,
+    p_tax DECIMAL
+) RETURNS VOID AS $$
+BEGIN
+  INSERT INTO app.owner_item_stats AS s
+      (owner_id, item_count, active_count, price_total, tax_total)
+  VALUES (p_owner_id, p_items, p_active, p_price, p_tax)
+  ON CONFLICT (owner_id) DO UPDATE SET
+      item_count = s.item_count + EXCLUDED.item_count,
+      active_count = s.active_count + EXCLUDED.active_count,
+      price_total = s.price_total + EXCLUDED.price_total,
+      tax_total = s.tax_total + EXCLUDED.tax_total,
+      updated_at = CURRENT_TIMESTAMP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION app.trigger_owner_item_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM app.apply_owner_item_delta(
+        OLD.owner_id, -1, -(OLD.is_active IS TRUE)::int,
+        -COALESCE(OLD.price, 0), -COALESCE(OLD.tax, 0));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM app.apply_owner_item_delta(
+        NEW.owner_id, 1, (NEW.is_active IS TRUE)::int,
+        COALESCE(NEW.price, 0), COALESCE(NEW.tax, 0));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only changes to aggregated columns touch the owner's row
+DROP TRIGGER IF EXISTS owner_item_stats ON app.items;
+CREATE TRIGGER owner_item_stats
+    AFTER INSERT OR DELETE OR UPDATE OF owner_id, is_active, price, tax ON app.items
+    FOR EACH ROW
+    EXECUTE FUNCTION app.trigger_owner_item_stats();
+
+-- Backfill from existing items
+INSERT INTO app.owner_item_stats (owner_id, item_count, active_count, price_total, tax_total)
+SELECT owner_id,
+       count(*),
+       count(*) FILTER (WHERE is_active),
+       COALESCE(sum(price), 0),
+       COALESCE(sum(tax), 0)
+FROM app.items
+GROUP BY owner_id
+ON CONFLICT (owner_id) DO NOTHING;
+
+GRANT ALL PRIVILEGES ON app.owner_item_stats TO CURRENT_USER;
+GRANT SELECT ON app.owner_item_stats TO readonly;
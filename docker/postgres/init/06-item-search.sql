@@ -0,0 +1,14 @@
+-- Full-text search over items
+-- A generated tsvector column, maintained by Postgres on every write, backs
+-- GET /api/v1/items/search (see app/services/item_search.py)
+
+SET search_path TO app, public;
+
+-- Titles weigh more than descriptions in ts_rank_cd
+ALTER TABLE app.items ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_items_search ON app.items USING GIN (search_vector);
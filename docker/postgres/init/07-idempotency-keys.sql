@@ -0,0 +1,21 @@
+-- Idempotency keys
+-- Responses to requests sent with an Idempotency-Key header, replayed to
+-- retries until expires_at (see app/services/idempotency.py). Expired rows
+-- are deleted by the retention sweeper.
+
+SET search_path TO app, public;
+
+CREATE TABLE IF NOT EXISTS app.idempotency_keys (
+    id VARCHAR(64) PRIMARY KEY,
+    fingerprint VARCHAR(64) NOT NULL,
+    status SMALLINT,
+    headers JSONB,
+    body BYTEA,
+    locked_until TIMESTAMP WITH TIME ZONE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires
+    ON app.idempotency_keys (expires_at);
+
+GRANT ALL PRIVILEGES ON app.idempotency_keys TO CURRENT_USER;
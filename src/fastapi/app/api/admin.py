@@ -0,0 +1,466 @@
+"""Administrative diagnostics endpoints."""
+
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse
+
+from app.core.concurrency import concurrency_limiter
+from app.core.config import settings
+from app.core.http_cache import response_cache
+from app.core.invalidation import invalidation_bus
+from app.core.memory import GROUP_BY, memory_profiler
+from app.core.profiling import profile_store, to_collapsed, to_speedscope
+from app.core.settings_reload import SettingsReloadError, settings_reloader
+from app.core.shared_cache import shared_cache
+from app.core.worker_control import worker_control
+from app.services.external_api import external_api
+from app.services.item_search import item_search
+from app.services.retention import retention_sweeper
+
+router = APIRouter()
+
+
+def check_admin_access() -> None:
+    """Check if admin endpoints are accessible."""
+    if settings.is_production and not settings.FEATURE_ADMIN_PANEL:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled in production",
+        )
+
+
+def check_admin_panel_enabled() -> None:
+    """Check if the admin panel feature is enabled."""
+    if not settings.FEATURE_ADMIN_PANEL:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Requires FEATURE_ADMIN_PANEL",
+        )
+
+
+MEMORY_DEPENDENCIES = [Depends(check_admin_access), Depends(check_admin_panel_enabled)]
+
+AllWorkers = Query(False, description="Run in every worker, not just this one")
+CacheTags = Query(None, description="Cache tags to purge")
+GroupBy = Query("lineno", pattern=f"^({'|'.join(GROUP_BY)})$")
+
+
+async def run_memory_command(
+    command: str, params: dict[str, Any], all_workers: bool
+) -> dict[str, Any]:
+    """Run a memory diagnostics command here or in every worker, keyed by PID."""
+    try:
+        if all_workers:
+            results = await worker_control.broadcast(
+                "memory",
+                command,
+                params,
+                timeout=settings.WORKER_CONTROL_TIMEOUT_SECONDS,
+            )
+            return {"workers": {str(pid): result for pid, result in results.items()}}
+        result = await asyncio.to_thread(memory_profiler.run, command, params)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0]
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        ) from e
+    return {"workers": {str(result["pid"]): result}}
+
+
+@router.get(
+    "/profiles",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="List profiles",
+    description="List captured request profiles and per-route aggregates",
+    dependencies=[Depends(check_admin_access)],
+)
+async def list_profiles() -> dict[str, Any]:
+    """
+    List captured profiles.
+
+    Returns recent on-demand profiles and continuous per-route aggregates.
+    """
+    return {
+        "profiles": profile_store.list_profiles(),
+        "routes": profile_store.list_routes(),
+    }
+
+
+@router.get(
+    "/profiles/routes",
+    status_code=status.HTTP_200_OK,
+    summary="Get route profile",
+    description="Get the aggregated continuous profile for a route",
+    dependencies=[Depends(check_admin_access)],
+    response_model=None,
+)
+async def get_route_profile(
+    route: str = Query(..., description="Route path, e.g. /api/v1/items"),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+) -> dict[str, Any] | PlainTextResponse:
+    """
+    Get the aggregated profile for a route.
+
+    Returns speedscope JSON or collapsed stacks for flamegraph tools.
+    """
+    samples = profile_store.route_samples(route)
+    if samples is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No profile collected for route {route}",
+        )
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(samples))
+    return to_speedscope(samples, route, settings.PROFILING_INTERVAL_MS / 1000)
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Get profile",
+    description="Get an on-demand request profile",
+    dependencies=[Depends(check_admin_access)],
+    response_model=None,
+)
+async def get_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+) -> dict[str, Any] | PlainTextResponse:
+    """
+    Get a captured profile.
+
+    Returns speedscope JSON or collapsed stacks for flamegraph tools.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(profile.samples))
+    return profile.to_speedscope()
+
+
+@router.get(
+    "/concurrency",
+    response_model=dict[str, int],
+    status_code=status.HTTP_200_OK,
+    summary="Get concurrency limiter state",
+    description="Get the adaptive in-flight limit and load shedding counters",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_concurrency() -> dict[str, int]:
+    """
+    Get concurrency limiter state.
+
+    Returns the current limit, in-flight and queued requests, and counters.
+    """
+    return concurrency_limiter.snapshot()
+
+
+@router.get(
+    "/external-api",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get external API client state",
+    description="Get the circuit breaker state and response cache statistics",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_external_api() -> dict[str, Any]:
+    """
+    Get external API client state.
+
+    Returns whether the client is started, its circuit and its cache counters.
+    """
+    return external_api.snapshot()
+
+
+@router.get(
+    "/response-cache",
+    response_model=dict[str, int],
+    status_code=status.HTTP_200_OK,
+    summary="Get response cache state",
+    description="Get the size and hit counters of this worker's response cache",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_response_cache() -> dict[str, int]:
+    """
+    Get response cache state.
+
+    Returns the entry count, memory held and hit, stale and miss counters.
+    """
+    return response_cache.snapshot()
+
+
+@router.post(
+    "/response-cache/purge",
+    response_model=dict[str, int],
+    status_code=status.HTTP_200_OK,
+    summary="Purge the response cache",
+    description="Drop cached responses by tag or path prefix, or all of them",
+    dependencies=[Depends(check_admin_access)],
+)
+async def purge_response_cache(
+    tag: list[str] | None = CacheTags,
+    prefix: str | None = Query(None, description="Path prefix to purge"),
+) -> dict[str, int]:
+    """
+    Purge cached responses in this worker.
+
+    Without a tag or prefix the whole cache is cleared.
+    """
+    if not tag and prefix is None:
+        purged = response_cache.snapshot()["entries"]
+        response_cache.clear()
+    else:
+        purged = response_cache.purge(tags=tag or (), prefix=prefix)
+    return {"purged": purged}
+
+
+@router.get(
+    "/invalidation",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get cache invalidation state",
+    description="Get this worker's invalidation bus connection and event counters",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_invalidation() -> dict[str, Any]:
+    """
+    Get cache invalidation bus state.
+
+    The transport is null when invalidations stay local to each worker.
+    """
+    return invalidation_bus.snapshot()
+
+
+@router.get(
+    "/shared-cache",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get shared cache state",
+    description="Get the occupancy of the shared-memory cache and this worker's hits",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_shared_cache() -> dict[str, Any]:
+    """
+    Get shared cache state.
+
+    Entries are shared by all workers; hit and miss counters are this worker's.
+    """
+    return await asyncio.to_thread(shared_cache.snapshot)
+
+
+@router.get(
+    "/item-search",
+    response_model=dict[str, int],
+    status_code=status.HTTP_200_OK,
+    summary="Get item search cache state",
+    description="Get the size and hit counters of this worker's search result cache",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_item_search() -> dict[str, int]:
+    """
+    Get item search cache state.
+
+    All counters are zero while ``ITEM_SEARCH_CACHE_TTL_SECONDS`` is 0.
+    """
+    return item_search.snapshot()
+
+
+@router.get(
+    "/retention",
+    response_model=dict[str, dict[str, Any]],
+    status_code=status.HTTP_200_OK,
+    summary="Get retention progress",
+    description="Get rows deleted, chunks and errors per table for this worker",
+    dependencies=[Depends(check_admin_access)],
+)
+async def get_retention() -> dict[str, dict[str, Any]]:
+    """
+    Get retention sweep progress.
+
+    Only the worker holding the sweep lock reports runs.
+    """
+    return retention_sweeper.snapshot()
+
+
+@router.post(
+    "/settings/reload",
+    response_model=dict[str, list[str]],
+    status_code=status.HTTP_200_OK,
+    summary="Reload settings",
+    description="Re-read and validate settings and apply the reloadable ones",
+    dependencies=[Depends(check_admin_access)],
+)
+async def reload_settings() -> dict[str, list[str]]:
+    """
+    Reload settings in this worker.
+
+    Returns the applied keys and the changed keys that need a restart.
+    Invalid configurations are rejected and the current settings are kept.
+    Other workers reload on SIGHUP or when watching the env file.
+    """
+    try:
+        return await settings_reloader.reload()
+    except SettingsReloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(e.errors),
+        ) from e
+
+
+@router.get(
+    "/memory",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get memory status",
+    description="Get tracemalloc state, traced memory and RSS",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def get_memory(all_workers: bool = AllWorkers) -> dict[str, Any]:
+    """
+    Get memory status.
+
+    Returns whether tracemalloc is running, traced and resident memory, and
+    the stored snapshots, keyed by worker PID.
+    """
+    return await run_memory_command("status", {}, all_workers)
+
+
+@router.post(
+    "/memory/tracemalloc/start",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Start tracemalloc",
+    description="Start tracing memory allocations",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def start_tracemalloc(
+    frames: int = Query(1, ge=1, le=64, description="Frames kept per allocation"),
+    all_workers: bool = AllWorkers,
+) -> dict[str, Any]:
+    """
+    Start tracemalloc.
+
+    Tracing slows allocations down and uses memory of its own, so stop it
+    once the snapshots are taken.
+    """
+    return await run_memory_command("start", {"frames": frames}, all_workers)
+
+
+@router.post(
+    "/memory/tracemalloc/stop",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Stop tracemalloc",
+    description="Stop tracing memory allocations and drop snapshots",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def stop_tracemalloc(all_workers: bool = AllWorkers) -> dict[str, Any]:
+    """
+    Stop tracemalloc.
+
+    Stored snapshots are dropped with the traces.
+    """
+    return await run_memory_command("stop", {}, all_workers)
+
+
+@router.post(
+    "/memory/snapshots",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Take memory snapshot",
+    description="Take a tracemalloc snapshot and list the largest allocation sites",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def take_memory_snapshot(
+    group_by: str = GroupBy,
+    limit: int = Query(20, ge=1, le=500),
+    all_workers: bool = AllWorkers,
+) -> dict[str, Any]:
+    """
+    Take a memory snapshot.
+
+    Returns the snapshot ID and its largest allocation sites.
+    """
+    return await run_memory_command(
+        "snapshot", {"group_by": group_by, "limit": limit}, all_workers
+    )
+
+
+@router.get(
+    "/memory/snapshots/diff",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Diff memory snapshots",
+    description="Compare snapshots by allocation site, largest growth first",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def diff_memory_snapshots(
+    base: str | None = Query(None, description="Snapshot ID, defaults to newest"),
+    compare: str | None = Query(None, description="Snapshot ID, defaults to now"),
+    group_by: str = GroupBy,
+    limit: int = Query(20, ge=1, le=500),
+    all_workers: bool = AllWorkers,
+) -> dict[str, Any]:
+    """
+    Diff memory snapshots.
+
+    Compares ``compare`` (or the current heap) with ``base`` (or the newest
+    snapshot) and returns the allocation sites that grew the most.
+    """
+    params = {"base": base, "compare": compare, "group_by": group_by, "limit": limit}
+    return await run_memory_command("diff", params, all_workers)
+
+
+@router.get(
+    "/memory/gc",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get GC stats",
+    description="Get garbage collector generation counts, thresholds and stats",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def get_gc_stats(all_workers: bool = AllWorkers) -> dict[str, Any]:
+    """
+    Get garbage collector stats.
+
+    Returns per-generation collection stats and uncollectable garbage.
+    """
+    return await run_memory_command("gc", {}, all_workers)
+
+
+@router.get(
+    "/memory/objects",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Count objects by type",
+    description="Count live GC-tracked objects by type",
+    dependencies=MEMORY_DEPENDENCIES,
+)
+async def get_object_counts(
+    limit: int = Query(30, ge=1, le=500),
+    collect: bool = Query(False, description="Run a full collection first"),
+    all_workers: bool = AllWorkers,
+) -> dict[str, Any]:
+    """
+    Count objects by type.
+
+    Walks every GC-tracked object, so expect a pause on large heaps.
+    """
+    return await run_memory_command(
+        "objects", {"limit": limit, "collect": collect}, all_workers
+    )
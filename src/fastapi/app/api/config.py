@@ -5,10 +5,14 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from loguru import logger
 
-from app.core.config import Environment, settings
+from app.core.config import Environment, Settings, settings
+from app.core.shared_cache import shared_cache
 
 router = APIRouter()
 
+# Shared-cache key of the flag snapshot every worker serves
+FEATURE_FLAGS_KEY = "config:features"
+
 
 def check_config_access() -> None:
     """Check if configuration endpoint is accessible."""
@@ -75,12 +79,34 @@ async def get_feature_flags() -> dict[str, bool]:
     """
     Get feature flag states.
 
-    Returns the current state of all feature flags.
+    Returns the current state of all feature flags, from the snapshot the
+    workers share when the shared cache is open.
     """
+    if not shared_cache.is_open:
+        return feature_flags(settings)
+    flags: dict[str, bool] | None = shared_cache.get(FEATURE_FLAGS_KEY)
+    if flags is None:
+        flags = feature_flags(settings)
+        shared_cache.set(FEATURE_FLAGS_KEY, flags)
+    return flags
+
+
+def feature_flags(config: Settings) -> dict[str, bool]:
+    """Build the feature flag snapshot from settings."""
     return {
-        "api_docs": settings.FEATURE_API_DOCS,
-        "metrics": settings.FEATURE_METRICS,
-        "admin_panel": settings.FEATURE_ADMIN_PANEL,
-        "rate_limiting": settings.RATE_LIMIT_ENABLED,
-        "opentelemetry": settings.OPENTELEMETRY_ENABLED,
+        "api_docs": config.FEATURE_API_DOCS,
+        "metrics": config.FEATURE_METRICS,
+        "admin_panel": config.FEATURE_ADMIN_PANEL,
+        "rate_limiting": config.RATE_LIMIT_ENABLED,
+        "opentelemetry": config.OPENTELEMETRY_ENABLED,
     }
+
+
+def publish_feature_flags(config: Settings, changed: set[str] | None = None) -> None:
+    """Store this worker's flag snapshot in the shared cache.
+
+    Called at startup, so workers started with a new configuration replace
+    the snapshot left by their predecessors, and after every settings reload.
+    """
+    if shared_cache.is_open:
+        shared_cache.set(FEATURE_FLAGS_KEY, feature_flags(config))
@@ -7,8 +7,17 @@ from fastapi import APIRouter, status
 from loguru import logger
 
 from app import __version__
+from app.core.lifecycle import lifecycle
+from app.core.loop_monitor import loop_monitor
+from app.core.responses import TrustedJSONResponse
+from app.core.warmup import warmup
 from app.db.session import get_db
-from app.schemas.health import HealthResponse, LivenessResponse, ReadinessResponse
+from app.schemas.health import (
+    HealthResponse,
+    LivenessResponse,
+    LoopLagPercentiles,
+    ReadinessResponse,
+)
 
 router = APIRouter()
 
@@ -16,6 +25,31 @@ router = APIRouter()
 SERVICE_START_TIME = time.time()
 
 
+async def readiness_checks() -> dict[str, bool]:
+    """Check the dependencies the service needs to receive traffic."""
+    checks = {}
+
+    # Report not ready as soon as the worker starts draining
+    checks["accepting_traffic"] = lifecycle.accepting_traffic
+
+    # Keep first-request costs away from real traffic
+    checks["warmed_up"] = not warmup.pending
+
+    # Check database connectivity
+    try:
+        async with get_db() as db:
+            await db.execute("SELECT 1")
+            checks["database"] = True
+    except Exception as e:
+        logger.error(f"Database check failed: {e}")
+        checks["database"] = False
+
+    # Check if configuration is loaded
+    checks["configuration"] = True  # Always true for now
+
+    return checks
+
+
 @router.get(
     "/health",
     response_model=HealthResponse,
@@ -24,7 +58,7 @@ SERVICE_START_TIME = time.time()
     description="Check if the service is healthy and responding to requests",
     tags=["health"],
 )
-async def health_check() -> HealthResponse:
+async def health_check() -> TrustedJSONResponse:
     """
     Health check endpoint.
 
@@ -32,8 +66,10 @@ async def health_check() -> HealthResponse:
     Used by load balancers and monitoring systems.
     """
     logger.debug("Health check requested")
-    return HealthResponse(
-        status="healthy", timestamp=datetime.utcnow(), version=__version__
+    return TrustedJSONResponse(
+        HealthResponse(
+            status="healthy", timestamp=datetime.utcnow(), version=__version__
+        )
     )
 
 
@@ -45,7 +81,7 @@ async def health_check() -> HealthResponse:
     description="Check if the service is ready to accept traffic",
     tags=["health"],
 )
-async def readiness_check() -> ReadinessResponse:
+async def readiness_check() -> TrustedJSONResponse:
     """
     Readiness check endpoint.
 
@@ -54,28 +90,20 @@ async def readiness_check() -> ReadinessResponse:
     """
     logger.debug("Readiness check requested")
 
-    checks = {}
-
-    # Check database connectivity (mock for now)
-    try:
-        async with get_db() as db:
-            # In a real app, you'd perform an actual database query here
-            await db.commit()  # Just test the session works
-            checks["database"] = True
-    except Exception as e:
-        logger.error(f"Database check failed: {e}")
-        checks["database"] = False
-
-    # Check if configuration is loaded
-    checks["configuration"] = True  # Always true for now
+    checks = await readiness_checks()
 
     # Determine overall readiness
     all_ready = all(checks.values())
 
-    return ReadinessResponse(
-        status="ready" if all_ready else "not_ready",
-        timestamp=datetime.utcnow(),
-        checks=checks,
+    return TrustedJSONResponse(
+        ReadinessResponse(
+            status="ready" if all_ready else "not_ready",
+            timestamp=datetime.utcnow(),
+            checks=checks,
+        ),
+        status_code=(
+            status.HTTP_200_OK if all_ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
     )
 
 
@@ -87,17 +115,30 @@ async def readiness_check() -> ReadinessResponse:
     description="Check if the service is alive and not in a deadlock state",
     tags=["health"],
 )
-async def liveness_check() -> LivenessResponse:
+async def liveness_check() -> TrustedJSONResponse:
     """
     Liveness check endpoint.
 
-    Simple check to verify the service is alive and responding.
-    Used by orchestrators to detect and restart unhealthy instances.
+    Verifies the service is responding and its event loop is not persistently
+    blocked. Used by orchestrators to detect and restart unhealthy instances.
     """
     logger.debug("Liveness check requested")
 
     uptime = time.time() - SERVICE_START_TIME
 
-    return LivenessResponse(
-        status="alive", timestamp=datetime.utcnow(), uptime_seconds=uptime
+    alive = loop_monitor.is_alive()
+    if not alive:
+        logger.error("Event loop lag has stayed above the liveness limit")
+    lag = loop_monitor.percentiles()
+
+    return TrustedJSONResponse(
+        LivenessResponse(
+            status="alive" if alive else "not_alive",
+            timestamp=datetime.utcnow(),
+            uptime_seconds=uptime,
+            loop_lag_ms=LoopLagPercentiles(**lag) if lag is not None else None,
+        ),
+        status_code=(
+            status.HTTP_200_OK if alive else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
     )
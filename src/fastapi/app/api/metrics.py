@@ -0,0 +1,145 @@
+"""Prometheus metrics endpoint."""
+
+import os
+
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.concurrency import concurrency_limiter
+from app.core.loop_monitor import loop_monitor
+from app.services.retention import retention_sweeper
+
+router = APIRouter()
+
+
+def render_metric(
+    name: str,
+    metric_type: str,
+    help_text: str,
+    samples: list[tuple[dict[str, str], float]],
+) -> str:
+    """Render a metric family in the Prometheus text exposition format."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        label_str = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f"{name}{{{label_str}}} {value}")
+    return "\n".join(lines)
+
+
+def collect_metrics() -> list[str]:
+    """Collect metric families for this worker."""
+    worker = {"worker": str(os.getpid())}
+    limiter = concurrency_limiter.snapshot()
+
+    families = [
+        render_metric(
+            "app_concurrency_limit",
+            "gauge",
+            "Current adaptive in-flight request limit",
+            [(worker, limiter["limit"])],
+        ),
+        render_metric(
+            "app_concurrency_inflight",
+            "gauge",
+            "Requests currently in flight",
+            [(worker, limiter["inflight"])],
+        ),
+        render_metric(
+            "app_concurrency_queued",
+            "gauge",
+            "Requests waiting for an in-flight slot",
+            [(worker, limiter["queued"])],
+        ),
+        render_metric(
+            "app_concurrency_limit_changes_total",
+            "counter",
+            "Number of adaptive limit changes",
+            [(worker, limiter["limit_changes"])],
+        ),
+        render_metric(
+            "app_requests_accepted_total",
+            "counter",
+            "Requests admitted by the concurrency limiter",
+            [(worker, limiter["accepted_total"])],
+        ),
+        render_metric(
+            "app_requests_shed_total",
+            "counter",
+            "Requests rejected with 503 by load shedding",
+            [(worker, limiter["shed_total"])],
+        ),
+    ]
+
+    percentiles = loop_monitor.percentiles()
+    if percentiles is not None:
+        families.append(
+            render_metric(
+                "app_event_loop_lag_ms",
+                "gauge",
+                "Recent event loop lag percentiles in milliseconds",
+                [
+                    ({**worker, "quantile": quantile}, value)
+                    for quantile, value in percentiles.items()
+                ],
+            )
+        )
+
+    retention = retention_sweeper.snapshot()
+    if any(progress["last_run_at"] is not None for progress in retention.values()):
+        for name, key, metric_type, help_text in (
+            (
+                "app_retention_deleted_rows_total",
+                "deleted_total",
+                "counter",
+                "Rows deleted by the retention sweeper",
+            ),
+            (
+                "app_retention_chunks_total",
+                "chunks_total",
+                "counter",
+                "Delete chunks run by the retention sweeper",
+            ),
+            (
+                "app_retention_errors_total",
+                "errors_total",
+                "counter",
+                "Retention sweeps stopped by an error",
+            ),
+            (
+                "app_retention_last_run_timestamp_seconds",
+                "last_run_at",
+                "gauge",
+                "When each table was last swept",
+            ),
+        ):
+            families.append(
+                render_metric(
+                    name,
+                    metric_type,
+                    help_text,
+                    [
+                        ({**worker, "table": table}, progress[key])
+                        for table, progress in retention.items()
+                        if progress["last_run_at"] is not None
+                    ],
+                )
+            )
+
+    return families
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Metrics",
+    description="Prometheus metrics for the worker that served the request",
+    tags=["monitoring"],
+)
+async def get_metrics() -> str:
+    """
+    Get worker metrics.
+
+    Returns metrics in the Prometheus text exposition format.
+    """
+    return "\n".join(collect_metrics()) + "\n"
@@ -0,0 +1,78 @@
+"""Service status streaming endpoints."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app import __version__
+from app.api.config import get_feature_flags
+from app.api.health import readiness_checks
+from app.core.broadcast import Subscription
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.loop_monitor import loop_monitor
+from app.services.status import create_status_stream
+
+router = APIRouter()
+
+
+async def current_status() -> dict[str, Any]:
+    """Combine health, readiness, liveness and feature flags into one snapshot."""
+    checks = await readiness_checks()
+    return {
+        "health": "healthy",
+        "ready": all(checks.values()),
+        "checks": checks,
+        "alive": loop_monitor.is_alive(),
+        "version": __version__,
+        "environment": settings.ENVIRONMENT.value,
+        "features": await get_feature_flags(),
+    }
+
+
+# Shared status stream for the worker process
+status_stream = create_status_stream(current_status)
+
+
+async def _events(subscription: Subscription) -> AsyncIterator[bytes]:
+    """Yield events until the subscription ends or the client disconnects."""
+    try:
+        yield f"retry: {settings.STATUS_STREAM_RETRY_MS}\n\n".encode()
+        async for message in subscription:
+            yield message
+    finally:
+        status_stream.broadcaster.unsubscribe(subscription)
+
+
+@router.get(
+    "/status/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream service status",
+    description="Push health, readiness and liveness changes as Server-Sent Events",
+    tags=["health"],
+    response_class=StreamingResponse,
+)
+async def stream_status() -> StreamingResponse:
+    """
+    Stream service status.
+
+    Sends the current status on connect, then a ``status`` event whenever it
+    changes and a heartbeat comment while it does not.
+    """
+    subscription = None
+    if not lifecycle.draining:
+        subscription = await status_stream.subscribe()
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Status stream is not accepting subscribers",
+            headers={"Retry-After": "5"},
+        )
+
+    return StreamingResponse(
+        _events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
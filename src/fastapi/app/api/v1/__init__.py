@@ -2,8 +2,14 @@
 
 from fastapi import APIRouter
 
+from app.api.v1 import batch, items, owners
+
 router = APIRouter()
 
+router.include_router(batch.router, prefix="/batch", tags=["batch"])
+router.include_router(items.router, prefix="/items", tags=["items"])
+router.include_router(owners.router, prefix="/owners", tags=["owners"])
+
 # Import and include sub-routers here as they are created
 # Example:
 # from app.api.v1 import users, items
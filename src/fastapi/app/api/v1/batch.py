@@ -0,0 +1,75 @@
+"""Batch request endpoint."""
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.services.batch import BatchDispatcher
+
+router = APIRouter()
+
+
+def validate_batch(batch: BatchRequest) -> None:
+    """Check the batch size, item IDs and dependency references."""
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batches are limited to {settings.BATCH_MAX_REQUESTS} requests",
+        )
+
+    seen: set[str] = set()
+    for item in batch.requests:
+        if item.id in seen:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate request ID: {item.id}",
+            )
+        unknown = [dep for dep in item.depends_on if dep not in seen]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Request {item.id} depends on unknown or later IDs: {unknown}",
+            )
+        seen.add(item.id)
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Run a batch of requests",
+    description="Dispatch several API requests in one round trip",
+)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    stream: bool = Query(
+        default=False, description="Stream results as NDJSON as they complete"
+    ),
+) -> BatchResponse | StreamingResponse:
+    """
+    Run a batch of requests.
+
+    Sub-requests are dispatched in-process, concurrently unless they declare
+    ``depends_on``. Results carry their own status codes; with ``stream=true``
+    each result is written as one JSON line as soon as it completes.
+    """
+    validate_batch(batch)
+    dispatcher = BatchDispatcher(
+        request.app,
+        request.scope,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+        excluded_prefix=request.url.path,
+    )
+
+    if not stream:
+        return BatchResponse(results=await dispatcher.run(batch.requests))
+
+    async def lines() -> AsyncIterator[str]:
+        async for result in dispatcher.stream(batch.requests):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
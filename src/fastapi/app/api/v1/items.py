@@ -0,0 +1,50 @@
+"""Item endpoints."""
+
+import uuid
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.schemas.item_search import ItemSearchResults
+from app.services.item_search import item_search
+
+router = APIRouter()
+
+OwnerId = Query(None, description="Only this owner's items")
+
+
+@router.get(
+    "/search",
+    response_model=ItemSearchResults,
+    summary="Search items",
+    description="Full-text search over item titles and descriptions",
+)
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    owner_id: uuid.UUID | None = OwnerId,
+    is_active: bool | None = Query(default=None, description="Filter on is_active"),
+    limit: int = Query(default=20, ge=1, le=100, description="Results per page"),
+    cursor: str | None = Query(default=None, description="next_cursor of a page"),
+    prefix: bool = Query(
+        default=True, description="Also match words starting with the last word"
+    ),
+) -> ItemSearchResults:
+    """
+    Search items.
+
+    Items containing every word of ``q`` are returned by relevance, with
+    title matches ranked above description matches. Pass a page's
+    ``next_cursor`` to get the following page.
+    """
+    try:
+        return await item_search.search(
+            q,
+            owner_id=None if owner_id is None else str(owner_id),
+            is_active=is_active,
+            limit=limit,
+            cursor=cursor,
+            prefix=prefix,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
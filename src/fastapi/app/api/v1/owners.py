@@ -0,0 +1,26 @@
+"""Owner endpoints."""
+
+import uuid
+
+from fastapi import APIRouter
+
+from app.schemas.item_stats import OwnerItemStats
+from app.services.item_stats import item_stats
+
+router = APIRouter()
+
+
+@router.get(
+    "/{owner_id}/item-stats",
+    response_model=OwnerItemStats,
+    summary="Get an owner's item stats",
+    description="Item counts and price totals for one owner",
+)
+async def get_owner_item_stats(owner_id: uuid.UUID) -> OwnerItemStats:
+    """
+    Get an owner's item stats.
+
+    Answered from the incrementally maintained aggregate row, so the cost
+    does not grow with the number of items the owner has.
+    """
+    return await item_stats.get(str(owner_id))
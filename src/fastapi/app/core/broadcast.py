@@ -0,0 +1,96 @@
+"""In-process fan-out of messages to many streaming subscribers."""
+
+import asyncio
+from typing import Any
+
+from loguru import logger
+
+
+class Subscription:
+    """A bounded queue of messages for one subscriber."""
+
+    __slots__ = ("queue", "closed")
+
+    def __init__(self, queue_size: int):
+        """Initialize the subscription."""
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def close(self) -> None:
+        """End the subscription, discarding any undelivered messages."""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def __aiter__(self) -> "Subscription":
+        """Iterate over messages until the subscription is closed."""
+        return self
+
+    async def __anext__(self) -> bytes:
+        """Wait for the next message."""
+        message = await self.queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class Broadcaster:
+    """Fan out pre-encoded messages to subscribers with bounded memory.
+
+    Each message is encoded once and the same bytes object is queued for every
+    subscriber, so the cost of a publish does not depend on the message size.
+    Subscribers that fall ``queue_size`` messages behind are dropped instead
+    of buffering without limit; clients reconnect and receive a fresh snapshot.
+    """
+
+    def __init__(self, queue_size: int = 8, max_subscribers: int = 5000):
+        """Initialize the broadcaster."""
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.subscribers: set[Subscription] = set()
+        self.published_total = 0
+        self.dropped_total = 0
+
+    def subscribe(self) -> Subscription | None:
+        """Add a subscriber, or return None when at capacity."""
+        if len(self.subscribers) >= self.max_subscribers:
+            return None
+        subscription = Subscription(self.queue_size)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber."""
+        self.subscribers.discard(subscription)
+        subscription.close()
+
+    def publish(self, message: bytes) -> None:
+        """Queue a message for every subscriber, dropping slow ones."""
+        self.published_total += 1
+        slow = []
+        for subscription in self.subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                slow.append(subscription)
+        for subscription in slow:
+            self.unsubscribe(subscription)
+        if slow:
+            self.dropped_total += len(slow)
+            logger.debug(f"Dropped {len(slow)} slow subscribers")
+
+    def close(self) -> None:
+        """End every subscription."""
+        for subscription in list(self.subscribers):
+            self.unsubscribe(subscription)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get subscriber and message counters."""
+        return {
+            "subscribers": len(self.subscribers),
+            "published_total": self.published_total,
+            "dropped_total": self.dropped_total,
+        }
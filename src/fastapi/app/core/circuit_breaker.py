@@ -0,0 +1,98 @@
+"""Circuit breaker for calls to unreliable dependencies."""
+
+import time
+from enum import Enum
+from typing import Any
+
+from loguru import logger
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while a dependency is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected without touching the dependency. Once ``reset_timeout``
+    has passed a single trial call is let through: success closes the
+    circuit, failure opens it again for another timeout.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30
+    ):
+        """Initialize the breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.rejected_total = 0
+        self.opened_total = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the timeout passes."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Check if a call may proceed."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected_total += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self._state = CircuitState.CLOSED
+        self._trial_in_flight = False
+        self.failures = 0
+
+    def release(self) -> None:
+        """Give up a call that ended without an outcome, freeing the trial slot."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit at the threshold."""
+        self.failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                self.opened_total += 1
+                logger.warning(
+                    f"Circuit {self.name} opened after {self.failures} failures"
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the breaker state and counters."""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "opened_total": self.opened_total,
+            "rejected_total": self.rejected_total,
+        }
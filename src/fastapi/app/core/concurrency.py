@@ -0,0 +1,152 @@
+"""Adaptive concurrency limiting."""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit in-flight requests with an AIMD limit driven by observed latency.
+
+    Each completed request that met the latency target while the limit was in
+    use grows the limit additively (about +1 per limit's worth of requests).
+    A request slower than the target, or one that failed, shrinks the limit
+    multiplicatively. Requests over the limit wait in a short bounded queue
+    and are rejected once it is full or their wait times out.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 50,
+        min_limit: int = 4,
+        max_limit: int = 500,
+        latency_target: float = 0.25,
+        backoff: float = 0.9,
+        queue_size: int = 50,
+        queue_timeout: float = 0.1,
+    ):
+        """Initialize the limiter."""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.inflight = 0
+        self.accepted_total = 0
+        self.shed_total = 0
+        self.limit_changes = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current effective in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take an in-flight slot, waiting briefly if none is free."""
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            self.accepted_total += 1
+            return True
+
+        if len(self._waiters) >= self.queue_size:
+            self.shed_total += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except TimeoutError:
+            # The slot may have been handed over just as the wait timed out
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            self.shed_total += 1
+            return False
+        except BaseException:
+            # Cancelled after being handed a slot: give it back before leaving
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self.accepted_total += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot and hand it to the next waiter if the limit allows."""
+        self.inflight -= 1
+        self.release_waiters()
+
+    def on_complete(self, latency: float, failed: bool = False) -> None:
+        """Adjust the limit from a completed request."""
+        previous = self.limit
+        if failed or latency > self.latency_target:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+        elif self.inflight + 1 >= self._limit / 2:
+            # Only grow while the limit is actually being used
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        if self.limit != previous:
+            self.limit_changes += 1
+            logger.debug(f"Concurrency limit changed from {previous} to {self.limit}")
+
+    def configure(
+        self,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        queue_size: int,
+        queue_timeout: float,
+    ) -> None:
+        """Update the tuning parameters, keeping the current limit within bounds."""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._limit = float(max(min_limit, min(self._limit, max_limit)))
+        self.release_waiters()
+
+    def release_waiters(self) -> None:
+        """Hand free slots to waiting requests."""
+        while self._waiters and self.inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the limiter state and counters."""
+        return {
+            "limit": self.limit,
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "accepted_total": self.accepted_total,
+            "shed_total": self.shed_total,
+            "limit_changes": self.limit_changes,
+        }
+
+
+# Shared limiter for the worker process
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.CONCURRENCY_LIMIT_INITIAL,
+    min_limit=settings.CONCURRENCY_LIMIT_MIN,
+    max_limit=settings.CONCURRENCY_LIMIT_MAX,
+    latency_target=settings.CONCURRENCY_LATENCY_TARGET_MS / 1000,
+    queue_size=settings.CONCURRENCY_QUEUE_SIZE,
+    queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT_MS / 1000,
+)
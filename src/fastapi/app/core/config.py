@@ -89,7 +89,46 @@ class Settings(BaseSettings):
     WORKERS: int = Field(
         default=1,
         ge=1,
-        description="Number of worker processes",
+        description="Number of worker processes (derived from CPUs if unset)",
+    )
+    SERVER_BACKLOG: int = Field(
+        default=2048,
+        ge=1,
+        description="Maximum number of pending connections",
+    )
+    SERVER_KEEP_ALIVE_SECONDS: int = Field(
+        default=5,
+        ge=0,
+        description="Seconds to keep idle client connections open",
+    )
+    SERVER_WORKER_TIMEOUT_SECONDS: int = Field(
+        default=120,
+        ge=0,
+        description="Restart workers that are silent for this many seconds",
+    )
+    SERVER_MAX_REQUESTS: int = Field(
+        default=1000,
+        ge=0,
+        description="Recycle workers after this many requests (0 disables)",
+    )
+    SERVER_MAX_REQUESTS_JITTER: int = Field(
+        default=100,
+        ge=0,
+        description="Random extra requests before recycling to stagger restarts",
+    )
+    SERVER_PRELOAD: bool = Field(
+        default=False,
+        description="Import the app in the master process before forking",
+    )
+    DRAIN_GRACE_SECONDS: float = Field(
+        default=0.0,
+        ge=0,
+        description="Time between SIGTERM and closing the listener while not ready",
+    )
+    DRAIN_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        description="Maximum time to wait for in-flight requests on shutdown",
     )
 
     # CORS settings
@@ -125,6 +164,234 @@ class Settings(BaseSettings):
         ge=0,
         description="Maximum overflow connections",
     )
+    DB_SLOW_QUERY_THRESHOLD_MS: float = Field(
+        default=200.0,
+        ge=0,
+        description="Log statements slower than this many milliseconds",
+    )
+    DB_EXPLAIN_SLOW_QUERIES: bool = Field(
+        default=False,
+        description="Capture EXPLAIN (ANALYZE, BUFFERS) for slow statements",
+    )
+    DB_EXPLAIN_SAMPLE_RATE: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Fraction of slow statements to explain",
+    )
+    SQLITE_READERS: int = Field(
+        default=4,
+        ge=0,
+        description="Reader connections next to the single SQLite writer",
+    )
+    SQLITE_MMAP_SIZE_MB: int = Field(
+        default=256,
+        ge=0,
+        description="Bytes of the SQLite database to memory-map, in MiB",
+    )
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(
+        default=5000,
+        ge=0,
+        description="How long to wait for the SQLite write lock",
+    )
+    SQLITE_STATEMENT_CACHE_SIZE: int = Field(
+        default=256,
+        ge=0,
+        description="Prepared statements cached per SQLite connection",
+    )
+
+    # Background jobs
+    JOBS_ENABLED: bool = Field(
+        default=False,
+        description="Enable the background job queue",
+    )
+    JOBS_DATABASE_URL: str | None = Field(
+        default=None,
+        description="Job queue database URL (defaults to DATABASE_URL)",
+    )
+    JOBS_RUN_IN_PROCESS: bool = Field(
+        default=True,
+        description="Run job workers inside the web process lifespan",
+    )
+    JOB_QUEUES: dict[str, int] = Field(
+        default={"default": 4},
+        description="Queues to work and the jobs each worker process runs at once "
+        "from them; N server workers run up to N times the cap",
+    )
+    JOB_TASK_MODULES: list[str] = Field(
+        default=[],
+        description="Modules that register job task handlers",
+    )
+    JOB_BATCH_SIZE: int = Field(
+        default=10,
+        ge=1,
+        description="Maximum jobs claimed per query",
+    )
+    JOB_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        gt=0,
+        description="Idle time between claim attempts",
+    )
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = Field(
+        default=300.0,
+        gt=0,
+        description="Time before a claimed job may be claimed again",
+    )
+    JOB_MAX_ATTEMPTS: int = Field(
+        default=5,
+        ge=1,
+        description="Default attempts before a job is marked failed",
+    )
+    JOB_RETRY_BACKOFF_SECONDS: float = Field(
+        default=5.0,
+        ge=0,
+        description="Base delay for exponential retry backoff",
+    )
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = Field(
+        default=3600.0,
+        ge=0,
+        description="Maximum retry delay",
+    )
+
+    # Last login write-behind
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="How often buffered last login times are written",
+    )
+    LAST_LOGIN_PRECISION_SECONDS: float = Field(
+        default=300.0,
+        ge=0,
+        description="Skip last login updates within this long of the stored value",
+    )
+    LAST_LOGIN_BATCH_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        le=10000,
+        description="Users updated per bulk statement",
+    )
+    LAST_LOGIN_MAX_PENDING: int = Field(
+        default=100_000,
+        ge=1,
+        description="Buffered users that trigger an early flush",
+    )
+
+    # Retention
+    RETENTION_ENABLED: bool = Field(
+        default=False,
+        description="Delete expired sessions and old audit rows in the background",
+    )
+    RETENTION_DAYS: dict[str, float] = Field(
+        default={"sessions": 0, "audit_logs": 90, "idempotency_keys": 0},
+        description="Days rows are kept per table (0 deletes them once expired)",
+    )
+    RETENTION_INTERVAL_SECONDS: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Time between retention sweeps",
+    )
+    RETENTION_CHUNK_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Rows deleted per transaction",
+    )
+    RETENTION_CHUNK_PAUSE_MS: int = Field(
+        default=100,
+        ge=0,
+        description="Pause between chunks so replicas keep up",
+    )
+    RETENTION_LOCK_TIMEOUT_MS: int = Field(
+        default=2000,
+        ge=1,
+        description="Postgres lock_timeout for each chunk's transaction",
+    )
+    RETENTION_LOCK_PATH: str | None = Field(
+        default=None,
+        description="Lock file letting one worker sweep at a time "
+        "(defaults to a temp file per server process)",
+    )
+
+    # Owner item stats
+    ITEM_STATS_RECONCILE_ENABLED: bool = Field(
+        default=False,
+        description="Periodically correct drift in the per-owner item aggregates",
+    )
+    ITEM_STATS_RECONCILE_INTERVAL_SECONDS: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Time between item stats reconciliations",
+    )
+
+    # Item search
+    ITEM_SEARCH_CACHE_TTL_SECONDS: float = Field(
+        default=0.0,
+        ge=0,
+        description="Seconds search results are cached in memory (0 disables)",
+    )
+    ITEM_SEARCH_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        ge=1,
+        description="Cached search queries per worker",
+    )
+
+    # Idempotency keys
+    IDEMPOTENCY_ENABLED: bool = Field(
+        default=True,
+        description="Replay stored responses to retried requests with an "
+        "Idempotency-Key",
+    )
+    IDEMPOTENCY_TTL_SECONDS: float = Field(
+        default=86400.0,
+        gt=0,
+        description="How long responses are kept for replay",
+    )
+    IDEMPOTENCY_LOCK_SECONDS: float = Field(
+        default=60.0,
+        gt=0,
+        description="Time after which a key held by an unfinished request is freed",
+    )
+    IDEMPOTENCY_WAIT_SECONDS: float = Field(
+        default=10.0,
+        ge=0,
+        description="How long a duplicate waits for the first request before a 409",
+    )
+
+    # Warm-up
+    WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Warm connections, routes and caches before reporting ready",
+    )
+    WARMUP_PATHS: list[str] = Field(
+        default=["/health", "/live", "/config/environment", "/config/features"],
+        description="Side-effect free GET paths requested once during warm-up",
+    )
+    WARMUP_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Time after which the worker reports ready even if still warming",
+    )
+
+    # Cross-worker cache invalidation settings
+    INVALIDATION_ENABLED: bool = Field(
+        default=True,
+        description="Tell other workers which cached entities a write made stale",
+    )
+    INVALIDATION_CHANNEL: str = Field(
+        default="cache_invalidation",
+        min_length=1,
+        max_length=63,
+        description="Postgres NOTIFY or Redis pub/sub channel for invalidations",
+    )
+    INVALIDATION_MAX_PENDING: int = Field(
+        default=1000,
+        ge=1,
+        description="Unsent invalidations after which a full flush is sent instead",
+    )
+    INVALIDATION_RECONNECT_MAX_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Longest wait between reconnects; caches are flushed on each",
+    )
 
     # Redis settings (for future caching)
     REDIS_URL: str | None = Field(
@@ -162,6 +429,55 @@ class Settings(BaseSettings):
         description="Logging format",
     )
 
+    # Settings reload
+    SETTINGS_WATCH_ENABLED: bool = Field(
+        default=False,
+        description="Reload settings when the .env file changes",
+    )
+    SETTINGS_WATCH_INTERVAL_SECONDS: float = Field(
+        default=2.0,
+        gt=0,
+        description="How often the .env file is checked for changes",
+    )
+
+    # Worker control
+    WORKER_CONTROL_DIR: str | None = Field(
+        default=None,
+        description="Directory shared by workers for admin commands "
+        "(defaults to a temp directory per server process)",
+    )
+    WORKER_CONTROL_POLL_INTERVAL_SECONDS: float = Field(
+        default=0.5,
+        gt=0,
+        description="How often workers check for admin commands",
+    )
+    WORKER_CONTROL_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        gt=0,
+        description="How long to wait for every worker to answer",
+    )
+
+    # Shared-memory cache
+    SHARED_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Map a key/value cache shared by the workers on a host",
+    )
+    SHARED_CACHE_PATH: str | None = Field(
+        default=None,
+        description="File backing the shared cache "
+        "(defaults to a temp file per server process)",
+    )
+    SHARED_CACHE_SLOTS: int = Field(
+        default=4096,
+        ge=8,
+        description="Entries the shared cache can hold",
+    )
+    SHARED_CACHE_SLOT_BYTES: int = Field(
+        default=1024,
+        ge=64,
+        description="Size of each slot; larger keys and values are not cached",
+    )
+
     # External Services
     EXTERNAL_API_KEY: str | None = Field(
         default=None,
@@ -171,6 +487,87 @@ class Settings(BaseSettings):
         default=None,
         description="External API URL",
     )
+    EXTERNAL_API_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        gt=0,
+        description="Read, write and pool timeout for external API calls",
+    )
+    EXTERNAL_API_CONNECT_TIMEOUT_SECONDS: float = Field(
+        default=3.0,
+        gt=0,
+        description="Connect timeout for external API calls",
+    )
+    EXTERNAL_API_MAX_CONNECTIONS: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum open connections to the external API per worker",
+    )
+    EXTERNAL_API_MAX_KEEPALIVE: int = Field(
+        default=20,
+        ge=0,
+        description="Idle keep-alive connections kept in the pool",
+    )
+    EXTERNAL_API_KEEPALIVE_EXPIRY_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds an idle pooled connection is kept open",
+    )
+    EXTERNAL_API_HTTP2: bool = Field(
+        default=True,
+        description="Use HTTP/2 when the h2 package is installed",
+    )
+    EXTERNAL_API_RETRIES: int = Field(
+        default=2,
+        ge=0,
+        description="Retries for idempotent calls on connection errors and 502-504",
+    )
+    EXTERNAL_API_RETRY_BACKOFF_SECONDS: float = Field(
+        default=0.1,
+        ge=0,
+        description="Base delay for jittered exponential retry backoff",
+    )
+    EXTERNAL_API_BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        ge=1,
+        description="Consecutive failures before the circuit opens",
+    )
+    EXTERNAL_API_BREAKER_RESET_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds the circuit stays open before a trial call",
+    )
+    EXTERNAL_API_CACHE_ENABLED: bool = Field(
+        default=False,
+        description="Cache GET responses as allowed by upstream Cache-Control",
+    )
+    EXTERNAL_API_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum cached external API responses per worker",
+    )
+
+    # Batch requests
+    BATCH_MAX_REQUESTS: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum sub-requests in one batch",
+    )
+    BATCH_MAX_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Sub-requests of one batch run at the same time",
+    )
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Serve API GET routes that opt in from an in-memory cache",
+    )
+    RESPONSE_CACHE_MAX_MB: int = Field(
+        default=64,
+        ge=1,
+        description="Memory held by cached responses per worker, in MiB",
+    )
 
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = Field(
@@ -188,6 +585,62 @@ class Settings(BaseSettings):
         description="Rate limit period in seconds",
     )
 
+    # Load Shedding
+    LOAD_SHEDDING_ENABLED: bool = Field(
+        default=False,
+        description="Shed load with an adaptive in-flight request limit",
+    )
+    CONCURRENCY_LIMIT_INITIAL: int = Field(
+        default=50,
+        ge=1,
+        description="Initial in-flight request limit per worker",
+    )
+    CONCURRENCY_LIMIT_MIN: int = Field(
+        default=4,
+        ge=1,
+        description="Lowest in-flight request limit per worker",
+    )
+    CONCURRENCY_LIMIT_MAX: int = Field(
+        default=500,
+        ge=1,
+        description="Highest in-flight request limit per worker",
+    )
+    CONCURRENCY_LATENCY_TARGET_MS: float = Field(
+        default=250.0,
+        gt=0,
+        description="Latency above which the in-flight limit is reduced",
+    )
+    CONCURRENCY_QUEUE_SIZE: int = Field(
+        default=50,
+        ge=0,
+        description="Requests allowed to wait for an in-flight slot",
+    )
+    CONCURRENCY_QUEUE_TIMEOUT_MS: float = Field(
+        default=100.0,
+        ge=0,
+        description="Maximum time a request waits for an in-flight slot",
+    )
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: int = Field(
+        default=1,
+        ge=0,
+        description="Retry-After value sent with shed responses",
+    )
+
+    # Request deadlines
+    REQUEST_DEADLINE_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        description="Time a request has to start its response (0 disables)",
+    )
+    REQUEST_DEADLINES: dict[str, float] = Field(
+        default={},
+        description="Per-route deadlines by path prefix, longest prefix wins",
+    )
+    CANCEL_ON_DISCONNECT: bool = Field(
+        default=True,
+        description="Cancel handlers when the client disconnects",
+    )
+
     # Monitoring
     SENTRY_DSN: str | None = Field(
         default=None,
@@ -201,6 +654,81 @@ class Settings(BaseSettings):
         default=None,
         description="OpenTelemetry collector endpoint",
     )
+    SERVER_TIMING_ENABLED: bool = Field(
+        default=True,
+        description="Emit per-request Server-Timing headers",
+    )
+    PROFILING_ENABLED: bool = Field(
+        default=False,
+        description="Allow on-demand profiling of requests with X-Profile",
+    )
+    PROFILING_TOKEN: str | None = Field(
+        default=None,
+        description="Required X-Profile header value for on-demand profiling",
+    )
+    PROFILING_CONTINUOUS_EVERY_N: int = Field(
+        default=0,
+        ge=0,
+        description="Profile one request in N and aggregate per route (0 disables)",
+    )
+    PROFILING_INTERVAL_MS: float = Field(
+        default=5.0,
+        gt=0,
+        description="Profiler sampling interval in milliseconds",
+    )
+    PROFILING_OUTPUT_DIR: str | None = Field(
+        default=None,
+        description="Directory to write on-demand speedscope profiles to",
+    )
+    LOOP_MONITOR_ENABLED: bool = Field(
+        default=True,
+        description="Measure event loop lag and detect blocking calls",
+    )
+    LOOP_MONITOR_INTERVAL_MS: float = Field(
+        default=100.0,
+        gt=0,
+        description="Event loop lag sampling interval in milliseconds",
+    )
+    LOOP_LAG_THRESHOLD_MS: float = Field(
+        default=100.0,
+        gt=0,
+        description="Log the blocking stack when the loop stalls this long",
+    )
+    LOOP_LAG_LIVENESS_LIMIT_MS: float = Field(
+        default=0.0,
+        ge=0,
+        description="Report not alive when lag stays above this (0 disables)",
+    )
+    LOOP_LAG_LIVENESS_WINDOW_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long lag must stay above the limit to fail liveness",
+    )
+    STATUS_STREAM_INTERVAL_SECONDS: float = Field(
+        default=2.0,
+        gt=0,
+        description="How often the streamed status snapshot is recomputed",
+    )
+    STATUS_STREAM_HEARTBEAT_SECONDS: float = Field(
+        default=15.0,
+        gt=0,
+        description="Idle time before a heartbeat is sent on status streams",
+    )
+    STATUS_STREAM_RETRY_MS: int = Field(
+        default=5000,
+        ge=0,
+        description="Reconnect delay suggested to status stream clients",
+    )
+    STATUS_STREAM_MAX_SUBSCRIBERS: int = Field(
+        default=5000,
+        ge=1,
+        description="Maximum status stream connections per worker",
+    )
+    STATUS_STREAM_QUEUE_SIZE: int = Field(
+        default=8,
+        ge=1,
+        description="Undelivered events before a slow status client is dropped",
+    )
 
     # Feature Flags
     FEATURE_API_DOCS: bool = Field(
@@ -254,8 +782,9 @@ class Settings(BaseSettings):
             if self.FEATURE_API_DOCS:
                 logger.warning("API documentation is enabled in production")
 
-            # Ensure proper worker configuration
-            if self.WORKERS < 2:
+            # Ensure proper worker configuration; when WORKERS is unset the
+            # server derives the count from the CPU budget instead
+            if "WORKERS" in self.model_fields_set and self.WORKERS < 2:
                 logger.warning("Consider using multiple workers in production")
 
         return self
@@ -288,9 +817,11 @@ class Settings(BaseSettings):
             sensitive_keys = {
                 "SECRET_KEY",
                 "DATABASE_URL",
+                "JOBS_DATABASE_URL",
                 "REDIS_URL",
                 "EXTERNAL_API_KEY",
                 "SENTRY_DSN",
+                "PROFILING_TOKEN",
             }
             for key in sensitive_keys:
                 if key in data and data[key]:
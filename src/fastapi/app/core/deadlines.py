@@ -0,0 +1,135 @@
+"""Request deadlines shared with downstream calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from contextvars import ContextVar, Token
+
+from fastapi import HTTPException, status
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before the work could finish."""
+
+
+class Deadline:
+    """Absolute point in loop time by which a request must be answered.
+
+    An expiry callback, set by the middleware enforcing the deadline, runs
+    when it passes. Deadlines can only be shortened, so a route or a nested
+    request never gets more time than its caller.
+    """
+
+    def __init__(self, expires_at: float | None):
+        """Initialize the deadline, where ``None`` means no deadline."""
+        self.expires_at = expires_at
+        self._callback: Callable[[], None] | None = None
+        self._handle: asyncio.TimerHandle | None = None
+
+    @classmethod
+    def after(
+        cls, seconds: float | None, parent: "Deadline | None" = None
+    ) -> "Deadline":
+        """Create a deadline ``seconds`` from now, no later than ``parent``."""
+        deadline = cls(None if parent is None else parent.expires_at)
+        if seconds:
+            deadline.shorten(seconds)
+        return deadline
+
+    def remaining(self) -> float | None:
+        """Seconds left, or ``None`` without a deadline."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - asyncio.get_running_loop().time()
+
+    def shorten(self, seconds: float) -> None:
+        """Move the deadline to ``seconds`` from now if that is sooner."""
+        expires_at = asyncio.get_running_loop().time() + seconds
+        if self.expires_at is None or expires_at < self.expires_at:
+            self.expires_at = expires_at
+            self._schedule()
+
+    def on_expire(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once the deadline passes."""
+        self._callback = callback
+        self._schedule()
+
+    def cancel(self) -> None:
+        """Stop watching the deadline."""
+        self._callback = None
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._callback is not None and self.expires_at is not None:
+            loop = asyncio.get_running_loop()
+            self._handle = loop.call_at(self.expires_at, self._callback)
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def set_deadline(deadline: Deadline) -> Token[Deadline | None]:
+    """Make ``deadline`` the deadline of the current context."""
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token[Deadline | None]) -> None:
+    """Restore the previous deadline."""
+    _deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    """Get the deadline of the current request, if any."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Seconds left for the current request, or ``None`` without a deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def budget(timeout: float | None) -> float | None:
+    """Cap a downstream timeout at the time left for the current request.
+
+    Raises :class:`DeadlineExceeded` when no time is left, so callers do not
+    start work whose result would arrive too late.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left if timeout is None else min(timeout, left)
+
+
+def route_deadline(routes: Mapping[str, float], path: str, default: float) -> float:
+    """Get the deadline for a path from prefix rules, longest prefix first."""
+    matches = [prefix for prefix in routes if path.startswith(prefix)]
+    return routes[max(matches, key=len)] if matches else default
+
+
+def deadline(seconds: float) -> Callable[[], Awaitable[None]]:
+    """Create a dependency that tightens the request deadline for a route.
+
+    Use with ``dependencies=[Depends(deadline(2.0))]`` on routes that must
+    answer faster than the configured default.
+    """
+
+    async def tighten() -> None:
+        current = _deadline.get()
+        if current is None:
+            return
+        current.shorten(seconds)
+        left = current.remaining()
+        if left is not None and left <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Request deadline exceeded",
+            )
+
+    return tighten
@@ -0,0 +1,292 @@
+"""In-memory HTTP response cache with stale-while-revalidate."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Response
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+
+# Requests carrying credentials are only cached when the route varies on them
+CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+# Fixed cost per entry on top of its headers and body
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+    """Parse a Cache-Control header into lowercase directives."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _seconds(value: str | None) -> float:
+    try:
+        return max(float(value or 0), 0.0)
+    except ValueError:
+        return 0.0
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """A stored response and the times it stops being fresh and usable."""
+
+    path: str
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    tags: frozenset[str]
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the entry, in bytes."""
+        header_bytes = sum(len(name) + len(value) for name, value in self.headers)
+        return len(self.body) + header_bytes + ENTRY_OVERHEAD_BYTES
+
+
+class HTTPCache:
+    """Size-bounded LRU of responses keyed by request and ``Vary`` headers.
+
+    Routes opt in through the ``s-maxage`` and ``stale-while-revalidate``
+    directives of their ``Cache-Control`` header and label their responses
+    with ``Cache-Tag`` so writes can purge them by tag. Entries are evicted
+    least recently used first once their total size passes ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, max_entry_bytes: int | None = None):
+        """Initialize the cache."""
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 8
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped by every purge, so responses computed before one are not stored
+        self.purges = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        # Header names each URL varies on, learned from its responses
+        self._vary: dict[str, tuple[str, ...]] = {}
+
+    @staticmethod
+    def base_key(method: str, path: str, query_string: bytes) -> str:
+        """Key a request by method, path and normalized query."""
+        query = sorted(
+            parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+        )
+        return f"{method} {path}?{urlencode(query)}"
+
+    def key(
+        self, base: str, headers: Headers, vary: Iterable[str] | None = None
+    ) -> str | None:
+        """Extend a base key with the request's values of the ``Vary`` headers.
+
+        Returns ``None`` when the request must bypass the cache because it
+        carries credentials the response does not vary on.
+        """
+        names = tuple(vary) if vary is not None else self._vary.get(base, ())
+        for name in CREDENTIAL_HEADERS:
+            if name in headers and name not in names:
+                return None
+        if not names:
+            return base
+        values = "\n".join(f"{name}={headers.get(name, '')}" for name in names)
+        return f"{base}\n{values}"
+
+    def lookup(self, key: str) -> CachedResponse | None:
+        """Get a fresh or stale entry, counting the hit or miss."""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry.stale_until <= now:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.fresh_until > now:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    @staticmethod
+    def _policy(
+        method: str, status: int, headers: Headers
+    ) -> tuple[float, float, tuple[str, ...]] | None:
+        # TTL, stale window and Vary names, or None when it may not be stored
+        directives = parse_cache_control(headers.get("cache-control", ""))
+        ttl = _seconds(directives.get("s-maxage"))
+        if (
+            method != "GET"
+            or status != 200
+            or ttl <= 0
+            or {"no-store", "private"} & directives.keys()
+            or "set-cookie" in headers
+        ):
+            return None
+        vary = tuple(
+            name.strip().lower()
+            for name in headers.get("vary", "").split(",")
+            if name.strip()
+        )
+        if "*" in vary:
+            return None
+        return ttl, _seconds(directives.get("stale-while-revalidate")), vary
+
+    def cacheable(
+        self,
+        base: str,
+        method: str,
+        request_headers: Headers,
+        status: int,
+        response_headers: list[tuple[bytes, bytes]],
+    ) -> bool:
+        """Whether a response may be stored, judged before its body is known."""
+        policy = self._policy(method, status, Headers(raw=response_headers))
+        return (
+            policy is not None
+            and self.key(base, request_headers, policy[2]) is not None
+        )
+
+    def store(
+        self,
+        base: str,
+        method: str,
+        path: str,
+        request_headers: Headers,
+        status: int,
+        response_headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> bool:
+        """Store a response if its headers allow it and return whether it was."""
+        headers = Headers(raw=response_headers)
+        policy = self._policy(method, status, headers)
+        if policy is None:
+            return False
+        ttl, stale, vary = policy
+        key = self.key(base, request_headers, vary)
+        if key is None:
+            return False
+
+        now = time.monotonic()
+        tags = frozenset(
+            tag.strip()
+            for tag in headers.get("cache-tag", "").split(",")
+            if tag.strip()
+        )
+        entry = CachedResponse(
+            path=path,
+            status=status,
+            headers=[(k, v) for k, v in response_headers if k.lower() != b"cache-tag"],
+            body=body,
+            tags=tags,
+            stored_at=now,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale,
+        )
+        if entry.size > self.max_entry_bytes:
+            return False
+
+        self._vary[base] = vary
+        self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def purge(self, tags: Iterable[str] = (), prefix: str | None = None) -> int:
+        """Drop entries with any of ``tags`` or under a path prefix."""
+        self.purges += 1
+        tags = frozenset(tags)
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if entry.tags & tags
+            or (prefix is not None and entry.path.startswith(prefix))
+        ]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.purges += 1
+        self._entries.clear()
+        self._vary.clear()
+        self.size = 0
+
+    def snapshot(self) -> dict[str, int]:
+        """Get cache counters."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "purges": self.purges,
+        }
+
+
+def entity_tags(entity: str, entity_id: Any = None) -> set[str]:
+    """Get the cache tags for an entity's collection or one of its items."""
+    if entity_id is None:
+        return {entity}
+    return {entity, f"{entity}:{entity_id}"}
+
+
+def cache_response(
+    ttl: float,
+    stale: float = 0.0,
+    tags: Iterable[str] = (),
+    vary: Iterable[str] = (),
+) -> Callable[[Response], Awaitable[None]]:
+    """Create a dependency that opts a GET route into the response cache.
+
+    Responses are served from the cache for ``ttl`` seconds, then served
+    stale for up to ``stale`` more seconds while one background request
+    refreshes them. ``tags`` let writes purge them, e.g. with
+    ``BaseService.invalidate()``. Add request headers the response depends on
+    to ``vary``; requests with credentials bypass the cache unless the
+    route varies on them.
+    """
+    cache_control = f"public, s-maxage={ttl:g}"
+    if stale:
+        cache_control += f", stale-while-revalidate={stale:g}"
+    tag_header = ", ".join(tags)
+    vary_header = ", ".join(vary)
+
+    async def set_cache_headers(response: Response) -> None:
+        response.headers["Cache-Control"] = cache_control
+        if tag_header:
+            response.headers["Cache-Tag"] = tag_header
+        if vary_header:
+            response.headers["Vary"] = vary_header
+
+    return set_cache_headers
+
+
+# Shared response cache for the worker process
+response_cache = HTTPCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_MB * 2**20,
+)
@@ -0,0 +1,433 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY or Redis pub/sub."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Callable
+from contextlib import suppress
+from importlib.util import find_spec
+from typing import Any, Protocol
+
+from loguru import logger
+
+from app.core.config import Settings, settings
+
+# Called with an entity name and ID, or with (None, None) to drop everything
+InvalidationHandler = Callable[[str | None, Any], None]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+def encode_payloads(
+    origin: str,
+    events: list[tuple[str, Any]],
+    flush: bool = False,
+    max_bytes: int = MAX_PAYLOAD_BYTES,
+) -> list[str]:
+    """Pack ``(entity, id)`` events into as few payloads under ``max_bytes``.
+
+    Payloads use one-letter keys: ``o`` is the sending worker, ``e`` the
+    events and ``f`` asks every worker to drop all cached entries.
+    """
+    header = json.dumps({"o": origin}, separators=(",", ":"))[:-1]
+    flush_payload = f'{header},"f":1}}'
+    if flush:
+        return [flush_payload]
+    prefix, suffix = f'{header},"e":[', "]}"
+    payloads: list[str] = []
+    batch: list[str] = []
+    size = len(prefix) + len(suffix)
+    for entity, entity_id in events:
+        event = json.dumps([entity, entity_id], separators=(",", ":"))
+        event_size = len(event.encode()) + 1
+        if len(prefix) + len(suffix) + event_size > max_bytes:
+            # An event too large for any payload is sent as a full flush
+            return [flush_payload]
+        if batch and size + event_size > max_bytes:
+            payloads.append(prefix + ",".join(batch) + suffix)
+            batch, size = [], len(prefix) + len(suffix)
+        batch.append(event)
+        size += event_size
+    if batch:
+        payloads.append(prefix + ",".join(batch) + suffix)
+    return payloads
+
+
+def decode_payload(payload: str) -> tuple[str, list[tuple[str, Any]] | None]:
+    """Decode a payload from :func:`encode_payloads`.
+
+    Returns the sending worker and its events, or None for a full flush.
+    Raises ``ValueError`` for a malformed payload.
+    """
+    try:
+        data = json.loads(payload)
+        origin = str(data["o"])
+        if data.get("f"):
+            return origin, None
+        return origin, [(str(entity), entity_id) for entity, entity_id in data["e"]]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid invalidation payload: {payload[:100]}") from e
+
+
+class InvalidationTransport(Protocol):
+    """A channel carrying invalidation payloads between workers."""
+
+    async def listen(
+        self, on_connect: Callable[[], None], on_message: Callable[[str], None]
+    ) -> None:
+        """Subscribe, then deliver payloads until the connection is lost.
+
+        Calls ``on_connect`` once subscribed and raises when disconnected.
+        """
+
+    async def publish(self, payload: str) -> None:
+        """Send a payload to every subscribed worker, including this one."""
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY on one dedicated connection per worker.
+
+    The listening connection also sends the notifications, and is pinged
+    every ``keepalive`` seconds so a silently dropped connection is noticed.
+    """
+
+    def __init__(self, dsn: str, channel: str, keepalive: float = 30.0):
+        """Initialize the transport."""
+        self.dsn = dsn
+        self.channel = channel
+        self.keepalive = keepalive
+        self._connection: Any = None
+        self._lock = asyncio.Lock()
+
+    async def listen(
+        self, on_connect: Callable[[], None], on_message: Callable[[str], None]
+    ) -> None:
+        """Listen on the channel until the connection is lost."""
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError(
+                "asyncpg is required for Postgres cache invalidation; "
+                'install with `pip install -e ".[postgres]"`'
+            ) from e
+
+        lost = asyncio.Event()
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            connection.add_termination_listener(lambda _connection: lost.set())
+            await connection.add_listener(
+                self.channel,
+                lambda _connection, _pid, _channel, payload: on_message(payload),
+            )
+            self._connection = connection
+            on_connect()
+            while not lost.is_set():
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(lost.wait(), self.keepalive)
+                    break
+                async with self._lock:
+                    await connection.execute("SELECT 1", timeout=self.keepalive)
+            raise ConnectionError("Postgres listener connection closed")
+        finally:
+            self._connection = None
+            connection.terminate()
+
+    async def publish(self, payload: str) -> None:
+        """Notify the channel."""
+        connection = self._connection
+        if connection is None:
+            raise ConnectionError("Postgres listener is not connected")
+        async with self._lock:
+            await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+
+class RedisTransport:
+    """Redis pub/sub, with one subscribed connection per worker."""
+
+    def __init__(self, url: str, channel: str, keepalive: float = 30.0):
+        """Initialize the transport."""
+        self.url = url
+        self.channel = channel
+        self.keepalive = keepalive
+        self._client: Any = None
+
+    async def listen(
+        self, on_connect: Callable[[], None], on_message: Callable[[str], None]
+    ) -> None:
+        """Subscribe to the channel until the connection is lost."""
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "redis is required for Redis cache invalidation; "
+                'install with `pip install -e ".[redis]"`'
+            ) from e
+
+        client = redis.from_url(
+            self.url, decode_responses=True, health_check_interval=self.keepalive
+        )
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            self._client = client
+            on_connect()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    on_message(message["data"])
+            raise ConnectionError("Redis subscription closed")
+        finally:
+            self._client = None
+            with suppress(Exception):
+                await pubsub.aclose()
+                await client.aclose()
+
+    async def publish(self, payload: str) -> None:
+        """Publish to the channel."""
+        client = self._client
+        if client is None:
+            raise ConnectionError("Redis subscriber is not connected")
+        await client.publish(self.channel, payload)
+
+
+def create_invalidation_transport(config: Settings) -> InvalidationTransport | None:
+    """Pick Redis when configured, else Postgres, else no transport.
+
+    Without a transport, or its client library, each worker only evicts
+    what it wrote itself.
+    """
+    transport: InvalidationTransport
+    if config.REDIS_URL:
+        module = "redis"
+        transport = RedisTransport(config.REDIS_URL, config.INVALIDATION_CHANNEL)
+    elif config.DATABASE_URL.startswith(("postgresql://", "postgres://")):
+        module = "asyncpg"
+        transport = PostgresTransport(config.DATABASE_URL, config.INVALIDATION_CHANNEL)
+    else:
+        return None
+    if find_spec(module) is None:
+        logger.warning(
+            f"{module} is not installed; cache invalidation stays local to each worker"
+        )
+        return None
+    return transport
+
+
+class InvalidationBus:
+    """Tell the other workers which cached entities a write made stale.
+
+    Writers :meth:`publish` ``(entity, id)`` events after evicting their
+    own caches, or have handlers subscribed with ``local`` do it. Events are
+    coalesced and sent in compact batches by a background
+    task. Every worker keeps one listening connection and passes events from
+    the others to the subscribed handlers. Notifications sent while a worker
+    is disconnected are lost, so it drops all cached entries when the
+    connection is lost, on every failed reconnect attempt (at most
+    ``reconnect_max`` seconds apart) and once reconnected; caches are never
+    stale for longer than that. Past ``max_pending`` unsent events the batch
+    is replaced with one full flush.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 1000,
+        reconnect_min: float = 0.5,
+        reconnect_max: float = 30.0,
+    ):
+        """Initialize the bus."""
+        self.max_pending = max_pending
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.origin = uuid.uuid4().hex[:12]
+        self.transport: InvalidationTransport | None = None
+        self.handlers: dict[str, InvalidationHandler] = {}
+        self.local_handlers: set[str] = set()
+        self.connected = False
+        self.published_total = 0
+        self.received_total = 0
+        self.flushes_total = 0
+        self.reconnects_total = 0
+        self.errors_total = 0
+        self._pending: dict[tuple[str, Any], None] = {}
+        self._flush_pending = False
+        self._was_connected = False
+        self._delay = reconnect_min
+        self._wake = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def subscribe(
+        self, name: str, handler: InvalidationHandler, local: bool = False
+    ) -> None:
+        """Evict from a cache on events from other workers.
+
+        With ``local``, the handler also runs for this worker's own writes,
+        for caches the writer does not evict itself.
+        """
+        self.handlers[name] = handler
+        if local:
+            self.local_handlers.add(name)
+        else:
+            self.local_handlers.discard(name)
+
+    def publish(self, entity: str, entity_id: Any = None) -> None:
+        """Queue an event for the other workers; a None ID means the collection."""
+        for name in self.local_handlers:
+            self._call(name, entity, entity_id)
+        if self.transport is None:
+            return
+        if not self._flush_pending:
+            self._pending[(entity, entity_id)] = None
+            if len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._flush_pending = True
+        self._wake.set()
+
+    def evict(self, entity: str | None, entity_id: Any = None) -> None:
+        """Pass an event to every handler."""
+        for name in self.handlers:
+            self._call(name, entity, entity_id)
+
+    def flush(self) -> None:
+        """Drop everything the handlers have cached."""
+        self.flushes_total += 1
+        self.evict(None)
+
+    def start(self, transport: InvalidationTransport | None) -> None:
+        """Start listening and sending, unless there is no transport."""
+        if transport is None or self._tasks:
+            return
+        self.transport = transport
+        # Events bind to the running loop, which differs between app restarts
+        self._wake, self._ready = asyncio.Event(), asyncio.Event()
+        if self._pending or self._flush_pending:
+            self._wake.set()
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._send()),
+        ]
+
+    async def stop(self) -> None:
+        """Send what is queued, then disconnect."""
+        if not self._tasks:
+            return
+        listener, sender = self._tasks
+        self._tasks = []
+        sender.cancel()
+        with suppress(asyncio.CancelledError):
+            await sender
+        if self.connected:
+            await self._send_pending()
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+        self.connected = False
+        self._ready.clear()
+        self.transport = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get connection state and event counters."""
+        return {
+            "transport": (
+                type(self.transport).__name__ if self.transport is not None else None
+            ),
+            "connected": self.connected,
+            "pending": len(self._pending) + self._flush_pending,
+            "published_total": self.published_total,
+            "received_total": self.received_total,
+            "flushes_total": self.flushes_total,
+            "reconnects_total": self.reconnects_total,
+            "errors_total": self.errors_total,
+        }
+
+    def _call(self, name: str, entity: str | None, entity_id: Any) -> None:
+        try:
+            self.handlers[name](entity, entity_id)
+        except Exception as e:
+            logger.error(f"Cache invalidation handler {name} failed: {e}")
+
+    def _on_connect(self) -> None:
+        if self._was_connected:
+            self.reconnects_total += 1
+            logger.info("Reconnected cache invalidation listener")
+            # Catch up on whatever was written while disconnected
+            self.flush()
+        self._was_connected = True
+        self.connected = True
+        self._delay = self.reconnect_min
+        self._ready.set()
+
+    def _on_message(self, payload: str) -> None:
+        try:
+            origin, events = decode_payload(payload)
+        except ValueError as e:
+            logger.warning(f"{e}; flushing caches")
+            self.flush()
+            return
+        if origin == self.origin:
+            return
+        self.received_total += 1
+        if events is None:
+            self.flush()
+            return
+        for entity, entity_id in events:
+            self.evict(entity, entity_id)
+
+    async def _listen(self) -> None:
+        assert self.transport is not None
+        while True:
+            try:
+                await self.transport.listen(self._on_connect, self._on_message)
+            except Exception as e:
+                if self.connected:
+                    logger.warning(f"Lost cache invalidation listener: {e}")
+                else:
+                    logger.debug(f"Cache invalidation listener unavailable: {e}")
+                self.errors_total += 1
+            self.connected = False
+            self._ready.clear()
+            # Notifications are lost while disconnected
+            self.flush()
+            await asyncio.sleep(self._delay)
+            self._delay = min(self._delay * 2, self.reconnect_max)
+
+    async def _send(self) -> None:
+        while True:
+            await self._wake.wait()
+            await self._ready.wait()
+            self._wake.clear()
+            if not await self._send_pending():
+                self._wake.set()
+                await asyncio.sleep(self._delay)
+
+    async def _send_pending(self) -> bool:
+        """Send queued events, keeping them queued if that fails."""
+        events, flush = list(self._pending), self._flush_pending
+        self._pending, self._flush_pending = {}, False
+        if not events and not flush:
+            return True
+        assert self.transport is not None
+        try:
+            for payload in encode_payloads(self.origin, events, flush):
+                await self.transport.publish(payload)
+        except BaseException as e:
+            # Events queued in the meantime stay after the ones being retried
+            self._pending = dict.fromkeys(events) | self._pending
+            self._flush_pending |= flush
+            if self._flush_pending or len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._flush_pending = True
+            if not isinstance(e, Exception):
+                raise
+            self.errors_total += 1
+            logger.warning(f"Could not publish cache invalidations: {e}")
+            return False
+        self.published_total += len(events) or 1
+        return True
+
+
+# Shared cache invalidation bus for the worker process
+invalidation_bus = InvalidationBus(
+    max_pending=settings.INVALIDATION_MAX_PENDING,
+    reconnect_max=settings.INVALIDATION_RECONNECT_MAX_SECONDS,
+)
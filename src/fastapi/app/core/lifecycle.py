@@ -0,0 +1,132 @@
+"""Application lifecycle state and coordinated shutdown."""
+
+import asyncio
+import signal
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from enum import IntEnum
+from types import FrameType
+
+from loguru import logger
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+
+class ShutdownPhase(IntEnum):
+    """Ordered shutdown phases that run after in-flight requests drain."""
+
+    FLUSH = 1  # Background queues and buffered work
+    DATABASE = 2  # Database connection pools
+    CACHE = 3  # Redis, HTTP and other clients
+
+
+class Lifecycle:
+    """Track in-flight requests and run shutdown in ordered, timed phases."""
+
+    def __init__(self) -> None:
+        """Initialize the lifecycle state."""
+        self.draining = False
+        self.inflight = 0
+        self._hooks: dict[ShutdownPhase, dict[str, ShutdownHook]] = {
+            phase: {} for phase in ShutdownPhase
+        }
+
+    @property
+    def accepting_traffic(self) -> bool:
+        """Check if the worker should receive new traffic."""
+        return not self.draining
+
+    def request_started(self) -> None:
+        """Count a request as in flight."""
+        self.inflight += 1
+
+    def request_finished(self) -> None:
+        """Count a request as finished."""
+        self.inflight -= 1
+
+    def on_shutdown(self, phase: ShutdownPhase, name: str, hook: ShutdownHook) -> None:
+        """Register a hook to run during a shutdown phase, replacing any by name."""
+        self._hooks[phase][name] = hook
+
+    def start(self) -> None:
+        """Mark the worker as accepting traffic."""
+        self.draining = False
+
+    def begin_draining(self) -> None:
+        """Stop advertising readiness so load balancers move traffic away."""
+        if not self.draining:
+            self.draining = True
+            logger.info("Draining: readiness set to not ready")
+
+    def install_signal_handler(self, grace_period: float) -> None:
+        """Flip readiness on SIGTERM before the server stops accepting requests.
+
+        The previously installed handler (the server's own) is invoked after
+        the grace period, giving load balancers time to observe ``/ready``
+        failing while in-flight and late-routed requests are still served.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum: int, frame: FrameType | None) -> None:
+            self.begin_draining()
+            if callable(previous):
+                loop.call_soon_threadsafe(
+                    loop.call_later, grace_period, previous, signum, frame
+                )
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+    async def wait_for_idle(self, timeout: float, poll: float = 0.05) -> bool:
+        """Wait until no requests are in flight."""
+        deadline = time.monotonic() + timeout
+        while self.inflight > 0:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll)
+        return True
+
+    async def shutdown(self, drain_timeout: float) -> None:
+        """Drain requests and run shutdown hooks phase by phase."""
+        started = time.perf_counter()
+
+        with _timed_phase("stop accepting traffic"):
+            self.begin_draining()
+
+        with _timed_phase("wait for in-flight requests"):
+            if not await self.wait_for_idle(drain_timeout):
+                logger.warning(
+                    f"Drain deadline of {drain_timeout}s reached with "
+                    f"{self.inflight} requests still in flight"
+                )
+
+        for phase in ShutdownPhase:
+            for name, hook in self._hooks[phase].items():
+                with _timed_phase(f"{phase.name.lower()}: {name}"):
+                    try:
+                        await hook()
+                    except Exception as e:
+                        logger.error(f"Shutdown hook {name} failed: {e}")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Shutdown completed in {elapsed_ms:.1f} ms")
+
+
+@contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+    """Log how long a shutdown phase took."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Shutdown phase '{name}' took {elapsed_ms:.1f} ms")
+
+
+# Shared lifecycle state for the worker process
+lifecycle = Lifecycle()
@@ -0,0 +1,17 @@
+"""Logging configuration."""
+
+import sys
+
+from loguru import logger
+
+from app.core.config import LogFormat, Settings
+
+
+def configure_logging(settings: Settings) -> None:
+    """Send logs to stderr at the configured level and format."""
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=settings.LOG_LEVEL.value,
+        serialize=settings.LOG_FORMAT == LogFormat.JSON,
+    )
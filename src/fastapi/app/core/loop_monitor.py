@@ -0,0 +1,174 @@
+"""Event loop lag monitor and blocking-call detector."""
+
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+
+# Histogram bucket upper bounds in milliseconds
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LoopLagMonitor:
+    """Measure event loop scheduling lag and report calls that block the loop.
+
+    A task on the loop sleeps for a fixed interval and records how late it
+    wakes up. A watchdog thread checks the task's heartbeat and, when the loop
+    has not ticked for longer than the threshold, logs the stack of the loop
+    thread so the blocking call can be identified.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.1,
+        liveness_limit: float | None = None,
+        liveness_window: float = 30.0,
+        window_size: int = 600,
+    ):
+        """Initialize the monitor."""
+        self.interval = interval
+        self.threshold = threshold
+        self.liveness_limit = liveness_limit
+        self.liveness_window = liveness_window
+        self.buckets = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=window_size)
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self.last_blocked_stack: str | None = None
+        self._above_limit_since: float | None = None
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Check if the monitor is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.debug("Event loop lag monitor started")
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def record(self, lag: float) -> None:
+        """Record a single lag measurement in seconds."""
+        lag_ms = lag * 1000
+        self.buckets[bisect.bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+        self.recent.append(lag_ms)
+        self.max_lag = max(self.max_lag, lag)
+
+        if self.liveness_limit is not None and lag >= self.liveness_limit:
+            if self._above_limit_since is None:
+                self._above_limit_since = time.monotonic()
+        else:
+            self._above_limit_since = None
+
+    def percentiles(self) -> dict[str, float] | None:
+        """Get lag percentiles in milliseconds over the recent window."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+
+        def pick(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+        return {
+            "p50": pick(0.50),
+            "p90": pick(0.90),
+            "p99": pick(0.99),
+            "max": round(ordered[-1], 3),
+        }
+
+    def histogram(self) -> dict[str, int]:
+        """Get lag histogram counts keyed by bucket upper bound."""
+        labels = [f"le_{bound}ms" for bound in LAG_BUCKETS_MS] + ["le_inf"]
+        return dict(zip(labels, self.buckets, strict=True))
+
+    def is_alive(self) -> bool:
+        """Check that lag has not stayed above the liveness limit too long."""
+        if self._above_limit_since is None:
+            return True
+        return time.monotonic() - self._above_limit_since < self.liveness_window
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a summary of the monitor state."""
+        return {
+            "percentiles_ms": self.percentiles(),
+            "histogram": self.histogram(),
+            "blocked_count": self.blocked_count,
+            "last_blocked_stack": self.last_blocked_stack,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record(max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stop.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.threshold or heartbeat == reported_heartbeat:
+                continue
+            # Report each stall once, while the blocking call is still running
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is None:
+                continue
+            self.blocked_count += 1
+            self.last_blocked_stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop blocked for over {stalled * 1000:.0f} ms:\n"
+                f"{self.last_blocked_stack}"
+            )
+
+
+# Shared monitor for the worker process
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000,
+    liveness_limit=(
+        settings.LOOP_LAG_LIVENESS_LIMIT_MS / 1000
+        if settings.LOOP_LAG_LIVENESS_LIMIT_MS
+        else None
+    ),
+    liveness_window=settings.LOOP_LAG_LIVENESS_WINDOW_SECONDS,
+)
@@ -0,0 +1,209 @@
+"""Memory diagnostics for finding leaks in long-running workers."""
+
+import gc
+import os
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Allocations made by the diagnostics themselves
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size of this process, where available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def max_rss_bytes() -> int | None:
+    """Peak resident set size of this process."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _stat_to_dict(
+    stat: tracemalloc.Statistic | tracemalloc.StatisticDiff,
+) -> dict[str, Any]:
+    frames = [f"{Path(f.filename).name}:{f.lineno}" for f in stat.traceback]
+    data: dict[str, Any] = {
+        "site": frames[0] if frames else "?",
+        "file": stat.traceback[0].filename if frames else None,
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        data["size_diff_bytes"] = stat.size_diff
+        data["count_diff"] = stat.count_diff
+    if len(frames) > 1:
+        data["traceback"] = frames
+    return data
+
+
+class MemoryProfiler:
+    """Drive tracemalloc and the garbage collector for one worker process.
+
+    Snapshots are kept in memory, bounded by ``max_snapshots``, so they can be
+    diffed against each other or against the current heap to find the
+    allocation sites that keep growing.
+    """
+
+    def __init__(self, max_snapshots: int = 4):
+        """Initialize the profiler."""
+        self.max_snapshots = max_snapshots
+        self.snapshots: OrderedDict[str, tuple[float, tracemalloc.Snapshot]] = (
+            OrderedDict()
+        )
+
+    def start(self, frames: int = 1) -> dict[str, Any]:
+        """Start tracing allocations, keeping ``frames`` frames per allocation."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc started with {frames} frames in worker {os.getpid()}")
+        return self.status()
+
+    def stop(self) -> dict[str, Any]:
+        """Stop tracing and drop stored snapshots."""
+        tracemalloc.stop()
+        self.snapshots.clear()
+        logger.info(f"tracemalloc stopped in worker {os.getpid()}")
+        return self.status()
+
+    def status(self) -> dict[str, Any]:
+        """Report tracing state, traced memory and process RSS."""
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "rss_bytes": rss_bytes(),
+            "max_rss_bytes": max_rss_bytes(),
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, (taken_at, _) in self.snapshots.items()
+            ],
+        }
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc is not running; start it first")
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def snapshot(self, group_by: str = "lineno", limit: int = 20) -> dict[str, Any]:
+        """Take and store a snapshot and report its largest allocation sites."""
+        snapshot = self._take()
+        snapshot_id = uuid.uuid4().hex[:12]
+        self.snapshots[snapshot_id] = (time.time(), snapshot)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+
+        stats = snapshot.statistics(group_by)
+        return {
+            "pid": os.getpid(),
+            "id": snapshot_id,
+            "total_bytes": sum(stat.size for stat in stats),
+            "top": [_stat_to_dict(stat) for stat in stats[:limit]],
+        }
+
+    def diff(
+        self,
+        base: str | None = None,
+        compare: str | None = None,
+        group_by: str = "lineno",
+        limit: int = 20,
+    ) -> dict[str, Any]:
+        """Diff two stored snapshots, or a stored one against the current heap.
+
+        ``base`` defaults to the newest snapshot, which lets every worker be
+        diffed with one request. Sites are ordered by growth, so leaks come
+        first.
+        """
+        if base is None:
+            if not self.snapshots:
+                raise ValueError("No snapshots taken yet")
+            base = next(reversed(self.snapshots))
+        if base not in self.snapshots:
+            raise KeyError(f"Snapshot {base} not found")
+        if compare is not None and compare not in self.snapshots:
+            raise KeyError(f"Snapshot {compare} not found")
+        new = self._take() if compare is None else self.snapshots[compare][1]
+
+        stats = new.compare_to(self.snapshots[base][1], group_by)
+        return {
+            "pid": os.getpid(),
+            "base": base,
+            "compare": compare,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_stat_to_dict(stat) for stat in stats[:limit]],
+        }
+
+    def gc_stats(self) -> dict[str, Any]:
+        """Report garbage collector generation stats."""
+        return {
+            "pid": os.getpid(),
+            "enabled": gc.isenabled(),
+            "counts": gc.get_count(),
+            "thresholds": gc.get_threshold(),
+            "generations": gc.get_stats(),
+            "garbage": len(gc.garbage),
+            "frozen": gc.get_freeze_count(),
+            "rss_bytes": rss_bytes(),
+        }
+
+    def object_counts(self, limit: int = 30, collect: bool = False) -> dict[str, Any]:
+        """Count live GC-tracked objects by type, most common first."""
+        unreachable = gc.collect() if collect else None
+        counts = Counter(
+            f"{type(obj).__module__}.{type(obj).__qualname__}"
+            for obj in gc.get_objects()
+        )
+        return {
+            "pid": os.getpid(),
+            "collected": unreachable,
+            "total": counts.total(),
+            "types": dict(counts.most_common(limit)),
+        }
+
+    def run(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Run a diagnostics command by name, as sent over the control channel."""
+        handlers = {
+            "status": self.status,
+            "start": self.start,
+            "stop": self.stop,
+            "snapshot": self.snapshot,
+            "diff": self.diff,
+            "gc": self.gc_stats,
+            "objects": self.object_counts,
+        }
+        if command not in handlers:
+            raise ValueError(f"Unknown memory command: {command}")
+        return handlers[command](**params)
+
+
+# Shared memory profiler for the worker process
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,210 @@
+"""Low-overhead sampling profiler for individual requests."""
+
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+
+Frame = tuple[str, str, int]
+Stack = tuple[Frame, ...]
+
+MAX_STACK_DEPTH = 128
+
+
+def _capture_stack(frame: FrameType | None) -> Stack:
+    """Convert a frame chain into a root-first stack of (name, file, line)."""
+    frames: list[Frame] = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+class SamplingProfiler:
+    """Periodically sample the stack of a single thread from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        """Initialize the profiler for the given thread."""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[Stack] = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_capture_stack(frame)] += 1
+
+
+def to_collapsed(samples: Counter[Stack]) -> str:
+    """Render samples in the collapsed-stack format used by flamegraph tools."""
+    lines = []
+    for stack, count in samples.most_common():
+        names = ";".join(
+            f"{name} ({Path(file).name}:{line})" for name, file, line in stack
+        )
+        lines.append(f"{names} {count}")
+    return "\n".join(lines)
+
+
+def to_speedscope(
+    samples: Counter[Stack], name: str, interval: float
+) -> dict[str, Any]:
+    """Render samples as a speedscope sampled profile."""
+    frame_index: dict[Frame, int] = {}
+    frames: list[dict[str, Any]] = []
+    stacks: list[list[int]] = []
+    weights: list[float] = []
+
+    for stack, count in samples.items():
+        indices = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            indices.append(frame_index[frame])
+        stacks.append(indices)
+        weights.append(count * interval * 1000)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "fastapi-reference",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+@dataclass
+class Profile:
+    """A captured profile for a single request."""
+
+    route: str
+    interval: float
+    duration: float
+    samples: Counter[Stack]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+    def to_speedscope(self) -> dict[str, Any]:
+        """Render the profile as speedscope JSON."""
+        return to_speedscope(self.samples, f"{self.route} {self.id}", self.interval)
+
+
+class ProfileStore:
+    """Recent on-demand profiles and per-route aggregates for continuous mode."""
+
+    def __init__(
+        self,
+        max_profiles: int = 20,
+        max_routes: int = 256,
+        output_dir: str | None = None,
+    ):
+        """Initialize the store."""
+        self._profiles: deque[Profile] = deque(maxlen=max_profiles)
+        self._routes: OrderedDict[str, Counter[Stack]] = OrderedDict()
+        self._route_requests: Counter[str] = Counter()
+        self.max_routes = max_routes
+        self.output_dir = Path(output_dir) if output_dir else None
+
+    def add(self, profile: Profile) -> None:
+        """Keep an on-demand profile and optionally write it to disk."""
+        self._profiles.append(profile)
+        if self.output_dir is not None:
+            self._write(profile)
+
+    def aggregate(self, route: str, samples: Counter[Stack]) -> None:
+        """Merge samples from a continuously profiled request into its route."""
+        if route not in self._routes:
+            if len(self._routes) >= self.max_routes:
+                evicted, _ = self._routes.popitem(last=False)
+                del self._route_requests[evicted]
+            self._routes[route] = Counter()
+        self._routes[route].update(samples)
+        self._route_requests[route] += 1
+
+    def get(self, profile_id: str) -> Profile | None:
+        """Get an on-demand profile by ID."""
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list_profiles(self) -> list[dict[str, Any]]:
+        """Summarize the stored on-demand profiles."""
+        return [
+            {
+                "id": p.id,
+                "route": p.route,
+                "duration_ms": round(p.duration * 1000, 2),
+                "samples": sum(p.samples.values()),
+                "created_at": p.created_at,
+            }
+            for p in self._profiles
+        ]
+
+    def list_routes(self) -> dict[str, dict[str, int]]:
+        """Summarize the per-route aggregates."""
+        return {
+            route: {
+                "requests": self._route_requests[route],
+                "samples": sum(samples.values()),
+            }
+            for route, samples in self._routes.items()
+        }
+
+    def route_samples(self, route: str) -> Counter[Stack] | None:
+        """Get the aggregated samples for a route."""
+        return self._routes.get(route)
+
+    def _write(self, profile: Profile) -> None:
+        assert self.output_dir is not None
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"{profile.id}.speedscope.json"
+            path.write_text(json.dumps(profile.to_speedscope()))
+            logger.info(f"Wrote profile for {profile.route} to {path}")
+        except OSError as e:
+            logger.error(f"Failed to write profile: {e}")
+
+
+# Shared store for the worker process
+profile_store = ProfileStore(output_dir=settings.PROFILING_OUTPUT_DIR)
@@ -0,0 +1,39 @@
+"""Fast-path JSON responses for already-validated models."""
+
+from collections.abc import Sequence
+from dataclasses import is_dataclass
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=256)
+def list_adapter(model: type) -> TypeAdapter[list[Any]]:
+    """Get a cached adapter that serializes lists of a model or row type."""
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+class TrustedJSONResponse(JSONResponse):
+    """Serialize models the handler built itself straight to JSON bytes.
+
+    Returning a response skips FastAPI's ``response_model`` validation and
+    the intermediate dict, so only use it when the content already is the
+    declared model (or a list of it, or of its compact rows). Keep
+    ``response_model`` on the route so the OpenAPI schema is unchanged. Lists
+    are assumed homogeneous.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Render models with their compiled serializers."""
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        if (
+            isinstance(content, Sequence)
+            and content
+            and (isinstance(content[0], BaseModel) or is_dataclass(content[0]))
+        ):
+            item_type: type = type(content[0])
+            return list_adapter(item_type).dump_json(list(content), by_alias=True)
+        return super().render(content)
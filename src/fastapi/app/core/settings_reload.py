@@ -0,0 +1,190 @@
+"""Reload settings at runtime without restarting workers."""
+
+import asyncio
+import os
+import signal
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pydantic import ValidationError
+from pydantic_core import ErrorDetails
+
+from app.core.config import Settings, settings
+
+SettingsSubscriber = Callable[[Settings, set[str]], None]
+
+# Settings that are read per request or pushed to subscribers. Everything else
+# is baked into the app, clients or middleware at startup and needs a restart.
+RELOADABLE_SETTINGS = frozenset(
+    {
+        "DRAIN_TIMEOUT_SECONDS",
+        "ALLOWED_ORIGINS",
+        "ALLOW_CREDENTIALS",
+        "ALLOW_METHODS",
+        "ALLOW_HEADERS",
+        "DB_SLOW_QUERY_THRESHOLD_MS",
+        "DB_EXPLAIN_SLOW_QUERIES",
+        "DB_EXPLAIN_SAMPLE_RATE",
+        "JOB_MAX_ATTEMPTS",
+        "ACCESS_TOKEN_EXPIRE_MINUTES",
+        "REFRESH_TOKEN_EXPIRE_DAYS",
+        "LOG_LEVEL",
+        "LOG_FORMAT",
+        "BATCH_MAX_REQUESTS",
+        "BATCH_MAX_CONCURRENCY",
+        "RATE_LIMIT_ENABLED",
+        "RATE_LIMIT_REQUESTS",
+        "RATE_LIMIT_PERIOD",
+        "CONCURRENCY_LIMIT_MIN",
+        "CONCURRENCY_LIMIT_MAX",
+        "CONCURRENCY_LATENCY_TARGET_MS",
+        "CONCURRENCY_QUEUE_SIZE",
+        "CONCURRENCY_QUEUE_TIMEOUT_MS",
+        "PROFILING_TOKEN",
+        "FEATURE_ADMIN_PANEL",
+    }
+)
+
+
+class SettingsReloadError(ValueError):
+    """The new configuration failed validation and was not applied."""
+
+    def __init__(self, errors: list[ErrorDetails]):
+        """Initialize the error."""
+        super().__init__(f"Invalid settings: {len(errors)} validation errors")
+        self.errors = errors
+
+
+class SettingsReloader:
+    """Re-validate settings and swap them into the shared instance.
+
+    The shared ``settings`` object is imported by value throughout the app,
+    so it is updated in place: its field dict is replaced with a single
+    assignment, which is atomic for both coroutines and threads. Only
+    :data:`RELOADABLE_SETTINGS` change; other changed keys keep their current
+    value and are reported as needing a restart. Subscribers are notified
+    with the changed keys after the swap.
+    """
+
+    def __init__(self, target: Settings, env_file: str | Path = ".env"):
+        """Initialize the reloader."""
+        self.target = target
+        self.env_file = Path(env_file)
+        self.reloads = 0
+        self._subscribers: dict[str, SettingsSubscriber] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._watch_task: asyncio.Task[None] | None = None
+
+    def subscribe(self, name: str, callback: SettingsSubscriber) -> None:
+        """Register a callback for applied changes, replacing any by name."""
+        self._subscribers[name] = callback
+
+    async def reload(self) -> dict[str, list[str]]:
+        """Load and validate settings from the environment and apply them."""
+        async with self._lock:
+            try:
+                # The pydantic plugin does not know the settings-only arguments
+                new = await asyncio.to_thread(
+                    Settings, _env_file=self.env_file  # type: ignore[call-arg]
+                )
+            except ValidationError as e:
+                logger.error(f"Settings reload rejected: {e}")
+                raise SettingsReloadError(e.errors(include_url=False)) from e
+
+            current = self.target.__dict__
+            changed = {
+                key
+                for key, value in new.__dict__.items()
+                if current.get(key) != value and _is_configured(new, key)
+            }
+            applied = changed & RELOADABLE_SETTINGS
+            pending = changed - RELOADABLE_SETTINGS
+
+            if applied:
+                values = dict(current)
+                values.update({key: new.__dict__[key] for key in applied})
+                object.__setattr__(self.target, "__dict__", values)
+                self.reloads += 1
+                logger.info(f"Settings reloaded: {', '.join(sorted(applied))}")
+                self._notify(applied)
+            if pending:
+                logger.warning(
+                    f"Settings changes need a restart: {', '.join(sorted(pending))}"
+                )
+            return {"applied": sorted(applied), "restart_required": sorted(pending)}
+
+    def _notify(self, changed: set[str]) -> None:
+        for name, callback in self._subscribers.items():
+            try:
+                callback(self.target, changed)
+            except Exception as e:
+                logger.error(f"Settings subscriber {name} failed: {e}")
+
+    async def _reload_logged(self) -> None:
+        try:
+            await self.reload()
+        except SettingsReloadError:
+            pass  # Already logged; keep serving with the current settings
+
+    def install_signal_handler(self, signum: int = signal.SIGHUP) -> None:
+        """Reload settings when the worker receives ``signum``."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def schedule() -> None:
+            task = asyncio.create_task(self._reload_logged())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        loop.add_signal_handler(signum, schedule)
+
+    def start_watching(self, interval: float) -> None:
+        """Reload settings whenever the env file's modification time changes."""
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        """Stop watching the env file."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self, interval: float) -> None:
+        last_mtime = _mtime(self.env_file)
+        while True:
+            await asyncio.sleep(interval)
+            mtime = _mtime(self.env_file)
+            if mtime != last_mtime:
+                last_mtime = mtime
+                logger.info(f"{self.env_file} changed, reloading settings")
+                await self._reload_logged()
+
+
+def _is_configured(config: Settings, key: str) -> bool:
+    # Generated defaults (e.g. a random SECRET_KEY) differ on every load
+    field = Settings.model_fields[key]
+    return field.default_factory is None or key in config.model_fields_set
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+# Shared settings reloader for the worker process
+env_file = Settings.model_config.get("env_file")
+settings_reloader = SettingsReloader(
+    settings, env_file=env_file if isinstance(env_file, str | Path) else ".env"
+)
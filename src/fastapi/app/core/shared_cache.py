@@ -0,0 +1,380 @@
+"""Key/value cache in shared memory, used by every worker on a host."""
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+
+MAGIC = b"SHMCACH1"
+
+# magic, sets, ways, slot size
+HEADER = struct.Struct("<8sIII")
+HEADER_BYTES = 64
+
+# seq, flags, key hash, expires at (0 = never), key length, value length
+SLOT = struct.Struct("<IIQdII")
+SEQ = struct.Struct("<I")
+HASH = struct.Struct("<Q")
+HASH_OFFSET = 8
+
+USED = 1
+
+# Reads retried while a writer holds the slot before counting a miss
+READ_RETRIES = 64
+
+
+def _hash(key: bytes) -> int:
+    # Stable across processes, unlike hash(); keys are compared on a match
+    return zlib.crc32(key) + 1
+
+
+def default_cache_path() -> Path:
+    """File shared by the workers of one server process."""
+    # Workers are children of the same master, which outlives their recycling
+    return Path(tempfile.gettempdir()) / f"shared-cache-{os.getppid()}.mmap"
+
+
+class SharedCache:
+    """Set-associative cache in a memory-mapped file shared by all workers.
+
+    Keys hash to a set of ``ways`` fixed-size slots. Each slot holds one
+    JSON-encoded value together with its key, so entries larger than
+    ``slot_bytes`` are not cached. Readers take no lock: a slot's sequence
+    number is odd while it is being written, and a read is retried when the
+    number is odd or changed while the slot was copied (a seqlock). Writers
+    lock their set with a byte-range lock on the file, which the kernel
+    releases if a worker dies, so a recycled worker never leaves a set
+    locked; a slot it left half-written keeps an odd sequence number and is
+    simply overwritten. Full sets evict with the CLOCK algorithm, using one
+    reference byte per slot that hits set without a lock. Expired entries are
+    treated as empty.
+
+    The file outlives individual workers, so a replacement worker starts with
+    a warm cache. Hit and miss counters are per worker.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        slots: int = 4096,
+        slot_bytes: int = 1024,
+        ways: int = 8,
+    ):
+        """Initialize the cache, in ``default_cache_path()`` by default."""
+        self.configured_path = Path(path) if path else None
+        self.path = self.configured_path or default_cache_path()
+        self.ways = ways
+        self.sets = max(slots // ways, 1)
+        self.slot_bytes = slot_bytes
+        self.hits = 0
+        self.misses = 0
+        self._fd: int | None = None
+        self._mm: mmap.mmap | None = None
+        # fcntl locks are per process, so threads also need a local lock
+        self._lock = threading.Lock()
+
+        slot_count = self.sets * self.ways
+        self._refs_offset = HEADER_BYTES
+        self._hands_offset = self._refs_offset + slot_count
+        self._slots_offset = -(-(self._hands_offset + self.sets) // 64) * 64
+        self.size = self._slots_offset + slot_count * slot_bytes
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the cache file is mapped."""
+        return self._mm is not None
+
+    @property
+    def max_value_bytes(self) -> int:
+        """Largest encoded key plus value that fits in a slot."""
+        return self.slot_bytes - SLOT.size
+
+    def open(self) -> None:
+        """Map the cache file, creating or replacing it when needed."""
+        if self._mm is not None:
+            return
+        self.path = self.configured_path or default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = HEADER.pack(MAGIC, self.sets, self.ways, self.slot_bytes)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                # Only one worker checks and formats the file
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    stat = os.fstat(fd)
+                    if (
+                        os.pread(fd, HEADER.size, 0) == header
+                        and stat.st_size >= self.size
+                    ):
+                        self._mm = mmap.mmap(fd, self.size)
+                    elif stat.st_ino == os.stat(self.path).st_ino:
+                        if stat.st_size:
+                            logger.info(f"Resetting shared cache {self.path}")
+                        self._replace_file(header)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            except BaseException:
+                os.close(fd)
+                raise
+            if self._mm is not None:
+                break
+            # The file was replaced, by this worker or another: open the new one
+            os.close(fd)
+        self._fd = fd
+        logger.debug(
+            f"Shared cache {self.path}: {self.sets * self.ways} slots "
+            f"of {self.slot_bytes} bytes"
+        )
+
+    def _replace_file(self, header: bytes) -> None:
+        """Swap in a freshly formatted file.
+
+        Workers still mapping the old file, e.g. with other slot settings
+        before a reload, keep using it until they exit; resizing it in place
+        would crash them on access past the new end.
+        """
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, self.size)
+            os.pwrite(fd, header, 0)
+        finally:
+            os.close(fd)
+        os.replace(tmp, self.path)
+
+    async def close(self) -> None:
+        """Unmap the cache file, leaving it for the other workers."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _map(self) -> mmap.mmap:
+        if self._mm is None:
+            raise RuntimeError("Shared cache is not open")
+        return self._mm
+
+    def _slot(self, set_index: int, way: int) -> tuple[int, int]:
+        index = set_index * self.ways + way
+        return index, self._slots_offset + index * self.slot_bytes
+
+    def _read_slot(
+        self, mm: mmap.mmap, offset: int, key_hash: int, key: bytes
+    ) -> bytes | None:
+        """Copy the slot's value if it holds ``key`` and has not expired."""
+        for _ in range(READ_RETRIES):
+            seq, flags, slot_hash, expires_at, key_len, value_len = SLOT.unpack_from(
+                mm, offset
+            )
+            if seq & 1:
+                continue
+            if not flags & USED or slot_hash != key_hash:
+                return None
+            start = offset + SLOT.size
+            data = mm[start : start + key_len + value_len]
+            if SEQ.unpack_from(mm, offset)[0] != seq:
+                continue
+            if data[:key_len] != key or (expires_at and expires_at <= time.time()):
+                return None
+            return data[key_len:]
+        return None
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Get the raw value stored for ``key``."""
+        mm = self._map()
+        encoded = key.encode()
+        key_hash = _hash(encoded)
+        first = key_hash % self.sets * self.ways
+        for index in range(first, first + self.ways):
+            offset = self._slots_offset + index * self.slot_bytes
+            # Cheap filter before the validated copy
+            if HASH.unpack_from(mm, offset + HASH_OFFSET)[0] != key_hash:
+                continue
+            value = self._read_slot(mm, offset, key_hash, encoded)
+            if value is not None:
+                mm[self._refs_offset + index] = 1
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the value stored for ``key``, or ``default``."""
+        value = self.get_bytes(key)
+        return default if value is None else json.loads(value)
+
+    def _lock_set(self, set_index: int, operation: int) -> None:
+        # Byte-range locks only coordinate writers; readers never take them
+        fd = self._fd
+        assert fd is not None, "checked by _map()"
+        fcntl.lockf(fd, operation, 1, self._hands_offset + set_index)
+
+    def _write_slot(
+        self,
+        mm: mmap.mmap,
+        offset: int,
+        flags: int,
+        key_hash: int,
+        expires_at: float,
+        key: bytes,
+        value: bytes,
+    ) -> None:
+        seq = SEQ.unpack_from(mm, offset)[0]
+        # An odd sequence was left by a writer that died mid-write
+        writing = (seq + (2 if seq & 1 else 1)) & 0xFFFFFFFF
+        SEQ.pack_into(mm, offset, writing)
+        start = offset + SLOT.size
+        mm[start : start + len(key) + len(value)] = key + value
+        SLOT.pack_into(
+            mm, offset, writing, flags, key_hash, expires_at, len(key), len(value)
+        )
+        SEQ.pack_into(mm, offset, (writing + 1) & 0xFFFFFFFF)
+
+    def _find_way(
+        self, mm: mmap.mmap, set_index: int, key_hash: int, key: bytes
+    ) -> int:
+        """Pick the slot for ``key``: its own, an empty one or a CLOCK victim."""
+        now = time.time()
+        empty = None
+        for way in range(self.ways):
+            _, offset = self._slot(set_index, way)
+            _, flags, slot_hash, expires_at, key_len, _ = SLOT.unpack_from(mm, offset)
+            if flags & USED and slot_hash == key_hash:
+                start = offset + SLOT.size
+                if mm[start : start + key_len] == key:
+                    return way
+            if empty is None and (
+                not flags & USED or (expires_at and expires_at <= now)
+            ):
+                empty = way
+        if empty is not None:
+            return empty
+
+        hand_offset = self._hands_offset + set_index
+        hand = mm[hand_offset] % self.ways
+        # Give every recently used slot a second chance, at most once around
+        for _ in range(self.ways):
+            index, _ = self._slot(set_index, hand)
+            if not mm[self._refs_offset + index]:
+                break
+            mm[self._refs_offset + index] = 0
+            hand = (hand + 1) % self.ways
+        mm[hand_offset] = (hand + 1) % self.ways
+        return hand
+
+    def set_bytes(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        """Store a raw value and return whether it fit in a slot."""
+        mm = self._map()
+        encoded = key.encode()
+        if len(encoded) + len(value) > self.max_value_bytes:
+            return False
+        key_hash = _hash(encoded)
+        set_index = key_hash % self.sets
+        expires_at = time.time() + ttl if ttl else 0.0
+        with self._lock:
+            self._lock_set(set_index, fcntl.LOCK_EX)
+            try:
+                way = self._find_way(mm, set_index, key_hash, encoded)
+                index, offset = self._slot(set_index, way)
+                self._write_slot(mm, offset, USED, key_hash, expires_at, encoded, value)
+                mm[self._refs_offset + index] = 0
+            finally:
+                self._lock_set(set_index, fcntl.LOCK_UN)
+        return True
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        """Store a JSON-serializable value for ``ttl`` seconds (``None``: no expiry).
+
+        Returns ``False`` when the encoded key and value do not fit in a slot.
+        """
+        return self.set_bytes(
+            key, json.dumps(value, separators=(",", ":")).encode(), ttl
+        )
+
+    def delete(self, key: str) -> bool:
+        """Remove ``key`` and return whether it was stored."""
+        mm = self._map()
+        encoded = key.encode()
+        key_hash = _hash(encoded)
+        set_index = key_hash % self.sets
+        with self._lock:
+            self._lock_set(set_index, fcntl.LOCK_EX)
+            try:
+                for way in range(self.ways):
+                    _, offset = self._slot(set_index, way)
+                    if self._read_slot(mm, offset, key_hash, encoded) is not None:
+                        self._write_slot(mm, offset, 0, 0, 0.0, b"", b"")
+                        return True
+            finally:
+                self._lock_set(set_index, fcntl.LOCK_UN)
+        return False
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        mm = self._map()
+        with self._lock:
+            for set_index in range(self.sets):
+                self._lock_set(set_index, fcntl.LOCK_EX)
+                try:
+                    for way in range(self.ways):
+                        _, offset = self._slot(set_index, way)
+                        if SLOT.unpack_from(mm, offset)[1] & USED:
+                            self._write_slot(mm, offset, 0, 0, 0.0, b"", b"")
+                finally:
+                    self._lock_set(set_index, fcntl.LOCK_UN)
+
+    async def get_or_set(
+        self, key: str, factory: Callable[[], Awaitable[Any]], ttl: float | None = None
+    ) -> Any:
+        """Get ``key``, computing and storing it with ``factory`` on a miss."""
+        value = self.get_bytes(key)
+        if value is not None:
+            return json.loads(value)
+        result = await factory()
+        self.set(key, result, ttl)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the cache geometry, occupancy and this worker's counters."""
+        entries = 0
+        if self._mm is not None:
+            now = time.time()
+            for index in range(self.sets * self.ways):
+                offset = self._slots_offset + index * self.slot_bytes
+                _, flags, _, expires_at, _, _ = SLOT.unpack_from(self._mm, offset)
+                if flags & USED and not (expires_at and expires_at <= now):
+                    entries += 1
+        return {
+            "pid": os.getpid(),
+            "open": self.is_open,
+            "path": str(self.path),
+            "slots": self.sets * self.ways,
+            "slot_bytes": self.slot_bytes,
+            "size_bytes": self.size,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared-memory cache for the worker process
+shared_cache = SharedCache(
+    settings.SHARED_CACHE_PATH,
+    slots=settings.SHARED_CACHE_SLOTS,
+    slot_bytes=settings.SHARED_CACHE_SLOT_BYTES,
+)
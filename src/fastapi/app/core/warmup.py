@@ -0,0 +1,158 @@
+"""Warm-up run after startup, before the worker reports ready."""
+
+import asyncio
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, get_args, get_origin
+
+import fastapi.routing
+import httpx
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.responses import list_adapter
+from app.db.session import open_db_connections
+
+
+def api_routes(app: FastAPI) -> Iterator[Any]:
+    """Iterate over the app's API routes, including those of nested routers.
+
+    Listing included routers' routes also builds FastAPI's per-router route
+    tables, which are otherwise built by the first request routed through
+    them.
+    """
+    iter_route_contexts = getattr(fastapi.routing, "iter_route_contexts", None)
+    if iter_route_contexts is None:
+        # Older FastAPI keeps included routes flat on the app
+        yield from (route for route in app.routes if isinstance(route, APIRoute))
+        return
+    for context in iter_route_contexts(app.routes):
+        if isinstance(context.original_route, APIRoute):
+            yield context
+
+
+def warm_serializers(app: FastAPI) -> int:
+    """Run each route's response serializer once and return how many ran.
+
+    The OpenAPI schema is generated too when it is served. Lists of models
+    are answered through ``TrustedJSONResponse``, whose
+    per-model adapters are built on first use, so those are built here.
+    Responses that validate from an empty value, such as dicts and models
+    whose fields all have defaults, are also validated and serialized once.
+    """
+    if app.openapi_url:
+        app.openapi()
+    warmed = 0
+    for route in api_routes(app):
+        model = route.response_model
+        if get_origin(model) is list and get_args(model):
+            item = get_args(model)[0]
+            if isinstance(item, type) and issubclass(item, BaseModel):
+                list_adapter(item)
+        field = route.response_field
+        if field is None:
+            continue
+        value, errors = field.validate({}, {}, loc=("response",))
+        if errors:
+            continue
+        field.serialize(value, mode="json")
+        warmed += 1
+    return warmed
+
+
+async def request_paths(app: FastAPI, paths: Iterable[str]) -> dict[str, int]:
+    """GET each path through the full middleware stack, in-process."""
+    statuses = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://warmup"
+    ) as client:
+        for path in paths:
+            response = await client.get(path)
+            statuses[path] = response.status_code
+    return statuses
+
+
+class WarmUp:
+    """Take first-request costs before the worker reports ready.
+
+    Opens ``db_connections`` pooled connections, builds route tables and
+    response serializers, and requests ``paths`` once so settings, feature
+    flag and config handlers and their caches are exercised. While it runs
+    ``/ready`` reports not ready. It gives up after ``timeout`` seconds
+    rather than keep the worker out of rotation.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the warm-up state."""
+        self.pending = False
+        self.steps: dict[str, float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(
+        self,
+        app: FastAPI,
+        paths: Iterable[str] = (),
+        db_connections: int = 0,
+        timeout: float = 30.0,
+    ) -> None:
+        """Start warming up in the background."""
+        if self._task is None:
+            self.pending = True
+            self._task = asyncio.create_task(
+                self._run(app, list(paths), db_connections, timeout)
+            )
+
+    async def stop(self) -> None:
+        """Cancel an unfinished warm-up."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(
+        self, app: FastAPI, paths: list[str], db_connections: int, timeout: float
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await self.run(app, paths, db_connections)
+        except TimeoutError:
+            logger.warning(f"Warm-up did not finish within {timeout}s")
+        except Exception as e:
+            logger.warning(f"Warm-up failed: {e}")
+        finally:
+            self.pending = False
+        logger.info(
+            f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    async def run(self, app: FastAPI, paths: list[str], db_connections: int) -> None:
+        """Run each warm-up step, timing it."""
+        self.steps = {}
+
+        step = time.perf_counter()
+        connections = await open_db_connections(db_connections)
+        self.steps["database"] = time.perf_counter() - step
+        logger.debug(f"Warm-up opened {connections} database connections")
+
+        step = time.perf_counter()
+        serializers = warm_serializers(app)
+        self.steps["serializers"] = time.perf_counter() - step
+        logger.debug(f"Warm-up ran {serializers} response serializers")
+
+        step = time.perf_counter()
+        statuses = await request_paths(app, paths)
+        self.steps["requests"] = time.perf_counter() - step
+        failed = {path: code for path, code in statuses.items() if code >= 500}
+        if failed:
+            logger.warning(f"Warm-up requests failed: {failed}")
+
+
+# Shared warm-up state for the worker process
+warmup = WarmUp()
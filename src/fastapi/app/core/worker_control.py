@@ -0,0 +1,216 @@
+"""Control channel for sending commands to every worker on a host."""
+
+import asyncio
+import fcntl
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+
+CommandHandler = Callable[[str, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def _write_atomic(path: Path, data: Any) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data, default=str))
+    os.replace(tmp, path)
+
+
+def default_control_dir() -> Path:
+    """Directory shared by the workers of one server process."""
+    # Workers are children of the same master (or uvicorn supervisor)
+    return Path(tempfile.gettempdir()) / f"worker-control-{os.getppid()}"
+
+
+def default_lock_path(name: str) -> Path:
+    """Lock file shared by the workers of one server process."""
+    return Path(tempfile.gettempdir()) / f"{name}-{os.getppid()}.lock"
+
+
+@contextmanager
+def exclusive_lock(path: Path) -> Iterator[bool]:
+    """Try to take a lock file without waiting and report whether it was taken.
+
+    Lets one worker at a time run periodic work that every worker schedules.
+    The kernel releases the lock if its holder dies.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+class WorkerControlChannel:
+    """Broadcast commands to all workers through a shared directory.
+
+    A request is only served by one worker, so per-worker state can only be
+    inspected by asking every worker. Each worker polls the directory,
+    refreshing a heartbeat file as it goes, runs commands it has not seen yet
+    and writes one result file per command. The caller waits for a result
+    from every live worker, up to a timeout. A directory works for any number
+    of workers on one host without a broker.
+    """
+
+    def __init__(self, directory: str | Path | None = None, poll_interval: float = 0.5):
+        """Initialize the channel, in ``default_control_dir()`` by default."""
+        self.configured_directory = Path(directory) if directory else None
+        self.directory = self.configured_directory or default_control_dir()
+        self.poll_interval = poll_interval
+        self.pid = os.getpid()
+        self._handlers: dict[str, CommandHandler] = {}
+        self._seen: set[str] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def started(self) -> bool:
+        """Whether this worker is listening for commands."""
+        return self._task is not None
+
+    def register(self, topic: str, handler: CommandHandler) -> None:
+        """Handle commands for ``topic`` in this worker."""
+        self._handlers[topic] = handler
+
+    def start(self) -> None:
+        """Start listening for commands."""
+        if self._task is not None:
+            return
+        # Workers forked from a preloaded master inherit the master's pid
+        self.pid = os.getpid()
+        self.directory = self.configured_directory or default_control_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Commands sent before this worker started are not for it
+        self._seen = {path.name.split(".")[0] for path in self._commands()}
+        self._heartbeat()
+        self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop listening and deregister this worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            (self.directory / f"worker-{self.pid}").unlink(missing_ok=True)
+
+    def _heartbeat(self) -> None:
+        (self.directory / f"worker-{self.pid}").touch()
+
+    def _commands(self) -> list[Path]:
+        return sorted(self.directory.glob("*.command.json"))
+
+    def live_workers(self) -> set[int]:
+        """PIDs of workers whose heartbeat is recent."""
+        cutoff = time.time() - self.poll_interval * 4
+        workers = set()
+        for path in self.directory.glob("worker-*"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    workers.add(int(path.name.removeprefix("worker-")))
+            except (OSError, ValueError):
+                continue
+        return workers
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                self._heartbeat()
+                pending = {path.name.split(".")[0]: path for path in self._commands()}
+                for command_id, path in pending.items():
+                    if command_id not in self._seen:
+                        self._seen.add(command_id)
+                        await self._handle(command_id, path)
+                # Senders delete commands once answered or timed out
+                self._seen &= pending.keys()
+            except Exception as e:
+                logger.error(f"Worker control poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _handle(self, command_id: str, path: Path) -> None:
+        try:
+            message = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return  # Cleaned up by the sender after it stopped waiting
+        if message["expires_at"] < time.time():
+            return
+
+        handler = self._handlers.get(message["topic"])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for topic {message['topic']}")
+            result = await handler(message["command"], message["params"])
+        except Exception as e:
+            result = {"pid": self.pid, "error": str(e)}
+        if path.exists():
+            _write_atomic(
+                path.with_name(f"{command_id}.{self.pid}.result.json"), result
+            )
+
+    async def broadcast(
+        self,
+        topic: str,
+        command: str,
+        params: dict[str, Any],
+        timeout: float = 5.0,
+    ) -> dict[int, dict[str, Any]]:
+        """Run a command in every live worker and collect results by PID.
+
+        Workers that do not answer within ``timeout`` are reported with an
+        error instead of a result.
+        """
+        if not self.started:
+            raise RuntimeError("Worker control channel is not started")
+        expected = self.live_workers() | {self.pid}
+        command_id = uuid.uuid4().hex
+        command_path = self.directory / f"{command_id}.command.json"
+        _write_atomic(
+            command_path,
+            {
+                "topic": topic,
+                "command": command,
+                "params": params,
+                "expires_at": time.time() + timeout,
+            },
+        )
+
+        results: dict[int, dict[str, Any]] = {}
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                for path in self.directory.glob(f"{command_id}.*.result.json"):
+                    pid = int(path.name.split(".")[1])
+                    if pid not in results:
+                        results[pid] = json.loads(path.read_text())
+                if expected <= results.keys():
+                    break
+                await asyncio.sleep(min(self.poll_interval / 4, 0.05))
+        finally:
+            command_path.unlink(missing_ok=True)
+            for path in self.directory.glob(f"{command_id}.*.result.json"):
+                path.unlink(missing_ok=True)
+
+        for pid in expected - results.keys():
+            results[pid] = {"pid": pid, "error": "Worker did not respond"}
+        return dict(sorted(results.items()))
+
+
+# Shared control channel for the worker process
+worker_control = WorkerControlChannel(
+    settings.WORKER_CONTROL_DIR, settings.WORKER_CONTROL_POLL_INTERVAL_SECONDS
+)
@@ -0,0 +1,139 @@
+"""Per-request query accounting and slow-query logging."""
+
+import random
+import re
+import time
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+@dataclass
+class QueryStats:
+    """Query counters for a single request."""
+
+    count: int = 0
+    total_time: float = 0.0
+    slow_count: int = 0
+
+    @property
+    def total_time_ms(self) -> float:
+        """Total time spent in the database, in milliseconds."""
+        return self.total_time * 1000
+
+
+class ExplainableSession(Protocol):
+    """Session that can produce a query plan for a statement."""
+
+    dialect: str
+
+    async def explain(self, statement: str, params: Any = None) -> str | None:
+        """Return the EXPLAIN output for a statement."""
+        ...
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def start_query_tracking() -> Token[QueryStats | None]:
+    """Begin collecting query stats for the current context."""
+    return _query_stats.set(QueryStats())
+
+
+def reset_query_tracking(token: Token[QueryStats | None]) -> None:
+    """Stop collecting query stats for the current context."""
+    _query_stats.reset(token)
+
+
+def get_query_stats() -> QueryStats | None:
+    """Get query stats for the current request, if tracking is active."""
+    return _query_stats.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """Replace literals with placeholders so similar statements group together."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMERIC_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def param_shape(params: Any) -> Any:
+    """Describe bind parameters by type only, never by value."""
+    if params is None:
+        return None
+    if isinstance(params, Mapping):
+        return {key: type(value).__name__ for key, value in params.items()}
+    if isinstance(params, Sequence) and not isinstance(params, str | bytes):
+        return [type(value).__name__ for value in params]
+    return type(params).__name__
+
+
+def _should_explain(statement: str) -> bool:
+    """Check if a slow statement should have its plan captured."""
+    if not settings.DB_EXPLAIN_SLOW_QUERIES or settings.is_production:
+        return False
+    # EXPLAIN ANALYZE executes the statement, so only read queries are safe
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return False
+    return random.random() < settings.DB_EXPLAIN_SAMPLE_RATE
+
+
+async def record_query(
+    statement: str,
+    params: Any,
+    duration: float,
+    session: ExplainableSession | None = None,
+) -> None:
+    """Record an executed statement against the current request."""
+    threshold = settings.DB_SLOW_QUERY_THRESHOLD_MS / 1000
+    slow = duration >= threshold
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_time += duration
+        if slow:
+            stats.slow_count += 1
+
+    if not slow:
+        return
+
+    logger.warning(
+        f"Slow query ({duration * 1000:.1f} ms): {normalize_sql(statement)} "
+        f"params={param_shape(params)}"
+    )
+
+    if session is not None and _should_explain(statement):
+        try:
+            plan = await session.explain(statement, params)
+        except Exception as e:
+            logger.debug(f"EXPLAIN failed: {e}")
+            return
+        if plan:
+            logger.info(f"Query plan for slow query:\n{plan}")
+
+
+@asynccontextmanager
+async def timed_query(
+    statement: str,
+    params: Any = None,
+    session: ExplainableSession | None = None,
+) -> AsyncGenerator[None, None]:
+    """Time a statement and record it against the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        await record_query(statement, params, time.perf_counter() - started, session)
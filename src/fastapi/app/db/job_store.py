@@ -0,0 +1,400 @@
+"""Durable storage for background jobs."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Protocol
+
+from loguru import logger
+
+from app.db.instrumentation import timed_query
+from app.models.job import Job, JobStatus
+
+
+class JobStore(Protocol):
+    """Storage backend for the job queue."""
+
+    async def setup(self) -> None:
+        """Open connections, creating the jobs table where no init script does."""
+        ...
+
+    async def close(self) -> None:
+        """Close connections."""
+        ...
+
+    async def enqueue(
+        self,
+        queue: str,
+        task: str,
+        payload: dict[str, Any],
+        priority: int,
+        delay: float,
+        max_attempts: int,
+    ) -> int:
+        """Insert a job and return its ID."""
+        ...
+
+    async def claim(
+        self, queue: str, limit: int, visibility_timeout: float, worker_id: str
+    ) -> list[Job]:
+        """Claim up to ``limit`` runnable jobs, oldest highest-priority first.
+
+        Jobs whose visibility timeout expired while running are claimable
+        again, so work from crashed workers is retried.
+        """
+        ...
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        """Mark a claimed job as done."""
+        ...
+
+    async def fail(
+        self, job_id: int, worker_id: str, error: str, retry_in: float | None
+    ) -> None:
+        """Requeue a claimed job after ``retry_in`` seconds, or fail it for good."""
+        ...
+
+    async def status(self, job_id: int) -> JobStatus | None:
+        """Get the status of a job."""
+        ...
+
+
+POSTGRES_CLAIM = """
+WITH claimed AS (
+    UPDATE app.jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_until = now() + make_interval(secs => $3),
+        locked_by = $4,
+        updated_at = now()
+    WHERE id IN (
+        SELECT id FROM app.jobs
+        WHERE queue = $1
+          AND ((status = 'queued' AND run_at <= now())
+               OR (status = 'running' AND locked_until < now()))
+        ORDER BY priority DESC, run_at
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, queue, task, payload, priority, attempts, max_attempts,
+        run_at, created_at
+)
+-- RETURNING does not preserve the subquery order
+SELECT id, queue, task, payload, priority, attempts, max_attempts, created_at
+FROM claimed
+ORDER BY priority DESC, run_at
+"""
+
+
+class PostgresJobStore:
+    """Job store on Postgres, claiming batches with FOR UPDATE SKIP LOCKED."""
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 5):
+        """Initialize the store."""
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool: Any = None
+
+    async def setup(self) -> None:
+        """Open the connection pool; the table comes with the init scripts."""
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError(
+                "asyncpg is required for the Postgres job store; "
+                'install with `pip install -e ".[postgres]"`'
+            ) from e
+
+        self._pool = await asyncpg.create_pool(
+            self.dsn, min_size=self.min_size, max_size=self.max_size
+        )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _execute(self, statement: str, *args: Any) -> str:
+        async with timed_query(statement, args), self._pool.acquire() as conn:
+            result: str = await conn.execute(statement, *args)
+            return result
+
+    async def _fetch(self, statement: str, *args: Any) -> list[Any]:
+        async with timed_query(statement, args), self._pool.acquire() as conn:
+            return list(await conn.fetch(statement, *args))
+
+    async def enqueue(
+        self,
+        queue: str,
+        task: str,
+        payload: dict[str, Any],
+        priority: int,
+        delay: float,
+        max_attempts: int,
+    ) -> int:
+        """Insert a job and return its ID."""
+        rows = await self._fetch(
+            "INSERT INTO app.jobs "
+            "(queue, task, payload, priority, max_attempts, run_at) "
+            "VALUES ($1, $2, $3::jsonb, $4, $5, now() + make_interval(secs => $6)) "
+            "RETURNING id",
+            queue,
+            task,
+            json.dumps(payload),
+            priority,
+            max_attempts,
+            delay,
+        )
+        return int(rows[0]["id"])
+
+    async def claim(
+        self, queue: str, limit: int, visibility_timeout: float, worker_id: str
+    ) -> list[Job]:
+        """Claim up to ``limit`` runnable jobs."""
+        rows = await self._fetch(
+            POSTGRES_CLAIM, queue, limit, visibility_timeout, worker_id
+        )
+        return [
+            Job(
+                id=row["id"],
+                updated_at=None,
+                queue=row["queue"],
+                task=row["task"],
+                payload=json.loads(row["payload"]),
+                priority=row["priority"],
+                attempts=row["attempts"],
+                max_attempts=row["max_attempts"],
+                created_at=row["created_at"],
+            )
+            for row in rows
+        ]
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        """Mark a claimed job as done."""
+        await self._execute(
+            "UPDATE app.jobs SET status = 'done', locked_until = NULL, "
+            "updated_at = now() WHERE id = $1 AND locked_by = $2",
+            job_id,
+            worker_id,
+        )
+
+    async def fail(
+        self, job_id: int, worker_id: str, error: str, retry_in: float | None
+    ) -> None:
+        """Requeue a claimed job or fail it for good."""
+        if retry_in is None:
+            await self._execute(
+                "UPDATE app.jobs SET status = 'failed', locked_until = NULL, "
+                "last_error = $3, updated_at = now() "
+                "WHERE id = $1 AND locked_by = $2",
+                job_id,
+                worker_id,
+                error,
+            )
+        else:
+            await self._execute(
+                "UPDATE app.jobs SET status = 'queued', locked_until = NULL, "
+                "last_error = $3, run_at = now() + make_interval(secs => $4), "
+                "updated_at = now() WHERE id = $1 AND locked_by = $2",
+                job_id,
+                worker_id,
+                error,
+                retry_in,
+            )
+
+    async def status(self, job_id: int) -> JobStatus | None:
+        """Get the status of a job."""
+        rows = await self._fetch("SELECT status FROM app.jobs WHERE id = $1", job_id)
+        return JobStatus(rows[0]["status"]) if rows else None
+
+
+# Mirror of docker/postgres/init/03-jobs.sql for SQLite databases
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    task TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at REAL NOT NULL,
+    locked_until REAL,
+    locked_by TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL,
+    CONSTRAINT jobs_status_valid
+        CHECK (status IN ('queued', 'running', 'done', 'failed'))
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_dequeue ON jobs (queue, priority DESC, run_at);
+"""
+
+SQLITE_CLAIM = """
+UPDATE jobs
+SET status = 'running', attempts = attempts + 1,
+    locked_until = :now + :visibility, locked_by = :worker, updated_at = :now
+WHERE id IN (
+    SELECT id FROM jobs
+    WHERE queue = :queue
+      AND ((status = 'queued' AND run_at <= :now)
+           OR (status = 'running' AND locked_until < :now))
+    ORDER BY priority DESC, run_at
+    LIMIT :limit
+)
+RETURNING id, queue, task, payload, priority, attempts, max_attempts, run_at,
+    created_at
+"""
+
+
+class SQLiteJobStore:
+    """Job store on SQLite for tests and single-node deployments.
+
+    SQLite has a single writer, so claiming inside ``BEGIN IMMEDIATE`` gives
+    the same exclusivity that SKIP LOCKED provides on Postgres.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store."""
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def setup(self) -> None:
+        """Open the database and create the jobs table if needed."""
+
+        def connect() -> None:
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None, timeout=30
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(SQLITE_SCHEMA)
+            self._conn = conn
+
+        await asyncio.to_thread(connect)
+
+    async def close(self) -> None:
+        """Close the database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _run(self, statement: str, params: Any) -> list[sqlite3.Row]:
+        def run() -> list[sqlite3.Row]:
+            assert self._conn is not None, "Job store is not set up"
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self._conn.execute(statement, params).fetchall()
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                return rows
+
+        async with timed_query(statement, params):
+            return await asyncio.to_thread(run)
+
+    async def enqueue(
+        self,
+        queue: str,
+        task: str,
+        payload: dict[str, Any],
+        priority: int,
+        delay: float,
+        max_attempts: int,
+    ) -> int:
+        """Insert a job and return its ID."""
+        now = time.time()
+        rows = await self._run(
+            "INSERT INTO jobs (queue, task, payload, priority, max_attempts, "
+            "run_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING id",
+            (
+                queue,
+                task,
+                json.dumps(payload),
+                priority,
+                max_attempts,
+                now + delay,
+                now,
+            ),
+        )
+        return int(rows[0]["id"])
+
+    async def claim(
+        self, queue: str, limit: int, visibility_timeout: float, worker_id: str
+    ) -> list[Job]:
+        """Claim up to ``limit`` runnable jobs."""
+        rows = await self._run(
+            SQLITE_CLAIM,
+            {
+                "now": time.time(),
+                "visibility": visibility_timeout,
+                "worker": worker_id,
+                "queue": queue,
+                "limit": limit,
+            },
+        )
+        # RETURNING does not preserve the subquery order
+        rows.sort(key=lambda row: (-row["priority"], row["run_at"]))
+        return [
+            Job(
+                id=row["id"],
+                updated_at=None,
+                queue=row["queue"],
+                task=row["task"],
+                payload=json.loads(row["payload"]),
+                priority=row["priority"],
+                attempts=row["attempts"],
+                max_attempts=row["max_attempts"],
+                created_at=row["created_at"],
+            )
+            for row in rows
+        ]
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        """Mark a claimed job as done."""
+        await self._run(
+            "UPDATE jobs SET status = 'done', locked_until = NULL, updated_at = ? "
+            "WHERE id = ? AND locked_by = ?",
+            (time.time(), job_id, worker_id),
+        )
+
+    async def fail(
+        self, job_id: int, worker_id: str, error: str, retry_in: float | None
+    ) -> None:
+        """Requeue a claimed job or fail it for good."""
+        now = time.time()
+        if retry_in is None:
+            await self._run(
+                "UPDATE jobs SET status = 'failed', locked_until = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ? AND locked_by = ?",
+                (error, now, job_id, worker_id),
+            )
+        else:
+            await self._run(
+                "UPDATE jobs SET status = 'queued', locked_until = NULL, "
+                "last_error = ?, run_at = ?, updated_at = ? "
+                "WHERE id = ? AND locked_by = ?",
+                (error, now + retry_in, now, job_id, worker_id),
+            )
+
+    async def status(self, job_id: int) -> JobStatus | None:
+        """Get the status of a job."""
+        rows = await self._run("SELECT status FROM jobs WHERE id = ?", (job_id,))
+        return JobStatus(rows[0]["status"]) if rows else None
+
+
+def create_job_store(database_url: str) -> JobStore:
+    """Create a job store for a database URL."""
+    if database_url.startswith(("postgresql://", "postgres://")):
+        return PostgresJobStore(database_url)
+    if database_url.startswith("sqlite:///"):
+        return SQLiteJobStore(database_url.removeprefix("sqlite:///"))
+    logger.error(f"Unsupported job store URL scheme: {database_url.split(':')[0]}")
+    raise ValueError("Job store requires a postgresql:// or sqlite:/// URL")
@@ -2,32 +2,55 @@
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
 from loguru import logger
 
+from app.core.config import settings
+from app.db.instrumentation import timed_query
+from app.db.sqlite import SQLiteDatabase, SQLiteSession
+
 
 # Placeholder database session
 # Will be replaced with actual database implementation (SQLAlchemy, MongoDB, etc.)
 class DatabaseSession:
     """Mock database session."""
 
-    async def commit(self):
+    dialect = "mock"
+
+    async def execute(self, statement: str, params: Any = None) -> list[Any]:
+        """Execute a statement and return the resulting rows."""
+        async with timed_query(statement, params, self):
+            logger.debug(f"Executing statement: {statement}")
+            return []
+
+    async def explain(self, statement: str, params: Any = None) -> str | None:
+        """Return the query plan for a statement."""
+        return None
+
+    async def commit(self) -> None:
         """Commit transaction."""
         logger.debug("Committing transaction")
 
-    async def rollback(self):
+    async def rollback(self) -> None:
         """Rollback transaction."""
         logger.debug("Rolling back transaction")
 
-    async def close(self):
+    async def close(self) -> None:
         """Close session."""
         logger.debug("Closing database session")
 
 
+# Shared SQLite database for the worker process, opened by init_db()
+sqlite_database: SQLiteDatabase | None = None
+
+
 @asynccontextmanager
-async def get_db() -> AsyncGenerator[DatabaseSession, None]:
+async def get_db() -> AsyncGenerator[DatabaseSession | SQLiteSession, None]:
     """Get database session."""
-    session = DatabaseSession()
+    session = (
+        sqlite_database.session() if sqlite_database is not None else DatabaseSession()
+    )
     try:
         yield session
         await session.commit()
@@ -36,3 +59,34 @@ async def get_db() -> AsyncGenerator[DatabaseSession, None]:
         raise
     finally:
         await session.close()
+
+
+async def init_db() -> None:
+    """Open database connections."""
+    global sqlite_database
+    if settings.DATABASE_URL.startswith("sqlite:///"):
+        database = SQLiteDatabase(
+            settings.DATABASE_URL.removeprefix("sqlite:///"),
+            readers=settings.SQLITE_READERS,
+            mmap_size=settings.SQLITE_MMAP_SIZE_MB * 2**20,
+            busy_timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            statement_cache_size=settings.SQLITE_STATEMENT_CACHE_SIZE,
+        )
+        await database.connect()
+        sqlite_database = database
+
+
+async def open_db_connections(count: int) -> int:
+    """Open up to ``count`` pooled connections ahead of the first requests."""
+    if sqlite_database is None:
+        return 0
+    return await sqlite_database.open_readers(count)
+
+
+async def close_db() -> None:
+    """Dispose of database connections."""
+    global sqlite_database
+    logger.debug("Closing database connections")
+    if sqlite_database is not None:
+        database, sqlite_database = sqlite_database, None
+        await database.close()
@@ -0,0 +1,318 @@
+"""SQLite backend tuned for single-node deployments."""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from app.core.deadlines import budget
+from app.db.instrumentation import timed_query
+
+T = TypeVar("T")
+
+# Statements that never write and can run on a reader connection
+READ_ONLY_PREFIXES = ("SELECT", "VALUES", "EXPLAIN")
+
+
+def is_read_only(statement: str) -> bool:
+    """Check if a statement can run on a reader connection."""
+    return statement.lstrip()[:7].upper().startswith(READ_ONLY_PREFIXES)
+
+
+class SQLiteDatabase:
+    """SQLite with one writer connection and a pool of reader connections.
+
+    In WAL mode readers do not block the writer or each other, so reads run
+    on ``readers`` connections, one per reader thread, while all writes go
+    through a single connection on a dedicated writer thread. A session that
+    writes holds the writer until it commits or rolls back. Its transaction
+    starts with ``BEGIN IMMEDIATE`` so waiting for other processes' write
+    locks happens up front, within ``busy_timeout``, rather than failing on a
+    lock upgrade halfway through.
+
+    When the awaiting task is cancelled, for example because the client
+    disconnected, the running statement is interrupted in SQLite instead of
+    running to completion on its thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        readers: int = 4,
+        mmap_size: int = 256 * 2**20,
+        busy_timeout: float = 5.0,
+        statement_cache_size: int = 256,
+    ):
+        """Initialize the database."""
+        self.path = path
+        # Connections to an in-memory database do not share data
+        self.readers = 0 if path == ":memory:" else readers
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.statement_cache_size = statement_cache_size
+        self._writer: sqlite3.Connection | None = None
+        self._writer_executor: ThreadPoolExecutor | None = None
+        self._reader_executor: ThreadPoolExecutor | None = None
+        self._reader_local = threading.local()
+        self._reader_connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = asyncio.Lock()
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = ON")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _open_writer(self) -> sqlite3.Connection:
+        conn = self._connect(read_only=False)
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if mode != "wal" and self.path != ":memory:":
+            logger.warning(f"SQLite journal mode is {mode}, not WAL: {self.path}")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._reader_local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=True)
+            self._reader_local.conn = conn
+            with self._connections_lock:
+                self._reader_connections.append(conn)
+        return conn
+
+    async def connect(self) -> None:
+        """Open the writer connection and switch the database to WAL."""
+        self._writer_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-writer"
+        )
+        self._writer = await self._on_writer(self._open_writer)
+        if self.readers:
+            self._reader_executor = ThreadPoolExecutor(
+                max_workers=self.readers, thread_name_prefix="sqlite-reader"
+            )
+        logger.info(f"Opened SQLite database {self.path} ({self.readers} readers)")
+
+    async def open_readers(self, count: int) -> int:
+        """Open up to ``count`` reader connections now rather than on first use.
+
+        Each reader thread holds its own connection, so the calls wait for
+        each other to make the executor start a thread per connection.
+        Returns the number of open reader connections.
+        """
+        count = min(count, self.readers)
+        if self._reader_executor is None or count < 1:
+            return 0
+        barrier = threading.Barrier(count)
+
+        def open_reader() -> None:
+            self._reader()
+            try:
+                barrier.wait(timeout=self.busy_timeout)
+            except threading.BrokenBarrierError:
+                pass
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._reader_executor, open_reader)
+                for _ in range(count)
+            )
+        )
+        with self._connections_lock:
+            return len(self._reader_connections)
+
+    async def close(self) -> None:
+        """Wait for pending statements and close all connections."""
+        executors = [self._reader_executor, self._writer_executor]
+        self._reader_executor = self._writer_executor = None
+        for executor in executors:
+            if executor is not None:
+                await asyncio.to_thread(executor.shutdown)
+        with self._connections_lock:
+            connections = [*self._reader_connections, self._writer]
+            self._reader_connections.clear()
+        self._writer = None
+        for conn in connections:
+            if conn is not None:
+                conn.close()
+
+    async def _on_writer(self, func: Callable[..., T], *args: Any) -> T:
+        assert self._writer_executor is not None, "Database is not connected"
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer_executor, func, *args)
+
+    async def _interruptible(
+        self,
+        executor: ThreadPoolExecutor | None,
+        func: Callable[..., list[sqlite3.Row]],
+        *args: Any,
+    ) -> list[sqlite3.Row]:
+        assert executor is not None, "Database is not connected"
+        # Filled in by ``func`` with the connection it runs on
+        running: list[sqlite3.Connection] = []
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, functools.partial(func, *args, running)
+            )
+        except asyncio.CancelledError:
+            for conn in running:
+                conn.interrupt()
+            raise
+
+    def _fetch_writer(
+        self, statement: str, params: Any, running: list[sqlite3.Connection]
+    ) -> list[sqlite3.Row]:
+        assert self._writer is not None, "Database is not connected"
+        running.append(self._writer)
+        try:
+            return self._writer.execute(statement, params).fetchall()
+        finally:
+            running.clear()
+
+    def _fetch_reader(
+        self, statement: str, params: Any, running: list[sqlite3.Connection]
+    ) -> list[sqlite3.Row]:
+        conn = self._reader()
+        running.append(conn)
+        try:
+            return conn.execute(statement, params).fetchall()
+        finally:
+            running.clear()
+
+    async def read(self, statement: str, params: Any = ()) -> list[sqlite3.Row]:
+        """Run a read-only statement on a reader connection."""
+        if self._reader_executor is None:
+            async with self._write_lock:
+                return await self._interruptible(
+                    self._writer_executor, self._fetch_writer, statement, params
+                )
+        return await self._interruptible(
+            self._reader_executor, self._fetch_reader, statement, params
+        )
+
+    async def begin(self, statement: str, params: Any = ()) -> list[sqlite3.Row]:
+        """Take the writer, begin a write transaction and run its first statement.
+
+        Raises ``sqlite3.OperationalError`` like SQLite itself when the writer
+        is not free within ``busy_timeout`` or the request's remaining time.
+        """
+        timeout = budget(self.busy_timeout)
+        try:
+            await asyncio.wait_for(self._write_lock.acquire(), timeout)
+        except TimeoutError:
+            raise sqlite3.OperationalError("database is locked") from None
+        try:
+            return await self._interruptible(
+                self._writer_executor, self._begin, statement, params
+            )
+        except BaseException:
+            await self.end(commit=False)
+            raise
+
+    def _begin(
+        self, statement: str, params: Any, running: list[sqlite3.Connection]
+    ) -> list[sqlite3.Row]:
+        assert self._writer is not None, "Database is not connected"
+        self._writer.execute("BEGIN IMMEDIATE")
+        return self._fetch_writer(statement, params, running)
+
+    async def write(self, statement: str, params: Any = ()) -> list[sqlite3.Row]:
+        """Run a statement in the current write transaction."""
+        return await self._interruptible(
+            self._writer_executor, self._fetch_writer, statement, params
+        )
+
+    async def end(self, commit: bool) -> None:
+        """Commit or roll back the write transaction and free the writer."""
+        try:
+            await self._on_writer(self._end, commit)
+        finally:
+            self._write_lock.release()
+
+    def _end(self, commit: bool) -> None:
+        assert self._writer is not None, "Database is not connected"
+        if not self._writer.in_transaction:
+            return
+        if commit:
+            try:
+                self._writer.execute("COMMIT")
+                return
+            except sqlite3.Error:
+                self._writer.execute("ROLLBACK")
+                raise
+        self._writer.execute("ROLLBACK")
+
+    def session(self) -> "SQLiteSession":
+        """Create a session on this database."""
+        return SQLiteSession(self)
+
+
+class SQLiteSession:
+    """Database session backed by :class:`SQLiteDatabase`.
+
+    Reads run on reader connections until the session first writes. From
+    then on every statement runs inside its write transaction, so the
+    session reads its own writes.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(self, database: SQLiteDatabase):
+        """Initialize the session."""
+        self.database = database
+        self.in_transaction = False
+
+    async def execute(self, statement: str, params: Any = None) -> list[Any]:
+        """Execute a statement and return the resulting rows."""
+        params = () if params is None else params
+        async with timed_query(statement, params, self):
+            if self.in_transaction:
+                return await self.database.write(statement, params)
+            if is_read_only(statement):
+                return await self.database.read(statement, params)
+            self.in_transaction = True
+            try:
+                return await self.database.begin(statement, params)
+            except BaseException:
+                self.in_transaction = False
+                raise
+
+    async def explain(self, statement: str, params: Any = None) -> str | None:
+        """Return the query plan for a statement."""
+        rows = await self.database.read(
+            f"EXPLAIN QUERY PLAN {statement}", () if params is None else params
+        )
+        return "\n".join(row["detail"] for row in rows)
+
+    async def commit(self) -> None:
+        """Commit transaction."""
+        if self.in_transaction:
+            self.in_transaction = False
+            await self.database.end(commit=True)
+
+    async def rollback(self) -> None:
+        """Rollback transaction."""
+        if self.in_transaction:
+            self.in_transaction = False
+            await self.database.end(commit=False)
+
+    async def close(self) -> None:
+        """Close session, rolling back an unfinished transaction."""
+        await self.rollback()
@@ -1,19 +1,75 @@
 """Main FastAPI application module."""
 
+import asyncio
 from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
-from app.api import config, health, v1
-from app.core.config import settings
+from app.api import admin, config, health, metrics, status, v1
+from app.core.concurrency import concurrency_limiter
+from app.core.config import Settings, settings
+from app.core.deadlines import DeadlineExceeded
+from app.core.http_cache import entity_tags, response_cache
+from app.core.invalidation import create_invalidation_transport, invalidation_bus
+from app.core.lifecycle import ShutdownPhase, lifecycle
+from app.core.logging import configure_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.memory import memory_profiler
+from app.core.settings_reload import settings_reloader
+from app.core.shared_cache import shared_cache
+from app.core.warmup import warmup
+from app.core.worker_control import worker_control
+from app.db.session import close_db, init_db
+from app.middleware.cors import ReloadableCORSMiddleware
+from app.middleware.deadline import DeadlineMiddleware, deadline_exceeded_handler
+from app.middleware.draining import RequestTrackingMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.services.external_api import external_api
+from app.services.idempotency import idempotency_store
+from app.services.item_search import item_search
+from app.services.item_stats import item_stats
+from app.services.jobs import connect_job_queue, create_workers, job_queue
+from app.services.last_login import last_login
+from app.services.retention import retention_sweeper
+
+
+def apply_logging_settings(config: Settings, changed: set[str]) -> None:
+    """Reconfigure logging when its settings change."""
+    if changed & {"LOG_LEVEL", "LOG_FORMAT"}:
+        configure_logging(config)
+
+
+def apply_concurrency_settings(config: Settings, changed: set[str]) -> None:
+    """Retune the concurrency limiter when its settings change."""
+    if any(key.startswith("CONCURRENCY_") for key in changed):
+        concurrency_limiter.configure(
+            min_limit=config.CONCURRENCY_LIMIT_MIN,
+            max_limit=config.CONCURRENCY_LIMIT_MAX,
+            latency_target=config.CONCURRENCY_LATENCY_TARGET_MS / 1000,
+            queue_size=config.CONCURRENCY_QUEUE_SIZE,
+            queue_timeout=config.CONCURRENCY_QUEUE_TIMEOUT_MS / 1000,
+        )
+
+
+def evict_cached_responses(entity: str | None, entity_id: Any) -> None:
+    """Purge cached responses for an entity written by another worker."""
+    if entity is None:
+        response_cache.clear()
+    else:
+        response_cache.purge(tags=entity_tags(entity, entity_id))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
+    configure_logging(settings)
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.PROJECT_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT.value}")
     logger.info(f"Debug mode: {settings.DEBUG}")
@@ -22,10 +78,122 @@ async def lifespan(app: FastAPI):
     # Log configuration summary
     logger.debug("Configuration loaded successfully")
 
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+    # Drain in order: flush buffered work, then close pools and clients
+    await init_db()
+    lifecycle.on_shutdown(ShutdownPhase.DATABASE, "database", close_db)
+
+    if settings.JOBS_ENABLED:
+        await connect_job_queue()
+        lifecycle.on_shutdown(ShutdownPhase.DATABASE, "job store", job_queue.close)
+        if settings.JOBS_RUN_IN_PROCESS:
+            job_workers = create_workers(job_queue)
+            for worker in job_workers:
+                worker.start()
+
+            async def stop_job_workers() -> None:
+                await asyncio.gather(
+                    *(w.stop(settings.DRAIN_TIMEOUT_SECONDS) for w in job_workers)
+                )
+
+            lifecycle.on_shutdown(ShutdownPhase.FLUSH, "job workers", stop_job_workers)
+
+    # Coalesce last login updates, writing what is buffered before the pool closes
+    last_login.start()
+    lifecycle.on_shutdown(ShutdownPhase.FLUSH, "last login", last_login.stop)
+
+    # Delete expired rows in small chunks, from one worker at a time
+    if settings.RETENTION_ENABLED:
+        retention_sweeper.start()
+        lifecycle.on_shutdown(
+            ShutdownPhase.FLUSH, "retention sweeper", retention_sweeper.stop
+        )
+
+    # Store responses to requests retried with an Idempotency-Key
+    if settings.IDEMPOTENCY_ENABLED:
+        await idempotency_store.setup()
+
+    # Index items for full-text search
+    await item_search.setup()
+
+    # Keep per-owner item aggregates current and correct drift from one worker
+    await item_stats.setup()
+    if settings.ITEM_STATS_RECONCILE_ENABLED:
+        item_stats.start()
+        lifecycle.on_shutdown(ShutdownPhase.FLUSH, "item stats", item_stats.stop)
+
+    # Push status changes to dashboards from a single ticker
+    status.status_stream.start()
+    lifecycle.on_shutdown(
+        ShutdownPhase.FLUSH, "status stream", status.status_stream.stop
+    )
+
+    # Share hot lookups, starting with the flag snapshot, through one mapped file
+    if settings.SHARED_CACHE_ENABLED:
+        shared_cache.open()
+        lifecycle.on_shutdown(ShutdownPhase.CACHE, "shared cache", shared_cache.close)
+        config.publish_feature_flags(settings)
+        settings_reloader.subscribe("feature flags", config.publish_feature_flags)
+
+    # Evict cached responses and searches when any worker writes
+    if settings.INVALIDATION_ENABLED:
+        invalidation_bus.subscribe("response cache", evict_cached_responses)
+        invalidation_bus.subscribe("item search", item_search.evict, local=True)
+        invalidation_bus.start(create_invalidation_transport(settings))
+        lifecycle.on_shutdown(
+            ShutdownPhase.CACHE, "invalidation bus", invalidation_bus.stop
+        )
+
+    # Share one connection pool for the external API across requests
+    if settings.EXTERNAL_API_URL:
+        external_api.start()
+        lifecycle.on_shutdown(ShutdownPhase.CACHE, "external api", external_api.close)
+
+    # Apply reloadable settings on SIGHUP, env file changes or from the admin API
+    settings_reloader.subscribe("logging", apply_logging_settings)
+    settings_reloader.subscribe("concurrency limiter", apply_concurrency_settings)
+    settings_reloader.install_signal_handler()
+    if settings.SETTINGS_WATCH_ENABLED:
+        settings_reloader.start_watching(settings.SETTINGS_WATCH_INTERVAL_SECONDS)
+        lifecycle.on_shutdown(
+            ShutdownPhase.FLUSH, "settings watch", settings_reloader.stop_watching
+        )
+
+    # Let admin diagnostics reach every worker, not just the one serving them
+    if settings.FEATURE_ADMIN_PANEL:
+
+        async def handle_memory_command(
+            command: str, params: dict[str, Any]
+        ) -> dict[str, Any]:
+            return await asyncio.to_thread(memory_profiler.run, command, params)
+
+        worker_control.register("memory", handle_memory_command)
+        worker_control.start()
+        lifecycle.on_shutdown(
+            ShutdownPhase.FLUSH, "worker control", worker_control.stop
+        )
+
+    lifecycle.install_signal_handler(settings.DRAIN_GRACE_SECONDS)
+    lifecycle.start()
+
+    # Report ready only once connections, routes and caches are warm
+    if settings.WARMUP_ENABLED:
+        warmup.start(
+            app,
+            paths=settings.WARMUP_PATHS,
+            db_connections=settings.DATABASE_POOL_SIZE,
+            timeout=settings.WARMUP_TIMEOUT_SECONDS,
+        )
+        lifecycle.on_shutdown(ShutdownPhase.FLUSH, "warm-up", warmup.stop)
+
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    await lifecycle.shutdown(settings.DRAIN_TIMEOUT_SECONDS)
+    await loop_monitor.stop()
 
 
 def create_app() -> FastAPI:
@@ -47,18 +215,60 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Configure CORS with settings
+    # Answer opted-in GET routes from memory, innermost so CORS headers stay per-request
+    if settings.RESPONSE_CACHE_ENABLED:
+        app.add_middleware(ResponseCacheMiddleware, prefix=settings.API_V1_PREFIX)
+
+    # Run retried mutations once, replaying the stored response to repeats
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(
+            IdempotencyMiddleware,
+            prefix=settings.API_V1_PREFIX,
+            wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+        )
+
+    # Configure CORS with settings, following settings reloads
+    app.add_middleware(ReloadableCORSMiddleware)
+
+    # Stop handlers whose client went away or whose deadline passed
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.ALLOWED_ORIGINS,
-        allow_credentials=settings.ALLOW_CREDENTIALS,
-        allow_methods=settings.ALLOW_METHODS,
-        allow_headers=settings.ALLOW_HEADERS,
+        DeadlineMiddleware,
+        default=settings.REQUEST_DEADLINE_SECONDS,
+        routes=settings.REQUEST_DEADLINES,
+        cancel_on_disconnect=settings.CANCEL_ON_DISCONNECT,
     )
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+
+    # Report per-request query count and DB time
+    if settings.SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
+
+    # Sample requests with the profiler only when profiling is enabled
+    if settings.PROFILING_ENABLED or settings.PROFILING_CONTINUOUS_EVERY_N:
+        app.add_middleware(
+            ProfilingMiddleware,
+            on_demand=settings.PROFILING_ENABLED,
+            every_n=settings.PROFILING_CONTINUOUS_EVERY_N,
+            interval=settings.PROFILING_INTERVAL_MS / 1000,
+        )
+
+    # Count in-flight requests so shutdown can drain them
+    app.add_middleware(RequestTrackingMiddleware)
+
+    # Reject excess requests before they reach the handlers
+    if settings.LOAD_SHEDDING_ENABLED:
+        app.add_middleware(
+            LoadSheddingMiddleware,
+            retry_after=settings.LOAD_SHEDDING_RETRY_AFTER_SECONDS,
+        )
 
     # Include routers
     app.include_router(health.router, tags=["health"])
+    app.include_router(status.router, tags=["health"])
     app.include_router(config.router, tags=["configuration"])
+    app.include_router(admin.router, prefix="/admin", tags=["admin"])
+    if settings.FEATURE_METRICS:
+        app.include_router(metrics.router, tags=["monitoring"])
     app.include_router(v1.router, prefix=settings.API_V1_PREFIX)
 
     return app
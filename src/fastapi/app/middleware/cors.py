@@ -0,0 +1,35 @@
+"""CORS middleware that follows settings reloads."""
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
+
+from app.core.config import Settings, settings
+from app.core.settings_reload import SettingsReloader, settings_reloader
+
+CORS_SETTINGS = frozenset(
+    {"ALLOWED_ORIGINS", "ALLOW_CREDENTIALS", "ALLOW_METHODS", "ALLOW_HEADERS"}
+)
+
+
+class ReloadableCORSMiddleware(CORSMiddleware):
+    """CORS middleware configured from settings and rebuilt when they change."""
+
+    def __init__(self, app: ASGIApp, reloader: SettingsReloader = settings_reloader):
+        """Initialize the middleware."""
+        self.configure(app, settings)
+        reloader.subscribe("cors", self.on_settings_changed)
+
+    def configure(self, app: ASGIApp, config: Settings) -> None:
+        """Precompute CORS headers from the given settings."""
+        super().__init__(
+            app,
+            allow_origins=config.ALLOWED_ORIGINS,
+            allow_credentials=config.ALLOW_CREDENTIALS,
+            allow_methods=config.ALLOW_METHODS,
+            allow_headers=config.ALLOW_HEADERS,
+        )
+
+    def on_settings_changed(self, config: Settings, changed: set[str]) -> None:
+        """Rebuild the CORS configuration if any CORS setting changed."""
+        if changed & CORS_SETTINGS:
+            self.configure(self.app, config)
@@ -0,0 +1,156 @@
+"""Cancel handlers on client disconnect or when their deadline passes."""
+
+import asyncio
+from collections.abc import Mapping
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.deadlines import (
+    Deadline,
+    current_deadline,
+    reset_deadline,
+    route_deadline,
+    set_deadline,
+)
+
+TIMEOUT_DETAIL = {"detail": "Request deadline exceeded"}
+
+
+async def deadline_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer work that ran out of request time with 504."""
+    logger.warning(f"{request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content=TIMEOUT_DETAIL,
+    )
+
+
+class DeadlineMiddleware:
+    """Run each request under a deadline and stop work nobody is waiting for.
+
+    The deadline comes from the longest matching prefix in ``routes``, or
+    ``default`` (0 disables it), and is published through
+    :mod:`app.core.deadlines` so downstream calls can cap their timeouts. The
+    handler runs in its own task, which is cancelled when the client
+    disconnects before the response is complete, or when the deadline passes
+    before the response starts; the latter is answered with 504. Streaming
+    responses are therefore bounded by the deadline only until their headers
+    are sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default: float = 30.0,
+        routes: Mapping[str, float] | None = None,
+        cancel_on_disconnect: bool = True,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.default = default
+        self.routes = dict(routes or {})
+        self.cancel_on_disconnect = cancel_on_disconnect
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request under its deadline."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seconds = route_deadline(self.routes, scope["path"], self.default)
+        # Nested requests (e.g. batch items) keep their caller's deadline
+        deadline = Deadline.after(seconds, current_deadline())
+        token = set_deadline(deadline)
+        try:
+            await self._run(scope, receive, send, deadline)
+        finally:
+            deadline.cancel()
+            reset_deadline(token)
+
+    async def _run(
+        self, scope: Scope, receive: Receive, send: Send, deadline: Deadline
+    ) -> None:
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+        disconnected = asyncio.Event()
+        response_started = False
+        response_complete = False
+        timed_out = False
+
+        async def pump() -> None:
+            # Keep reading so a disconnect is seen even if the handler never
+            # reads the body; the one-slot queue preserves backpressure
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        async def receive_message() -> Message:
+            if disconnected.is_set() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def send_message(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+                deadline.cancel()
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+            await send(message)
+
+        async def run_app() -> None:
+            await self.app(scope, receive_message, send_message)
+
+        handler: asyncio.Task[None] = asyncio.create_task(run_app())
+
+        def expire() -> None:
+            nonlocal timed_out
+            if not response_started and not handler.done():
+                timed_out = True
+                handler.cancel()
+
+        deadline.on_expire(expire)
+        pump_task = asyncio.create_task(pump())
+        disconnect_task = asyncio.create_task(disconnected.wait())
+        try:
+            await asyncio.wait(
+                {handler, disconnect_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if (
+                not handler.done()
+                and not response_complete
+                and self.cancel_on_disconnect
+            ):
+                logger.info(
+                    f"Client disconnected, cancelling {scope['method']} {scope['path']}"
+                )
+                handler.cancel()
+            try:
+                await handler
+            except asyncio.CancelledError:
+                if not (timed_out or disconnected.is_set()):
+                    raise
+            if timed_out:
+                logger.warning(
+                    f"Deadline exceeded for {scope['method']} {scope['path']}"
+                )
+                response = JSONResponse(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    content=TIMEOUT_DETAIL,
+                )
+                await response(scope, receive, send)
+        finally:
+            pump_task.cancel()
+            disconnect_task.cancel()
+            if not handler.done():
+                # This request itself was cancelled; let the handler clean up
+                handler.cancel()
+                await asyncio.wait({handler})
@@ -0,0 +1,26 @@
+"""In-flight request tracking for graceful draining."""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.lifecycle import Lifecycle, lifecycle
+
+
+class RequestTrackingMiddleware:
+    """Count in-flight HTTP requests so shutdown can wait for them."""
+
+    def __init__(self, app: ASGIApp, state: Lifecycle = lifecycle):
+        """Initialize the middleware."""
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Track the request for its whole duration."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.state.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.request_finished()
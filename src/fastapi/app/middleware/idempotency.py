@@ -0,0 +1,235 @@
+"""Replay responses to retried mutating requests carrying an Idempotency-Key."""
+
+import asyncio
+import hashlib
+import time
+from contextlib import suppress
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.idempotency import (
+    IdempotencyStore,
+    KeyState,
+    StoredResponse,
+    idempotency_store,
+)
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(scope: Scope, body: bytes) -> str:
+    """Hash what identifies a request: method, path, query string and body."""
+    digest = hashlib.sha256()
+    for part in (
+        scope["method"].encode(),
+        scope["path"].encode(),
+        scope["query_string"],
+    ):
+        digest.update(part + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyMiddleware:
+    """Run each mutating request under ``prefix`` once per ``Idempotency-Key``.
+
+    The first request with a key runs and its response is stored; repeats
+    with the same method, path and body get the stored response with
+    ``Idempotent-Replayed: true`` without reaching the handlers. A repeat
+    arriving while the first is still running waits for it, for up to
+    ``wait_timeout`` seconds before getting a 409. Reusing a key for a
+    different request is a 422. Keys are scoped by the ``Authorization``
+    header. Server errors are not stored, so retrying them runs again. If
+    the store is unreachable, requests run without deduplication.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore = idempotency_store,
+        prefix: str = "/",
+        wait_timeout: float = 10.0,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.store = store
+        self.prefix = prefix
+        self.wait_timeout = wait_timeout
+        self._running: dict[str, asyncio.Event] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run, replay or hold the request."""
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in MUTATING_METHODS
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        client_key = headers.get("idempotency-key")
+        if client_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            await self._reject(
+                scope,
+                receive,
+                send,
+                400,
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters",
+            )
+            return
+
+        body, receive = await self._buffer_body(receive)
+        scope_hash = hashlib.sha256(
+            f"{headers.get('authorization', '')}\0{client_key}".encode()
+        )
+        key = scope_hash.hexdigest()
+        request_fingerprint = fingerprint(scope, body)
+        try:
+            state, stored = await self._claim(key, request_fingerprint)
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, running request: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if state is KeyState.COMPLETED and stored is not None:
+            await self._replay(stored, send)
+        elif state is KeyState.MISMATCH:
+            await self._reject(
+                scope,
+                receive,
+                send,
+                422,
+                "Idempotency-Key was already used for a different request",
+            )
+        elif state is KeyState.IN_PROGRESS:
+            await self._reject(
+                scope,
+                receive,
+                send,
+                409,
+                "A request with this Idempotency-Key is still in progress",
+                {"Retry-After": "1"},
+            )
+        else:
+            await self._run(key, request_fingerprint, scope, receive, send)
+
+    async def _buffer_body(self, receive: Receive) -> tuple[bytes, Receive]:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay_receive
+
+    async def _claim(
+        self, key: str, request_fingerprint: str
+    ) -> tuple[KeyState, StoredResponse | None]:
+        """Claim the key, waiting while another request holds it."""
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.05
+        while True:
+            state, stored = await self.store.begin(key, request_fingerprint)
+            remaining = deadline - time.monotonic()
+            if state is not KeyState.IN_PROGRESS or remaining <= 0:
+                return state, stored
+            event = self._running.get(key)
+            if event is not None:
+                # Held in this worker: wake up as soon as it finishes
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(event.wait(), remaining)
+            else:
+                await asyncio.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.5)
+
+    async def _run(
+        self,
+        key: str,
+        request_fingerprint: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        event = self._running[key] = asyncio.Event()
+        start: Message = {}
+        chunks: list[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        except BaseException:
+            # Handler failed or the client went away: let a retry run again
+            await self._release(key, request_fingerprint)
+            raise
+        else:
+            status = start.get("status", 500)
+            if status >= 500:
+                await self._release(key, request_fingerprint)
+            else:
+                response = StoredResponse(
+                    status, list(start.get("headers", [])), b"".join(chunks)
+                )
+                try:
+                    await self.store.complete(key, request_fingerprint, response)
+                except Exception as e:
+                    logger.warning(f"Could not store idempotent response: {e}")
+        finally:
+            if self._running.get(key) is event:
+                del self._running[key]
+            event.set()
+
+    async def _release(self, key: str, request_fingerprint: str) -> None:
+        try:
+            await self.store.release(key, request_fingerprint)
+        except Exception as e:
+            # The lock still lapses after the store's lock timeout
+            logger.warning(f"Could not release idempotency key: {e}")
+
+    async def _replay(self, stored: StoredResponse, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status,
+                "headers": [*stored.headers, (b"idempotent-replayed", b"true")],
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _reject(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        detail: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        response = JSONResponse(
+            {"detail": detail}, status_code=status_code, headers=headers
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,62 @@
+"""Load shedding middleware."""
+
+import time
+
+from loguru import logger
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.concurrency import AdaptiveConcurrencyLimiter, concurrency_limiter
+
+# Health probes must keep answering while the worker is overloaded
+BYPASS_PATHS = frozenset({"/health", "/live", "/ready", "/status/stream"})
+
+
+class LoadSheddingMiddleware:
+    """Reject requests with 503 once the adaptive in-flight limit is reached."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: AdaptiveConcurrencyLimiter = concurrency_limiter,
+        retry_after: int = 1,
+        bypass_paths: frozenset[str] = BYPASS_PATHS,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.limiter = limiter
+        self.retry_after = retry_after
+        self.bypass_paths = bypass_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit, queue or shed the request."""
+        if scope["type"] != "http" or scope["path"] in self.bypass_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire():
+            logger.debug(f"Shedding request to {scope['path']}")
+            response = JSONResponse(
+                {"detail": "Service is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.limiter.release()
+            self.limiter.on_complete(
+                time.perf_counter() - started, failed=status_code >= 500
+            )
@@ -0,0 +1,112 @@
+"""Request profiling middleware."""
+
+import secrets
+import threading
+import uuid
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiling import Profile, ProfileStore, SamplingProfiler, profile_store
+
+PROFILE_HEADER = "x-profile"
+
+
+def profiling_allowed() -> bool:
+    """Check if on-demand profiling may run in this environment."""
+    return settings.FEATURE_ADMIN_PANEL or not settings.is_production
+
+
+def _has_valid_profile_header(scope: Scope) -> bool:
+    value = Headers(scope=scope).get(PROFILE_HEADER)
+    if not value or not profiling_allowed():
+        return False
+    if not settings.PROFILING_TOKEN:
+        # Without a token the header is only honored outside production
+        return not settings.is_production
+    return secrets.compare_digest(value, settings.PROFILING_TOKEN)
+
+
+def _route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    path: str = getattr(route, "path", None) or scope["path"]
+    return path
+
+
+class ProfilingMiddleware:
+    """Sample the event loop thread while selected requests are handled.
+
+    Requests carrying a valid ``X-Profile`` header are profiled on demand and
+    the result is kept in the profile store under the ID returned in the
+    ``X-Profile-Id`` response header. In continuous mode one request in N is
+    profiled and its samples are merged into a per-route aggregate.
+
+    The middleware is only installed when profiling is enabled, so there is
+    no overhead otherwise.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        on_demand: bool = True,
+        every_n: int = 0,
+        interval: float = 0.005,
+        store: ProfileStore = profile_store,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.on_demand = on_demand
+        self.every_n = every_n
+        self.interval = interval
+        self.store = store
+        self._requests = 0
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile the request if it was selected."""
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        on_demand = self.on_demand and _has_valid_profile_header(scope)
+        continuous = False
+        if not on_demand and self.every_n:
+            self._requests += 1
+            continuous = self._requests % self.every_n == 0
+
+        if not on_demand and not continuous:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        self._busy = True
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id if on_demand else send)
+        finally:
+            profiler.stop()
+            self._busy = False
+
+        route = _route_path(scope)
+        if on_demand:
+            self.store.add(
+                Profile(
+                    route=route,
+                    interval=self.interval,
+                    duration=profiler.duration,
+                    samples=profiler.samples,
+                    id=profile_id,
+                )
+            )
+            logger.info(f"Captured profile {profile_id} for {route}")
+        else:
+            self.store.aggregate(route, profiler.samples)
@@ -0,0 +1,202 @@
+"""Serve GET responses from memory, refreshing stale ones in the background."""
+
+import asyncio
+import contextvars
+import time
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.http_cache import CachedResponse, HTTPCache, response_cache
+
+# Connection-level scope keys reused for background refreshes
+REFRESH_SCOPE_KEYS = (
+    "type",
+    "asgi",
+    "http_version",
+    "scheme",
+    "server",
+    "client",
+    "root_path",
+    "app",
+    "state",
+    "extensions",
+    "method",
+    "path",
+    "raw_path",
+    "query_string",
+    "headers",
+)
+
+
+class ResponseCacheMiddleware:
+    """Answer GET requests under ``prefix`` from an :class:`HTTPCache`.
+
+    Only routes that opt in with an ``s-maxage`` are cached. A stale entry
+    is served as is while a single background request per key recomputes
+    it, so a slow route is recomputed once rather than by every caller.
+    Cached and cacheable responses carry ``X-Cache: HIT``, ``STALE`` or
+    ``MISS``. A response computed while the cache is purged is not stored,
+    since it may predate the write that caused the purge.
+    """
+
+    def __init__(
+        self, app: ASGIApp, cache: HTTPCache = response_cache, prefix: str = "/"
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.cache = cache
+        self.prefix = prefix
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve from the cache or fetch and store the response."""
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        base = self.cache.base_key("GET", scope["path"], scope["query_string"])
+        key = self.cache.key(base, headers)
+        entry = self.cache.lookup(key) if key is not None else None
+        if entry is None:
+            await self._fetch(scope, receive, send, base, headers)
+            return
+
+        stale = entry.fresh_until <= time.monotonic()
+        if stale and key is not None:
+            self._refresh(key, scope, base, headers)
+        await self._serve(entry, send, "STALE" if stale else "HIT")
+
+    async def _serve(self, entry: CachedResponse, send: Send, state: str) -> None:
+        age = int(time.monotonic() - entry.stored_at)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": [
+                    *entry.headers,
+                    (b"x-cache", state.encode()),
+                    (b"age", str(age).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": entry.body})
+
+    async def _fetch(
+        self, scope: Scope, receive: Receive, send: Send, base: str, headers: Headers
+    ) -> None:
+        purges = self.cache.purges
+        start: Message = {}
+        chunks: list[bytes] = []
+        size = 0
+        buffering = False
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal size, buffering
+            if message["type"] == "http.response.start":
+                start.update(message)
+                response_headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"cache-tag"
+                ]
+                # Only buffer and label responses the cache could store
+                buffering = self.cache.cacheable(
+                    base,
+                    scope["method"],
+                    headers,
+                    message["status"],
+                    list(message.get("headers", [])),
+                )
+                if buffering:
+                    response_headers.append((b"x-cache", b"MISS"))
+                message = {**message, "headers": response_headers}
+            elif message["type"] == "http.response.body" and buffering:
+                body = message.get("body", b"")
+                size += len(body)
+                # Stop buffering bodies too large to be cached
+                if size > self.cache.max_entry_bytes:
+                    chunks.clear()
+                    buffering = False
+                else:
+                    chunks.append(body)
+                if buffering and not message.get("more_body", False):
+                    self._store(scope, base, headers, start, b"".join(chunks), purges)
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+    def _store(
+        self,
+        scope: Scope,
+        base: str,
+        headers: Headers,
+        start: Message,
+        body: bytes,
+        purges: int,
+    ) -> bool:
+        if self.cache.purges != purges:
+            return False
+        return self.cache.store(
+            base,
+            scope["method"],
+            scope["path"],
+            headers,
+            start.get("status", 500),
+            list(start.get("headers", [])),
+            body,
+        )
+
+    def _refresh(self, key: str, scope: Scope, base: str, headers: Headers) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        refresh_scope = {k: scope[k] for k in REFRESH_SCOPE_KEYS if k in scope}
+        # Run outside the triggering request's context, which ends before this does
+        task = asyncio.create_task(
+            self._run_refresh(key, refresh_scope, base, headers, self.cache.purges),
+            context=contextvars.Context(),
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_refresh(
+        self, key: str, scope: Scope, base: str, headers: Headers, purges: int
+    ) -> None:
+        response_complete = asyncio.Event()
+        request_sent = False
+        start: Message = {}
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        try:
+            await self.app(scope, receive, send)
+            if not self._store(scope, base, headers, start, b"".join(chunks), purges):
+                logger.debug(f"Refreshed response for {base} was not stored")
+        except Exception as e:
+            logger.warning(f"Background refresh of {base} failed: {e}")
+        finally:
+            response_complete.set()
+            self._refreshing.discard(key)
@@ -0,0 +1,46 @@
+"""Server-Timing middleware reporting per-request database usage."""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.instrumentation import (
+    get_query_stats,
+    reset_query_tracking,
+    start_query_tracking,
+)
+
+
+class ServerTimingMiddleware:
+    """Attach query count and DB time to responses as a Server-Timing header."""
+
+    def __init__(self, app: ASGIApp):
+        """Initialize the middleware."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Track queries issued while handling the request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = start_query_tracking()
+        stats = get_query_stats()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time_ms:.2f};desc="{stats.count} queries", '
+                    f"app;dur={elapsed_ms:.2f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_query_tracking(token)
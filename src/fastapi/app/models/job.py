@@ -0,0 +1,28 @@
+"""Background job model."""
+
+from enum import Enum
+from typing import Any
+
+from pydantic import Field
+
+from app.models.base import BaseDBModel
+
+
+class JobStatus(str, Enum):
+    """Background job states."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(BaseDBModel):
+    """A claimed background job."""
+
+    queue: str = Field(..., description="Queue the job belongs to")
+    task: str = Field(..., description="Registered task name")
+    payload: dict[str, Any] = Field(default_factory=dict, description="Task kwargs")
+    priority: int = Field(default=0, description="Higher runs first")
+    attempts: int = Field(default=0, description="Number of claims so far")
+    max_attempts: int = Field(default=5, description="Attempts before failing")
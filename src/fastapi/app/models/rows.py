@@ -0,0 +1,51 @@
+"""Compact row types for bulk service results."""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import make_dataclass
+from functools import cache, lru_cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+S = TypeVar("S", bound=BaseModel)
+
+
+@cache
+def row_type(model: type[BaseModel]) -> type:
+    """Generate a slotted dataclass with the model's fields, in field order.
+
+    Rows hold the same data as a model instance in a fraction of the memory
+    and are built without validation, so they are meant for trusted storage
+    data inside services. Convert them with :func:`to_schema` at the API edge,
+    or return them in a ``TrustedJSONResponse`` to serialize them directly.
+    """
+    fields = [(name, info.annotation) for name, info in model.model_fields.items()]
+    row = make_dataclass(f"{model.__name__}Row", fields, slots=True)
+    row.__module__ = model.__module__
+    return row
+
+
+def rows_from_tuples(
+    model: type[BaseModel], records: Iterable[Sequence[Any]]
+) -> list[Any]:
+    """Build rows from tuples whose values are in the model's field order."""
+    row = row_type(model)
+    return [row(*record) for record in records]
+
+
+def rows_from_mappings(
+    model: type[BaseModel], records: Iterable[Mapping[str, Any]]
+) -> list[Any]:
+    """Build rows from mappings keyed by field name."""
+    row = row_type(model)
+    return [row(**record) for record in records]
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[schema])  # type: ignore[valid-type]
+
+
+def to_schema(rows: Iterable[Any], schema: type[S]) -> list[S]:
+    """Convert rows to API schema instances, validating them on the way out."""
+    return _list_adapter(schema).validate_python(list(rows), from_attributes=True)
@@ -16,6 +16,15 @@ class BaseResponse(BaseModel):
     )
 
 
+class LeanResponse(BaseModel):
+    """Response schema for internal data, without assignment validation.
+
+    Return instances in a ``TrustedJSONResponse`` to skip revalidation.
+    """
+
+    model_config = ConfigDict(revalidate_instances="never")
+
+
 class TimestampMixin(BaseModel):
     """Mixin for timestamp fields."""
 
@@ -0,0 +1,47 @@
+"""Batch request schemas."""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class BatchItem(BaseModel):
+    """A sub-request to dispatch in-process."""
+
+    id: str = Field(..., description="Client-chosen ID echoed in the result")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = Field(
+        default="GET", description="HTTP method"
+    )
+    path: str = Field(
+        ..., pattern=r"^/", description="Path and query string", examples=["/ready"]
+    )
+    headers: dict[str, str] = Field(
+        default_factory=dict, description="Extra headers for this sub-request"
+    )
+    body: Any = Field(default=None, description="JSON body")
+    depends_on: list[str] = Field(
+        default_factory=list,
+        description="IDs of earlier items that must succeed before this one runs",
+    )
+
+
+class BatchRequest(BaseModel):
+    """A batch of sub-requests."""
+
+    requests: list[BatchItem] = Field(..., min_length=1, description="Sub-requests")
+
+
+class BatchItemResult(BaseModel):
+    """The response to one sub-request."""
+
+    id: str = Field(..., description="ID of the sub-request")
+    status: int = Field(..., description="HTTP status code")
+    headers: dict[str, str] = Field(default_factory=dict, description="Headers")
+    body: Any = Field(default=None, description="Decoded JSON or text body")
+    duration_ms: float = Field(..., description="Time spent handling the item")
+
+
+class BatchResponse(BaseModel):
+    """Results of a batch, in request order."""
+
+    results: list[BatchItemResult] = Field(..., description="Per-item results")
@@ -28,6 +28,15 @@ class ReadinessResponse(BaseModel):
     )
 
 
+class LoopLagPercentiles(BaseModel):
+    """Event loop lag percentiles in milliseconds."""
+
+    p50: float = Field(..., description="Median loop lag")
+    p90: float = Field(..., description="90th percentile loop lag")
+    p99: float = Field(..., description="99th percentile loop lag")
+    max: float = Field(..., description="Maximum loop lag in the window")
+
+
 class LivenessResponse(BaseModel):
     """Liveness check response schema."""
 
@@ -36,3 +45,6 @@ class LivenessResponse(BaseModel):
         default_factory=datetime.utcnow, description="Response timestamp"
     )
     uptime_seconds: float = Field(..., description="Service uptime in seconds")
+    loop_lag_ms: LoopLagPercentiles | None = Field(
+        default=None, description="Recent event loop lag percentiles"
+    )
@@ -0,0 +1,23 @@
+"""Item search schemas."""
+
+from pydantic import BaseModel, Field
+
+
+class ItemSearchHit(BaseModel):
+    """An item matching a search."""
+
+    id: str = Field(..., description="Item ID")
+    title: str = Field(..., description="Item title")
+    description: str | None = Field(default=None, description="Item description")
+    owner_id: str = Field(..., description="Owner user ID")
+    is_active: bool = Field(..., description="Whether the item is active")
+    rank: float = Field(..., description="Relevance, higher is better")
+
+
+class ItemSearchResults(BaseModel):
+    """A page of search results."""
+
+    items: list[ItemSearchHit] = Field(..., description="Matches, best first")
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the next page, if there is one"
+    )
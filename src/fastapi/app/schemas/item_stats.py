@@ -0,0 +1,15 @@
+"""Per-owner item aggregate schemas."""
+
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class OwnerItemStats(BaseModel):
+    """Item counts and totals for one owner."""
+
+    owner_id: str = Field(..., description="Owner user ID")
+    item_count: int = Field(default=0, description="Items owned")
+    active_count: int = Field(default=0, description="Active items owned")
+    price_total: Decimal = Field(default=Decimal(0), description="Sum of item prices")
+    tax_total: Decimal = Field(default=Decimal(0), description="Sum of item taxes")
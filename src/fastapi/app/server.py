@@ -0,0 +1,214 @@
+"""Production server entry point.
+
+Reads ``Settings`` and runs the application under gunicorn with uvicorn
+workers, or under uvicorn alone when gunicorn is not installed::
+
+    python -m app.server [--workers N] [--preload] [--print-config]
+"""
+
+import argparse
+import importlib.util
+import inspect
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import Settings, get_settings
+
+APP_PATH = "app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """Get the CPU quota of the current cgroup in cores, if one is set."""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = root / "cpu.max"
+    if cpu_max.exists():
+        max_quota, _, max_period = cpu_max.read_text().strip().partition(" ")
+        if max_quota != "max" and max_period:
+            return int(max_quota) / int(max_period)
+        return None
+
+    # cgroup v1: quota of -1 means unlimited
+    quota_file = root / "cpu" / "cpu.cfs_quota_us"
+    period_file = root / "cpu" / "cpu.cfs_period_us"
+    if quota_file.exists() and period_file.exists():
+        quota = int(quota_file.read_text().strip())
+        period = int(period_file.read_text().strip())
+        if quota > 0 and period > 0:
+            return quota / period
+    return None
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> int:
+    """Count CPUs usable by this process, honoring affinity and cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        quota = cgroup_cpu_limit(root)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not read cgroup CPU quota: {e}")
+        quota = None
+
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def default_workers(cpus: int) -> int:
+    """Derive the worker count for async workers from the CPU count."""
+    # Async workers are not blocked on I/O, so one per core saturates the CPU
+    return max(1, cpus)
+
+
+def build_options(
+    settings: Settings,
+    workers: int | None = None,
+    preload: bool | None = None,
+    cgroup_root: Path = CGROUP_ROOT,
+) -> dict[str, Any]:
+    """Build tuned server options from settings and the host's CPU budget."""
+    if workers is None:
+        if "WORKERS" in settings.model_fields_set:
+            workers = settings.WORKERS
+        else:
+            workers = default_workers(available_cpus(cgroup_root))
+
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": workers,
+        "loop": "uvloop" if _module_available("uvloop") else "asyncio",
+        "http": "httptools" if _module_available("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "keepalive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "timeout": settings.SERVER_WORKER_TIMEOUT_SECONDS,
+        # Let workers finish draining before the master kills them
+        "graceful_timeout": math.ceil(
+            settings.DRAIN_GRACE_SECONDS + settings.DRAIN_TIMEOUT_SECONDS + 5
+        ),
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "preload_app": settings.SERVER_PRELOAD if preload is None else preload,
+        "log_level": settings.LOG_LEVEL.value.lower(),
+    }
+
+
+def _uvicorn_worker_class(options: dict[str, Any]) -> type:
+    """Create a uvicorn worker class for gunicorn using the chosen loop and parser."""
+    if _module_available("uvicorn_worker"):
+        from uvicorn_worker import UvicornWorker
+    else:
+        from uvicorn.workers import UvicornWorker
+
+    class TunedUvicornWorker(UvicornWorker):  # type: ignore[misc]
+        CONFIG_KWARGS = {
+            **UvicornWorker.CONFIG_KWARGS,
+            "loop": options["loop"],
+            "http": options["http"],
+        }
+
+    return TunedUvicornWorker
+
+
+def run_gunicorn(options: dict[str, Any]) -> None:
+    """Run the application under gunicorn."""
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):  # type: ignore[misc]
+        def load_config(self) -> None:
+            for key in (
+                "bind",
+                "workers",
+                "backlog",
+                "keepalive",
+                "timeout",
+                "graceful_timeout",
+                "max_requests",
+                "max_requests_jitter",
+                "preload_app",
+            ):
+                self.cfg.set(key, options[key])
+            self.cfg.set("worker_class", _uvicorn_worker_class(options))
+            self.cfg.set("loglevel", options["log_level"])
+            self.cfg.set("accesslog", "-")
+            self.cfg.set("errorlog", "-")
+
+        def load(self) -> Any:
+            from app.main import app
+
+            return app
+
+    Application().run()
+
+
+def run_uvicorn(options: dict[str, Any], reload: bool = False) -> None:
+    """Run the application under uvicorn's own process manager."""
+    import uvicorn
+
+    host, _, port = options["bind"].rpartition(":")
+    kwargs: dict[str, Any] = {
+        "host": host,
+        "port": int(port),
+        "workers": None if reload else options["workers"],
+        "reload": reload,
+        "loop": options["loop"],
+        "http": options["http"],
+        "backlog": options["backlog"],
+        "timeout_keep_alive": options["keepalive"],
+        "timeout_graceful_shutdown": options["graceful_timeout"],
+        "log_level": options["log_level"],
+    }
+    if options["max_requests"]:
+        kwargs["limit_max_requests"] = options["max_requests"]
+        if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+            kwargs["limit_max_requests_jitter"] = options["max_requests_jitter"]
+    uvicorn.run(APP_PATH, **kwargs)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments and start the server."""
+    parser = argparse.ArgumentParser(description="Run the FastAPI server")
+    parser.add_argument("--workers", type=int, help="Override the worker count")
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Import the app in the master before forking workers",
+    )
+    parser.add_argument(
+        "--print-config",
+        action="store_true",
+        help="Print the derived server options and exit",
+    )
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    options = build_options(settings, workers=args.workers, preload=args.preload)
+
+    if args.print_config:
+        print(json.dumps(options, indent=2))
+        return
+
+    logger.info(f"Starting server with {json.dumps(options)}")
+    if settings.RELOAD:
+        run_uvicorn(options, reload=True)
+    elif _module_available("gunicorn"):
+        run_gunicorn(options)
+    else:
+        logger.warning("gunicorn is not installed, falling back to uvicorn workers")
+        run_uvicorn(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ from typing import Generic, TypeVar
 
 from loguru import logger
 
+from app.core.http_cache import entity_tags, response_cache
+from app.core.invalidation import invalidation_bus
+
 T = TypeVar("T")
 
 
@@ -15,6 +18,24 @@ class BaseService(Generic[T]):
         self.model_name = model_name
         logger.debug(f"Initialized {model_name} service")
 
+    def cache_tags(self, item_id: int | None = None) -> set[str]:
+        """Get the response cache tags for the collection or one item.
+
+        Routes serving these items pass the same tags to ``cache_response``.
+        """
+        return entity_tags(self.model_name, item_id)
+
+    def invalidate(self, item_id: int | None = None) -> int:
+        """Purge cached responses affected by a write and return how many.
+
+        The other workers are told to purge theirs through the invalidation bus.
+        """
+        purged = response_cache.purge(tags=self.cache_tags(item_id))
+        if purged:
+            logger.debug(f"Purged {purged} cached {self.model_name} responses")
+        invalidation_bus.publish(self.model_name, item_id)
+        return purged
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
         """Get all items with pagination."""
         logger.debug(f"Getting all {self.model_name} items")
@@ -31,16 +52,19 @@ class BaseService(Generic[T]):
         """Create new item."""
         logger.debug(f"Creating new {self.model_name}")
         # Placeholder implementation
+        self.invalidate()
         return item
 
     async def update(self, item_id: int, item: T) -> T | None:
         """Update existing item."""
         logger.debug(f"Updating {self.model_name} with ID: {item_id}")
         # Placeholder implementation
+        self.invalidate(item_id)
         return item
 
     async def delete(self, item_id: int) -> bool:
         """Delete item."""
         logger.debug(f"Deleting {self.model_name} with ID: {item_id}")
         # Placeholder implementation
+        self.invalidate(item_id)
         return True
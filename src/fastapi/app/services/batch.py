@@ -0,0 +1,203 @@
+"""In-process dispatch of batched sub-requests."""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from loguru import logger
+from starlette.exceptions import HTTPException
+from starlette.responses import StreamingResponse
+from starlette.types import Message, Scope
+
+from app.core.warmup import api_routes
+from app.schemas.batch import BatchItem, BatchItemResult
+
+# Connection-level scope keys shared with sub-requests, plus what the app and
+# its middleware set on the way to the router (sub-request cleanups join the
+# batch's exit stack); the router fills in the rest
+INHERITED_SCOPE_KEYS = (
+    "type",
+    "asgi",
+    "http_version",
+    "scheme",
+    "server",
+    "client",
+    "root_path",
+    "state",
+    "extensions",
+    "app",
+    "starlette.exception_handlers",
+    "fastapi_middleware_astack",
+)
+
+# Parent headers that describe the batch request rather than the caller; an
+# inherited Idempotency-Key would clash with the batch's own use of it
+DROPPED_HEADERS = frozenset(
+    {"content-length", "content-type", "transfer-encoding", "idempotency-key"}
+)
+
+
+class BatchDispatcher:
+    """Run sub-requests through the app's router without going back over HTTP.
+
+    Items run concurrently, up to ``max_concurrency`` at a time, unless they
+    list earlier items in ``depends_on``: those wait for their dependencies
+    and are answered with 424 when one of them did not succeed. Each
+    sub-request inherits the caller's headers, so authentication applies.
+
+    Sub-requests skip the middleware stack, which already admitted, tracks and
+    times the batch itself. Routes that declare a streaming response class,
+    such as the status event stream, are refused: their responses never end,
+    and the batch waits for every response before it answers.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        parent_scope: Scope,
+        max_concurrency: int = 8,
+        excluded_prefix: str | None = None,
+    ):
+        """Initialize the dispatcher."""
+        self.app = app
+        self.base_scope = {
+            key: parent_scope[key]
+            for key in INHERITED_SCOPE_KEYS
+            if key in parent_scope
+        }
+        self.base_headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in parent_scope["headers"]
+            if name.decode("latin-1") not in DROPPED_HEADERS
+        }
+        self.excluded_prefix = excluded_prefix
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(self, items: list[BatchItem]) -> list[BatchItemResult]:
+        """Run all items and return their results in request order."""
+        results = {result.id: result async for result in self.stream(items)}
+        return [results[item.id] for item in items]
+
+    async def stream(self, items: list[BatchItem]) -> AsyncIterator[BatchItemResult]:
+        """Run all items, yielding results as they complete."""
+        done: dict[str, asyncio.Future[BatchItemResult]] = {}
+        tasks = []
+        for item in items:
+            dependencies = [done[dep] for dep in item.depends_on]
+            task = asyncio.create_task(self._run_item(item, dependencies))
+            done[item.id] = task
+            tasks.append(task)
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_item(
+        self, item: BatchItem, dependencies: list[asyncio.Future[BatchItemResult]]
+    ) -> BatchItemResult:
+        for dependency in await asyncio.gather(*dependencies):
+            if dependency.status >= 400:
+                return BatchItemResult(
+                    id=item.id,
+                    status=424,
+                    body={"detail": f"Dependency {dependency.id} failed"},
+                    duration_ms=0.0,
+                )
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                status, headers, body = await self._dispatch(item)
+            except Exception as e:
+                logger.exception(f"Batch item {item.id} {item.path} failed: {e}")
+                status, headers, body = 500, {}, {"detail": "Internal Server Error"}
+            duration_ms = (time.perf_counter() - started) * 1000
+
+        return BatchItemResult(
+            id=item.id,
+            status=status,
+            headers=headers,
+            body=body,
+            duration_ms=round(duration_ms, 3),
+        )
+
+    async def _dispatch(self, item: BatchItem) -> tuple[int, dict[str, str], Any]:
+        path, _, query = item.path.partition("?")
+        if self.excluded_prefix and path.startswith(self.excluded_prefix):
+            return 400, {}, {"detail": "Batch requests cannot be nested"}
+        if self._streams(item.method, path):
+            return 400, {}, {"detail": "Streaming endpoints cannot be batched"}
+
+        body = b"" if item.body is None else json.dumps(item.body).encode()
+        headers = self.base_headers | {k.lower(): v for k, v in item.headers.items()}
+        if body:
+            headers["content-type"] = "application/json"
+            headers["content-length"] = str(len(body))
+
+        scope = self.base_scope | {
+            "method": item.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [
+                (k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()
+            ],
+        }
+
+        response_complete = asyncio.Event()
+        request_sent = False
+        start: Message = {}
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        try:
+            await self.app.router(scope, receive, send)
+        except HTTPException as e:
+            # Raised by the router itself (404, 405), outside any route's handlers
+            return e.status_code, dict(e.headers or {}), {"detail": e.detail}
+        response_complete.set()
+
+        response_headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in start.get("headers", [])
+            if name.lower() != b"content-length"
+        }
+        content = b"".join(chunks)
+        if response_headers.get("content-type", "").startswith("application/json"):
+            decoded: Any = json.loads(content) if content else None
+        else:
+            decoded = content.decode(errors="replace")
+        return start.get("status", 500), response_headers, decoded
+
+    def _streams(self, method: str, path: str) -> bool:
+        # The first route matching the path and method is the one that runs
+        for route in api_routes(self.app):
+            if route.path_regex.match(path) and method in route.methods:
+                response_class = route.response_class
+                if isinstance(response_class, DefaultPlaceholder):
+                    response_class = response_class.value
+                return isinstance(response_class, type) and issubclass(
+                    response_class, StreamingResponse
+                )
+        return False
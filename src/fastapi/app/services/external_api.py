@@ -0,0 +1,315 @@
+"""Pooled HTTP client for the configured external API."""
+
+import asyncio
+import importlib.util
+import random
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.deadlines import DeadlineExceeded, budget, remaining
+from app.core.http_cache import parse_cache_control
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class ExternalAPIError(Exception):
+    """The external API could not be reached."""
+
+
+class CircuitOpenError(ExternalAPIError):
+    """The circuit is open and the call was rejected without being sent."""
+
+
+def cache_ttl(response: httpx.Response) -> float | None:
+    """Get how long a response may be served from a shared cache."""
+    directives = parse_cache_control(response.headers.get("cache-control", ""))
+    if {"no-store", "no-cache", "private"} & directives.keys():
+        return None
+    max_age = directives.get("s-maxage") or directives.get("max-age")
+    if max_age is None:
+        return None
+    try:
+        ttl = float(max_age) - float(response.headers.get("age", 0))
+    except ValueError:
+        return None
+    return ttl if ttl > 0 else None
+
+
+class ResponseCache:
+    """In-memory LRU cache of GET responses with upstream-provided TTLs."""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, httpx.Response]] = OrderedDict()
+
+    def get(self, key: str) -> httpx.Response | None:
+        """Get a fresh cached response."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, response: httpx.Response, ttl: float) -> None:
+        """Cache a response for ``ttl`` seconds."""
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached responses."""
+        return len(self._entries)
+
+
+class ExternalAPIClient:
+    """Shared async client with keep-alive pooling, retries and a circuit breaker.
+
+    One client is created per worker process in lifespan so connections are
+    reused across requests. Idempotent requests are retried on transport
+    errors and 502/503/504 with jittered exponential backoff. Calls that still
+    fail count against the circuit breaker, which rejects calls immediately
+    while the upstream is down. GET responses are cached when the upstream
+    allows it through ``Cache-Control``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        retries: int = 2,
+        retry_backoff: float = 0.1,
+        retry_backoff_max: float = 2.0,
+        breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        """Initialize the client."""
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.breaker = breaker or CircuitBreaker("external_api")
+        self.cache = cache
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def started(self) -> bool:
+        """Check if the underlying connection pool is open."""
+        return self._client is not None
+
+    def start(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        """Open the connection pool."""
+        http2 = self.http2 and importlib.util.find_spec("h2") is not None
+        if self.http2 and not http2:
+            logger.warning('HTTP/2 requires the h2 package: pip install -e ".[http2]"')
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=http2,
+            transport=transport,
+        )
+        logger.info(f"External API client started for {self.base_url}")
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        headers: dict[str, str] | None = None,
+        use_cache: bool = True,
+    ) -> httpx.Response:
+        """Send a request, serving cacheable GETs from the response cache."""
+        client = self._client
+        if client is None:
+            raise RuntimeError("External API client is not started")
+
+        request = client.build_request(
+            method, url, params=params, json=json, headers=headers
+        )
+        cache_key = str(request.url)
+        cache = self.cache if use_cache and request.method == "GET" else None
+        if cache is not None and (cached := cache.get(cache_key)) is not None:
+            return cached
+
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.base_url}")
+
+        try:
+            response = await self._send(request)
+        except httpx.TransportError as e:
+            self.breaker.record_failure()
+            raise ExternalAPIError(f"{request.method} {request.url} failed: {e}") from e
+        except DeadlineExceeded:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or failed locally: the upstream was not judged, but a
+            # half-open trial must not hold the circuit forever
+            self.breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        if cache is not None and response.status_code == 200:
+            ttl = cache_ttl(response)
+            if ttl is not None:
+                cache.set(cache_key, response, ttl)
+        return response
+
+    async def get(
+        self, url: str, params: dict[str, Any] | None = None
+    ) -> httpx.Response:
+        """Send a GET request."""
+        return await self.request("GET", url, params=params)
+
+    def _attempt_timeout(self) -> httpx.Timeout | None:
+        """Cap the configured timeouts at the time left for the current request."""
+        left = budget(None)
+        if left is None:
+            return None
+
+        def cap(timeout: float | None) -> float:
+            return left if timeout is None else min(timeout, left)
+
+        return httpx.Timeout(
+            connect=cap(self.timeout.connect),
+            read=cap(self.timeout.read),
+            write=cap(self.timeout.write),
+            pool=cap(self.timeout.pool),
+        )
+
+    @staticmethod
+    def _can_retry(attempt: int, retries: int, delay: float) -> bool:
+        # Only retry if the request has time left for another attempt
+        left = remaining()
+        return attempt < retries and (left is None or left > delay)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        client = self._client
+        assert client is not None, "checked by request()"
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout()
+            if timeout is not None:
+                request.extensions["timeout"] = timeout.as_dict()
+            delay = random.uniform(
+                0, min(self.retry_backoff_max, self.retry_backoff * 2**attempt)
+            )
+
+            try:
+                response = await client.send(request)
+            except httpx.TimeoutException as e:
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded(
+                        f"{request.method} {request.url} ran out of request time"
+                    ) from e
+                if not self._can_retry(attempt, retries, delay):
+                    raise
+            except httpx.TransportError:
+                if not self._can_retry(attempt, retries, delay):
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or not self._can_retry(
+                    attempt, retries, delay
+                ):
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            logger.debug(
+                f"Retrying {request.method} {request.url} in {delay:.2f}s "
+                f"(attempt {attempt}/{retries})"
+            )
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get breaker and cache statistics."""
+        cache = None
+        if self.cache is not None:
+            cache = {
+                "entries": len(self.cache),
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+            }
+        return {
+            "started": self.started,
+            "circuit": self.breaker.snapshot(),
+            "cache": cache,
+        }
+
+
+def create_external_api_client() -> ExternalAPIClient:
+    """Create the external API client from settings."""
+    return ExternalAPIClient(
+        base_url=settings.EXTERNAL_API_URL or "",
+        api_key=settings.EXTERNAL_API_KEY,
+        timeout=settings.EXTERNAL_API_TIMEOUT_SECONDS,
+        connect_timeout=settings.EXTERNAL_API_CONNECT_TIMEOUT_SECONDS,
+        max_connections=settings.EXTERNAL_API_MAX_CONNECTIONS,
+        max_keepalive=settings.EXTERNAL_API_MAX_KEEPALIVE,
+        keepalive_expiry=settings.EXTERNAL_API_KEEPALIVE_EXPIRY_SECONDS,
+        http2=settings.EXTERNAL_API_HTTP2,
+        retries=settings.EXTERNAL_API_RETRIES,
+        retry_backoff=settings.EXTERNAL_API_RETRY_BACKOFF_SECONDS,
+        breaker=CircuitBreaker(
+            "external_api",
+            failure_threshold=settings.EXTERNAL_API_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.EXTERNAL_API_BREAKER_RESET_SECONDS,
+        ),
+        cache=(
+            ResponseCache(settings.EXTERNAL_API_CACHE_MAX_ENTRIES)
+            if settings.EXTERNAL_API_CACHE_ENABLED
+            else None
+        ),
+    )
+
+
+# Shared external API client for the worker process
+external_api = create_external_api_client()
@@ -0,0 +1,233 @@
+"""Storage of responses to requests carrying an Idempotency-Key."""
+
+import json
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import Any
+
+from app.core.config import settings
+from app.db.session import get_db
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+# Mirror of docker/postgres/init/07-idempotency-keys.sql for SQLite databases
+SQLITE_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    status INTEGER,
+    headers TEXT,
+    body BLOB,
+    locked_until TEXT,
+    expires_at TEXT NOT NULL
+)
+""",
+    "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires "
+    "ON idempotency_keys (expires_at)",
+)
+
+# A key is taken over once it expired or its request was abandoned mid-flight
+SQLITE_BEGIN = """
+INSERT INTO idempotency_keys (id, fingerprint, locked_until, expires_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    fingerprint = excluded.fingerprint,
+    status = NULL,
+    headers = NULL,
+    body = NULL,
+    locked_until = excluded.locked_until,
+    expires_at = excluded.expires_at
+WHERE idempotency_keys.expires_at <= ?
+   OR (idempotency_keys.status IS NULL AND idempotency_keys.locked_until <= ?)
+RETURNING id
+"""
+
+POSTGRES_BEGIN = """
+INSERT INTO app.idempotency_keys AS k (id, fingerprint, locked_until, expires_at)
+VALUES ($1, $2, now() + make_interval(secs => $3), now() + make_interval(secs => $4))
+ON CONFLICT (id) DO UPDATE SET
+    fingerprint = EXCLUDED.fingerprint,
+    status = NULL,
+    headers = NULL,
+    body = NULL,
+    locked_until = EXCLUDED.locked_until,
+    expires_at = EXCLUDED.expires_at
+WHERE k.expires_at <= now() OR (k.status IS NULL AND k.locked_until <= now())
+RETURNING id
+"""
+
+
+class KeyState(Enum):
+    """Outcome of trying to start a request under an idempotency key."""
+
+    ACQUIRED = "acquired"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    MISMATCH = "mismatch"
+
+
+@dataclass(slots=True)
+class StoredResponse:
+    """A response saved for replay."""
+
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+def encode_headers(headers: list[tuple[bytes, bytes]]) -> str:
+    """Serialize raw ASGI headers as JSON."""
+    return json.dumps(
+        [[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers]
+    )
+
+
+def decode_headers(headers: str | list[Any]) -> list[tuple[bytes, bytes]]:
+    """Deserialize headers from :func:`encode_headers`."""
+    pairs = json.loads(headers) if isinstance(headers, str) else headers
+    return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in pairs]
+
+
+class IdempotencyStore:
+    """Keep the response to each idempotency key for ``ttl`` seconds.
+
+    :meth:`begin` atomically claims a key for one request, locking it for
+    ``lock_timeout`` seconds so a request abandoned by a crashed worker does
+    not block the key forever. The claimant saves its response with
+    :meth:`complete`, or gives the key up with :meth:`release` so a retry
+    runs again. Keys are stored in the database, so every worker sees them.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 86400.0,
+        lock_timeout: float = 60.0,
+        session_factory: SessionFactory = get_db,
+    ):
+        """Initialize the store."""
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.session_factory = session_factory
+
+    async def setup(self) -> None:
+        """Create the table on SQLite; on Postgres it comes with the init scripts."""
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                for statement in SQLITE_SCHEMA:
+                    await session.execute(statement)
+
+    async def begin(
+        self, key: str, fingerprint: str
+    ) -> tuple[KeyState, StoredResponse | None]:
+        """Claim ``key`` for a request, or report who holds it.
+
+        A completed key returns the stored response; a key used for a
+        different request (by ``fingerprint``) is a mismatch.
+        """
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                now = datetime.now(UTC)
+                claimed = await session.execute(
+                    SQLITE_BEGIN,
+                    [
+                        key,
+                        fingerprint,
+                        (now + timedelta(seconds=self.lock_timeout)).isoformat(" "),
+                        (now + timedelta(seconds=self.ttl)).isoformat(" "),
+                        now.isoformat(" "),
+                        now.isoformat(" "),
+                    ],
+                )
+                select = (
+                    "SELECT fingerprint, status, headers, body "
+                    "FROM idempotency_keys WHERE id = ?"
+                )
+            elif session.dialect == "mock":
+                # The placeholder session stores nothing to deduplicate against
+                return KeyState.ACQUIRED, None
+            else:
+                claimed = await session.execute(
+                    POSTGRES_BEGIN, [key, fingerprint, self.lock_timeout, self.ttl]
+                )
+                select = (
+                    "SELECT fingerprint, status, headers, body "
+                    "FROM app.idempotency_keys WHERE id = $1"
+                )
+            if claimed:
+                return KeyState.ACQUIRED, None
+            rows = await session.execute(select, [key])
+
+        if not rows:
+            # Released between the two statements; the next attempt claims it
+            return KeyState.IN_PROGRESS, None
+        stored_fingerprint, status, headers, body = rows[0]
+        if stored_fingerprint != fingerprint:
+            return KeyState.MISMATCH, None
+        if status is None:
+            return KeyState.IN_PROGRESS, None
+        return KeyState.COMPLETED, StoredResponse(
+            status, decode_headers(headers), bytes(body)
+        )
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse
+    ) -> None:
+        """Save the response to a claimed key until the TTL passes."""
+        headers = encode_headers(response.headers)
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                expires_at = datetime.now(UTC) + timedelta(seconds=self.ttl)
+                await session.execute(
+                    "UPDATE idempotency_keys SET status = ?, headers = ?, body = ?, "
+                    "locked_until = NULL, expires_at = ? "
+                    "WHERE id = ? AND fingerprint = ?",
+                    [
+                        response.status,
+                        headers,
+                        response.body,
+                        expires_at.isoformat(" "),
+                        key,
+                        fingerprint,
+                    ],
+                )
+            else:
+                await session.execute(
+                    "UPDATE app.idempotency_keys SET status = $1, headers = $2::jsonb, "
+                    "body = $3, locked_until = NULL, "
+                    "expires_at = now() + make_interval(secs => $4) "
+                    "WHERE id = $5 AND fingerprint = $6",
+                    [
+                        response.status,
+                        headers,
+                        response.body,
+                        self.ttl,
+                        key,
+                        fingerprint,
+                    ],
+                )
+
+    async def release(self, key: str, fingerprint: str) -> None:
+        """Give up a claimed key without a response."""
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                statement = (
+                    "DELETE FROM idempotency_keys "
+                    "WHERE id = ? AND fingerprint = ? AND status IS NULL"
+                )
+            else:
+                statement = (
+                    "DELETE FROM app.idempotency_keys "
+                    "WHERE id = $1 AND fingerprint = $2 AND status IS NULL"
+                )
+            await session.execute(statement, [key, fingerprint])
+
+
+# Shared idempotency key store for the worker process
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_timeout=settings.IDEMPOTENCY_LOCK_SECONDS,
+)
@@ -0,0 +1,298 @@
+"""Full-text item search on a maintained index."""
+
+import base64
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.schemas.item_search import ItemSearchHit, ItemSearchResults
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+# Entity name items are written and invalidated under, as in ``BaseService``
+ITEM_ENTITY = "item"
+
+# Mirror of docker/postgres/init/06-item-search.sql for SQLite databases
+SQLITE_SCHEMA = (
+    """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, description, content='items', tokenize='porter unicode61'
+)
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items
+BEGIN
+  INSERT INTO items_fts (rowid, title, description)
+  VALUES (NEW.rowid, NEW.title, NEW.description);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items
+BEGIN
+  INSERT INTO items_fts (items_fts, rowid, title, description)
+  VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF title, description
+ON items
+BEGIN
+  INSERT INTO items_fts (items_fts, rowid, title, description)
+  VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+  INSERT INTO items_fts (rowid, title, description)
+  VALUES (NEW.rowid, NEW.title, NEW.description);
+END
+""",
+)
+
+
+def search_terms(text: str) -> list[str]:
+    """Split search text into lowercase words, dropping query syntax."""
+    return re.findall(r"\w+", text.lower())
+
+
+def match_expression(terms: list[str], dialect: str, prefix: bool) -> str:
+    """Build the query matching items that contain every term.
+
+    With ``prefix``, the last term also matches words it starts, so results
+    can follow a query as it is typed.
+    """
+    if dialect == "sqlite":
+        quoted = [f'"{term}"' for term in terms]
+        if prefix:
+            quoted[-1] += "*"
+        return " AND ".join(quoted)
+    quoted = [f"'{term}'" for term in terms]
+    if prefix:
+        quoted[-1] += ":*"
+    return " & ".join(quoted)
+
+
+def search_statement(dialect: str, owner_id: bool, is_active: bool, after: bool) -> str:
+    """Build the search statement, ordered by rank with the key as tiebreaker.
+
+    Pages continue past a ``(rank, key)`` cursor rather than an offset, so
+    deep pages cost the same as the first. The optional filters and the
+    cursor add placeholders in that order, followed by the limit.
+    """
+    if dialect == "sqlite":
+        select = (
+            "SELECT items.id, items.title, items.description, items.owner_id, "
+            "items.is_active, -bm25(items_fts, 1.0, 0.4) AS rank, "
+            "items.rowid AS key "
+            "FROM items_fts JOIN items ON items.rowid = items_fts.rowid "
+            "WHERE items_fts MATCH ?"
+        )
+        params = iter(["?"] * 5)
+        owner, active = "items.owner_id", "items.is_active"
+    else:
+        # The tsvector is weighted A for titles and B for descriptions
+        select = (
+            "SELECT id::text AS id, title, description, owner_id::text AS owner_id, "
+            "is_active, ts_rank_cd(search_vector, query)::float8 AS rank, "
+            "id::text AS key "
+            "FROM app.items, to_tsquery('english', $1) AS query "
+            "WHERE search_vector @@ query"
+        )
+        params = iter(f"${n}" for n in range(2, 7))
+        owner, active = "owner_id", "is_active"
+    if owner_id:
+        cast = "" if dialect == "sqlite" else "::uuid"
+        select += f" AND {owner} = {next(params)}{cast}"
+    if is_active:
+        select += f" AND {active} = {next(params)}"
+    cursor = f"WHERE (rank, key) < ({next(params)}, {next(params)}) " if after else ""
+    return (
+        f"SELECT * FROM ({select}) AS hits {cursor}"
+        f"ORDER BY rank DESC, key DESC LIMIT {next(params)}"
+    )
+
+
+def encode_cursor(rank: float, key: Any) -> str:
+    """Encode the position after a result as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([rank, key]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int | str]:
+    """Decode a cursor from :func:`encode_cursor`."""
+    try:
+        rank, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # Keys are bound as query parameters and hashed into cache keys
+        if isinstance(key, bool) or not isinstance(key, int | str):
+            raise TypeError(f"Cursor key is a {type(key).__name__}")
+        return float(rank), key
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class SearchResultCache:
+    """In-memory LRU cache of search results for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        """Initialize the cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, tuple[float, ItemSearchResults]] = OrderedDict()
+
+    def get(self, key: Any) -> ItemSearchResults | None:
+        """Get fresh cached results."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Any, results: ItemSearchResults) -> None:
+        """Cache results."""
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached queries."""
+        return len(self._entries)
+
+
+class ItemSearchService:
+    """Search item titles and descriptions through a full-text index.
+
+    On Postgres items carry a generated, GIN-indexed ``search_vector`` and
+    matches are ranked with ``ts_rank_cd``; on SQLite an external-content
+    FTS5 table kept in sync by triggers is ranked with ``bm25``. Either way
+    the index is maintained on write, so a search never scans ``items``.
+    With a ``cache_ttl``, results of repeated queries are served from memory
+    for that long, so they may miss writes made in the meantime.
+    """
+
+    def __init__(
+        self,
+        cache_ttl: float = 0.0,
+        cache_max_entries: int = 1024,
+        session_factory: SessionFactory = get_db,
+    ):
+        """Initialize the service."""
+        self.cache = (
+            SearchResultCache(cache_ttl, cache_max_entries) if cache_ttl > 0 else None
+        )
+        self.session_factory = session_factory
+
+    async def setup(self) -> bool:
+        """Create and fill the FTS5 index on SQLite if ``items`` exists.
+
+        On Postgres the index comes with the database init scripts.
+        """
+        async with self.session_factory() as session:
+            if session.dialect != "sqlite":
+                return False
+            tables = {
+                row[0]
+                for row in await session.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'table' AND name IN ('items', 'items_fts')"
+                )
+            }
+            if "items" not in tables:
+                return False
+            for statement in SQLITE_SCHEMA:
+                await session.execute(statement)
+            if "items_fts" not in tables:
+                await session.execute(
+                    "INSERT INTO items_fts (items_fts) VALUES ('rebuild')"
+                )
+        return True
+
+    async def search(
+        self,
+        text: str,
+        owner_id: str | None = None,
+        is_active: bool | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        prefix: bool = True,
+    ) -> ItemSearchResults:
+        """Get a page of items matching every word of ``text``, best first.
+
+        Raises ``ValueError`` for a malformed cursor.
+        """
+        terms = search_terms(text)
+        if not terms:
+            return ItemSearchResults(items=[])
+        after = decode_cursor(cursor) if cursor else None
+        cache_key = (tuple(terms), owner_id, is_active, limit, after, prefix)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with self.session_factory() as session:
+            statement = search_statement(
+                session.dialect,
+                owner_id is not None,
+                is_active is not None,
+                after is not None,
+            )
+            params: list[Any] = [match_expression(terms, session.dialect, prefix)]
+            params += [value for value in (owner_id, is_active) if value is not None]
+            if after is not None:
+                params += list(after)
+            # One extra row tells whether there is a next page
+            rows = await session.execute(statement, [*params, limit + 1])
+
+        hits = [
+            ItemSearchHit(
+                id=str(row[0]),
+                title=row[1],
+                description=row[2],
+                owner_id=str(row[3]),
+                is_active=bool(row[4]),
+                rank=row[5],
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = (
+            encode_cursor(rows[limit - 1][5], rows[limit - 1][6])
+            if len(rows) > limit
+            else None
+        )
+        results = ItemSearchResults(items=hits, next_cursor=next_cursor)
+        if self.cache is not None:
+            self.cache.set(cache_key, results)
+        return results
+
+    def evict(self, entity: str | None, entity_id: Any = None) -> None:
+        """Drop cached results after an item write or a full flush."""
+        if self.cache is not None and entity in (None, ITEM_ENTITY):
+            self.cache.clear()
+
+    def snapshot(self) -> dict[str, int]:
+        """Get result cache counters."""
+        if self.cache is None:
+            return {"cached": 0, "hits": 0, "misses": 0}
+        return {
+            "cached": len(self.cache),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+        }
+
+
+# Shared item search service for the worker process
+item_search = ItemSearchService(
+    cache_ttl=settings.ITEM_SEARCH_CACHE_TTL_SECONDS,
+    cache_max_entries=settings.ITEM_SEARCH_CACHE_MAX_ENTRIES,
+)
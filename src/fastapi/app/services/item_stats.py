@@ -0,0 +1,256 @@
+"""Per-owner item aggregates, kept current by triggers and reconciled periodically."""
+
+import asyncio
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.worker_control import default_lock_path, exclusive_lock
+from app.db.session import get_db
+from app.schemas.item_stats import OwnerItemStats
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+STATS_COLUMNS = "item_count, active_count, price_total, tax_total"
+
+# Mirror of docker/postgres/init/05-owner-item-stats.sql for SQLite databases
+SQLITE_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS owner_item_stats (
+    owner_id TEXT PRIMARY KEY,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    active_count INTEGER NOT NULL DEFAULT 0,
+    price_total NUMERIC NOT NULL DEFAULT 0,
+    tax_total NUMERIC NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+)
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS owner_item_stats_insert AFTER INSERT ON items
+BEGIN
+  INSERT INTO owner_item_stats (owner_id, item_count, active_count,
+                                price_total, tax_total)
+  VALUES (NEW.owner_id, 1, NEW.is_active IS TRUE,
+          COALESCE(NEW.price, 0), COALESCE(NEW.tax, 0))
+  ON CONFLICT (owner_id) DO UPDATE SET
+    item_count = item_count + excluded.item_count,
+    active_count = active_count + excluded.active_count,
+    price_total = price_total + excluded.price_total,
+    tax_total = tax_total + excluded.tax_total,
+    updated_at = CURRENT_TIMESTAMP;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS owner_item_stats_delete AFTER DELETE ON items
+BEGIN
+  UPDATE owner_item_stats SET
+    item_count = item_count - 1,
+    active_count = active_count - (OLD.is_active IS TRUE),
+    price_total = price_total - COALESCE(OLD.price, 0),
+    tax_total = tax_total - COALESCE(OLD.tax, 0),
+    updated_at = CURRENT_TIMESTAMP
+  WHERE owner_id = OLD.owner_id;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS owner_item_stats_update
+AFTER UPDATE OF owner_id, is_active, price, tax ON items
+BEGIN
+  UPDATE owner_item_stats SET
+    item_count = item_count - 1,
+    active_count = active_count - (OLD.is_active IS TRUE),
+    price_total = price_total - COALESCE(OLD.price, 0),
+    tax_total = tax_total - COALESCE(OLD.tax, 0),
+    updated_at = CURRENT_TIMESTAMP
+  WHERE owner_id = OLD.owner_id;
+  INSERT INTO owner_item_stats (owner_id, item_count, active_count,
+                                price_total, tax_total)
+  VALUES (NEW.owner_id, 1, NEW.is_active IS TRUE,
+          COALESCE(NEW.price, 0), COALESCE(NEW.tax, 0))
+  ON CONFLICT (owner_id) DO UPDATE SET
+    item_count = item_count + excluded.item_count,
+    active_count = active_count + excluded.active_count,
+    price_total = price_total + excluded.price_total,
+    tax_total = tax_total + excluded.tax_total,
+    updated_at = CURRENT_TIMESTAMP;
+END
+""",
+)
+
+SQLITE_RECONCILE = (
+    f"""
+INSERT INTO owner_item_stats (owner_id, {STATS_COLUMNS}, updated_at)
+SELECT owner_id, count(*), count(*) FILTER (WHERE is_active),
+       COALESCE(sum(price), 0), COALESCE(sum(tax), 0), CURRENT_TIMESTAMP
+FROM items WHERE true GROUP BY owner_id
+ON CONFLICT (owner_id) DO UPDATE SET
+    item_count = excluded.item_count,
+    active_count = excluded.active_count,
+    price_total = excluded.price_total,
+    tax_total = excluded.tax_total,
+    updated_at = excluded.updated_at
+WHERE ({STATS_COLUMNS}) IS NOT (excluded.item_count, excluded.active_count,
+                                excluded.price_total, excluded.tax_total)
+RETURNING owner_id
+""",
+    """
+DELETE FROM owner_item_stats
+WHERE owner_id NOT IN (SELECT owner_id FROM items)
+RETURNING owner_id
+""",
+)
+
+POSTGRES_RECONCILE = f"""
+WITH actual AS (
+    SELECT owner_id, count(*) AS item_count,
+           count(*) FILTER (WHERE is_active) AS active_count,
+           COALESCE(sum(price), 0) AS price_total,
+           COALESCE(sum(tax), 0) AS tax_total
+    FROM app.items GROUP BY owner_id
+), corrected AS (
+    INSERT INTO app.owner_item_stats AS s (owner_id, {STATS_COLUMNS})
+    SELECT owner_id, {STATS_COLUMNS} FROM actual
+    ON CONFLICT (owner_id) DO UPDATE SET
+        item_count = EXCLUDED.item_count,
+        active_count = EXCLUDED.active_count,
+        price_total = EXCLUDED.price_total,
+        tax_total = EXCLUDED.tax_total,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE (s.item_count, s.active_count, s.price_total, s.tax_total)
+        IS DISTINCT FROM (EXCLUDED.item_count, EXCLUDED.active_count,
+                          EXCLUDED.price_total, EXCLUDED.tax_total)
+    RETURNING owner_id
+), removed AS (
+    DELETE FROM app.owner_item_stats s
+    WHERE NOT EXISTS (SELECT 1 FROM actual a WHERE a.owner_id = s.owner_id)
+    RETURNING owner_id
+)
+SELECT (SELECT count(*) FROM corrected) AS corrected,
+       (SELECT count(*) FROM removed) AS removed
+"""
+
+
+class ItemStatsService:
+    """Read per-owner item aggregates and correct them when they drift.
+
+    ``owner_item_stats`` holds one row per owner with item counts and
+    price/tax totals. Triggers on ``items`` apply each insert, update and
+    delete as a delta, so every writer keeps it current, including bulk SQL
+    that bypasses the services, and a read is a primary key lookup.
+    Reconciliation recomputes the aggregates with one ``GROUP BY`` and
+    rewrites only the owners that drifted, e.g. after triggers were disabled
+    for a bulk load. It runs every ``interval`` seconds in one worker.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600.0,
+        lock_path: str | Path | None = None,
+        session_factory: SessionFactory = get_db,
+    ):
+        """Initialize the service."""
+        self.interval = interval
+        self.configured_lock_path = Path(lock_path) if lock_path else None
+        self.session_factory = session_factory
+        self.last_result: dict[str, int] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def setup(self) -> bool:
+        """Create the aggregate table and triggers on SQLite if ``items`` exists.
+
+        On Postgres they come with the database init scripts.
+        """
+        async with self.session_factory() as session:
+            if session.dialect != "sqlite":
+                return False
+            tables = await session.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'items'"
+            )
+            if not tables:
+                return False
+            for statement in SQLITE_SCHEMA:
+                await session.execute(statement)
+        await self.reconcile()
+        return True
+
+    async def get(self, owner_id: str) -> OwnerItemStats:
+        """Get an owner's aggregates, all zero for owners without items."""
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                statement = (
+                    f"SELECT {STATS_COLUMNS} FROM owner_item_stats WHERE owner_id = ?"
+                )
+            else:
+                statement = (
+                    f"SELECT {STATS_COLUMNS} FROM app.owner_item_stats "
+                    "WHERE owner_id = $1"
+                )
+            rows = await session.execute(statement, [owner_id])
+        if not rows:
+            return OwnerItemStats(owner_id=owner_id)
+        item_count, active_count, price_total, tax_total = rows[0]
+        return OwnerItemStats(
+            owner_id=owner_id,
+            item_count=item_count,
+            active_count=active_count,
+            price_total=Decimal(str(price_total)),
+            tax_total=Decimal(str(tax_total)),
+        )
+
+    async def reconcile(self) -> dict[str, int]:
+        """Recompute the aggregates and fix drifted owners; return the counts."""
+        async with self.session_factory() as session:
+            if session.dialect == "sqlite":
+                corrected = await session.execute(SQLITE_RECONCILE[0])
+                removed = await session.execute(SQLITE_RECONCILE[1])
+                result = {"corrected": len(corrected), "removed": len(removed)}
+            else:
+                # A trigger delta committed after the snapshot makes this fail
+                # with a serialization error instead of being overwritten
+                await session.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                rows = await session.execute(POSTGRES_RECONCILE)
+                result = (
+                    {"corrected": rows[0][0], "removed": rows[0][1]}
+                    if rows
+                    else {"corrected": 0, "removed": 0}
+                )
+        if result["corrected"] or result["removed"]:
+            logger.warning(f"Reconciled drifted owner item stats: {result}")
+        self.last_result = result
+        return result
+
+    def start(self) -> None:
+        """Start reconciling every interval."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop reconciling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            lock_path = self.configured_lock_path or default_lock_path("item-stats")
+            with exclusive_lock(lock_path) as acquired:
+                if not acquired:
+                    continue
+                try:
+                    await self.reconcile()
+                except Exception as e:
+                    logger.error(f"Owner item stats reconciliation failed: {e}")
+
+
+# Shared item stats service for the worker process
+item_stats = ItemStatsService(interval=settings.ITEM_STATS_RECONCILE_INTERVAL_SECONDS)
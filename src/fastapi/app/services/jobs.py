@@ -0,0 +1,249 @@
+"""Background job queue and workers."""
+
+import asyncio
+import importlib
+import os
+import random
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+from app.db.job_store import JobStore, create_job_store
+from app.models.job import Job
+
+TaskHandler = Callable[..., Awaitable[Any]]
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given attempt number."""
+    return random.uniform(0, min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+class JobQueue:
+    """Registry of task handlers and the API for enqueueing jobs.
+
+    Services register handlers with :meth:`task` and enqueue work by name::
+
+        @job_queue.task("send_welcome_email")
+        async def send_welcome_email(user_id: str) -> None: ...
+
+        await job_queue.enqueue("send_welcome_email", {"user_id": user.id})
+    """
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self.handlers: dict[str, TaskHandler] = {}
+        self.store: JobStore | None = None
+        self._wakeups: dict[str, asyncio.Event] = {}
+
+    def task(self, name: str) -> Callable[[TaskHandler], TaskHandler]:
+        """Register a coroutine function as the handler for a task name."""
+
+        def register(handler: TaskHandler) -> TaskHandler:
+            self.handlers[name] = handler
+            return handler
+
+        return register
+
+    async def connect(self, store: JobStore) -> None:
+        """Set up the store jobs are written to and claimed from."""
+        await store.setup()
+        self.store = store
+        self._wakeups = {}
+
+    async def close(self) -> None:
+        """Close the store."""
+        if self.store is not None:
+            await self.store.close()
+            self.store = None
+
+    async def enqueue(
+        self,
+        task: str,
+        payload: dict[str, Any] | None = None,
+        queue: str = "default",
+        priority: int = 0,
+        delay: float = 0.0,
+        max_attempts: int | None = None,
+    ) -> int:
+        """Persist a job for a registered task and return its ID."""
+        if self.store is None:
+            raise RuntimeError("Job queue is not connected")
+        if task not in self.handlers:
+            raise ValueError(f"Unknown task: {task}")
+
+        job_id = await self.store.enqueue(
+            queue,
+            task,
+            payload or {},
+            priority,
+            float(delay),
+            max_attempts or settings.JOB_MAX_ATTEMPTS,
+        )
+        logger.debug(f"Enqueued job {job_id} ({task}) on queue {queue}")
+
+        # Wake a local worker instead of waiting for its next poll
+        if not delay and queue in self._wakeups:
+            self._wakeups[queue].set()
+        return job_id
+
+    def wakeup_event(self, queue: str) -> asyncio.Event:
+        """Get the event local workers wait on between polls."""
+        return self._wakeups.setdefault(queue, asyncio.Event())
+
+
+class JobWorker:
+    """Claim and run jobs from one queue with a per-process concurrency cap.
+
+    Every server worker process runs its own ``JobWorker`` per queue, so a
+    host with N worker processes runs up to N times ``concurrency`` jobs from
+    the queue at once.
+    """
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        queue: str = "default",
+        concurrency: int = 4,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300.0,
+        retry_backoff: float = 5.0,
+        retry_backoff_max: float = 3600.0,
+    ):
+        """Initialize the worker."""
+        self.job_queue = job_queue
+        self.queue = queue
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processed = 0
+        self.failed = 0
+        self._active: set[asyncio.Task[None]] = set()
+        self._stopping = False
+        self._loop_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start claiming jobs in the background."""
+        self._stopping = False
+        self._loop_task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming jobs and wait for running ones to finish."""
+        self._stopping = True
+        self.job_queue.wakeup_event(self.queue).set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+        if self._active:
+            _, pending = await asyncio.wait(self._active, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(
+                    f"Cancelled {len(pending)} jobs still running on {self.queue}"
+                )
+
+    async def run(self) -> None:
+        """Claim batches of jobs until stopped."""
+        store = self.job_queue.store
+        if store is None:
+            raise RuntimeError("Job queue is not connected")
+        wakeup = self.job_queue.wakeup_event(self.queue)
+        logger.info(
+            f"Job worker {self.worker_id} started on queue {self.queue} "
+            f"(concurrency {self.concurrency})"
+        )
+
+        while not self._stopping:
+            # Clear before claiming so wakeups during the claim are not lost
+            wakeup.clear()
+            free = self.concurrency - len(self._active)
+            jobs: list[Job] = []
+            if free > 0:
+                try:
+                    jobs = await store.claim(
+                        self.queue,
+                        min(free, self.batch_size),
+                        self.visibility_timeout,
+                        self.worker_id,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to claim jobs from {self.queue}: {e}")
+
+            for job in jobs:
+                task = asyncio.create_task(self._execute(store, job))
+                self._active.add(task)
+                task.add_done_callback(self._active.discard)
+
+            if len(jobs) == free and free > 0:
+                continue  # There may be more work ready right away
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def _execute(self, store: JobStore, job: Job) -> None:
+        handler = self.job_queue.handlers.get(job.task)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for task {job.task}")
+            # Stop before the claim expires and another worker picks the job up
+            await asyncio.wait_for(handler(**job.payload), self.visibility_timeout)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            retry_in = None
+            if job.attempts < job.max_attempts:
+                retry_in = retry_delay(
+                    job.attempts, self.retry_backoff, self.retry_backoff_max
+                )
+            logger.warning(
+                f"Job {job.id} ({job.task}) attempt {job.attempts} failed: {error}"
+            )
+            self.failed += 1
+            await store.fail(job.id, self.worker_id, error, retry_in)
+        else:
+            self.processed += 1
+            await store.complete(job.id, self.worker_id)
+        finally:
+            # Wake the claim loop now that a slot is free
+            self.job_queue.wakeup_event(self.queue).set()
+
+
+def create_workers(job_queue: JobQueue) -> list[JobWorker]:
+    """Create a worker for each configured queue."""
+    return [
+        JobWorker(
+            job_queue,
+            queue=queue,
+            concurrency=concurrency,
+            batch_size=settings.JOB_BATCH_SIZE,
+            poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+            visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+            retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+            retry_backoff_max=settings.JOB_RETRY_BACKOFF_MAX_SECONDS,
+        )
+        for queue, concurrency in settings.JOB_QUEUES.items()
+    ]
+
+
+async def connect_job_queue() -> None:
+    """Import task modules and connect the shared job queue to the database."""
+    for module in settings.JOB_TASK_MODULES:
+        importlib.import_module(module)
+    await job_queue.connect(
+        create_job_store(settings.JOBS_DATABASE_URL or settings.DATABASE_URL)
+    )
+
+
+# Shared job queue for the process
+job_queue = JobQueue()
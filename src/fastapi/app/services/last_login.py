@@ -0,0 +1,191 @@
+"""Write-behind buffer for users' last login times."""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+from app.db.session import get_db
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+
+def bulk_update_statement(dialect: str, rows: int) -> str:
+    """Build one UPDATE setting ``last_login`` for ``rows`` users.
+
+    Each row binds a user ID, its login time and the time before which the
+    stored value is stale, so values written by other workers within the
+    precision window are left alone.
+    """
+    if dialect == "sqlite":
+        values = ", ".join(["(?, ?, ?)"] * rows)
+        return (
+            f"WITH v(id, last_login, stale_before) AS (VALUES {values}) "
+            "UPDATE users SET last_login = v.last_login FROM v "
+            "WHERE users.id = v.id "
+            "AND (users.last_login IS NULL OR users.last_login < v.stale_before)"
+        )
+    values = ", ".join(
+        f"(${n * 3 + 1}::uuid, ${n * 3 + 2}::timestamptz, ${n * 3 + 3}::timestamptz)"
+        for n in range(rows)
+    )
+    return (
+        "UPDATE app.users AS u SET last_login = v.last_login "
+        f"FROM (VALUES {values}) AS v(id, last_login, stale_before) "
+        "WHERE u.id = v.id "
+        "AND (u.last_login IS NULL OR u.last_login < v.stale_before)"
+    )
+
+
+class LastLoginBuffer:
+    """Coalesce last login updates in memory and flush them in bulk.
+
+    Recording a login only keeps the latest time per user, so a user making
+    many requests costs one row in the next flush rather than one UPDATE per
+    request. Every ``interval`` seconds, and on shutdown, pending times are
+    written with one ``UPDATE ... FROM (VALUES ...)`` per ``batch_size``
+    users. Logins within ``precision`` seconds of the value last written are
+    skipped, both here and in the statement itself. Failed flushes are
+    retried with the next one.
+    """
+
+    def __init__(
+        self,
+        interval: float = 30.0,
+        precision: float = 300.0,
+        batch_size: int = 1000,
+        max_pending: int = 100_000,
+        session_factory: SessionFactory = get_db,
+    ):
+        """Initialize the buffer."""
+        self.interval = interval
+        self.precision = timedelta(seconds=precision)
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+        self.recorded = 0
+        self.skipped = 0
+        self.written = 0
+        self.failed_flushes = 0
+        self._pending: dict[str, datetime] = {}
+        # Last value written per user, to skip logins within the precision
+        self._written: OrderedDict[str, datetime] = OrderedDict()
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Users with a login waiting to be written."""
+        return len(self._pending)
+
+    def record(self, user_id: str, at: datetime | None = None) -> None:
+        """Record a login for ``user_id``, at ``at`` or now."""
+        at = at or datetime.now(UTC)
+        written = self._written.get(user_id)
+        if written is not None and at - written < self.precision:
+            self.skipped += 1
+            return
+        self.recorded += 1
+        pending = self._pending.get(user_id)
+        if pending is None or at > pending:
+            self._pending[user_id] = at
+        if len(self._pending) >= self.max_pending:
+            self._full.set()
+
+    def _requeue(self, rows: dict[str, datetime]) -> None:
+        for user_id, at in rows.items():
+            pending = self._pending.get(user_id)
+            if pending is None or at > pending:
+                self._pending[user_id] = at
+
+    async def flush(self) -> int:
+        """Write pending logins and return how many users were sent."""
+        async with self._flush_lock:
+            rows, self._pending = self._pending, {}
+            self._full.clear()
+            items = list(rows.items())
+            sent = 0
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    logger.error(
+                        f"Failed to write {len(items) - sent} last logins: {e}"
+                    )
+                    self._requeue(dict(items[start:]))
+                    break
+                sent += len(batch)
+                for user_id, at in batch:
+                    self._written[user_id] = at
+                    self._written.move_to_end(user_id)
+                while len(self._written) > self.max_pending:
+                    self._written.popitem(last=False)
+            self.written += sent
+            return sent
+
+    async def _write(self, batch: list[tuple[str, datetime]]) -> None:
+        async with self.session_factory() as session:
+            statement = bulk_update_statement(session.dialect, len(batch))
+            params: list[Any] = []
+            for user_id, at in batch:
+                stale_before = at - self.precision
+                if session.dialect == "sqlite":
+                    params += [user_id, at.isoformat(" "), stale_before.isoformat(" ")]
+                else:
+                    params += [user_id, at, stale_before]
+            await session.execute(statement, params)
+
+    def start(self) -> None:
+        """Start flushing every interval."""
+        if self._task is None:
+            # Bound to the running loop once waited on
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except TimeoutError:
+                pass
+            if self._pending:
+                await self.flush()
+
+    def snapshot(self) -> dict[str, int]:
+        """Get buffer counters."""
+        return {
+            "pending": self.pending,
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "written": self.written,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# Shared last login buffer for the worker process
+last_login = LastLoginBuffer(
+    interval=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+    precision=settings.LAST_LOGIN_PRECISION_SECONDS,
+    batch_size=settings.LAST_LOGIN_BATCH_SIZE,
+    max_pending=settings.LAST_LOGIN_MAX_PENDING,
+)
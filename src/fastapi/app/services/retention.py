@@ -0,0 +1,232 @@
+"""Background deletion of expired sessions and old audit rows."""
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping
+from contextlib import AbstractAsyncContextManager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.worker_control import default_lock_path, exclusive_lock
+from app.db.session import get_db
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+# Timestamp column that decides when a row may be deleted, per table
+RETENTION_COLUMNS = {
+    "sessions": "expires_at",
+    "audit_logs": "created_at",
+    "idempotency_keys": "expires_at",
+}
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """Delete rows of ``table`` whose ``column`` is older than ``retention``.
+
+    A zero retention deletes rows as soon as ``column`` passes, which suits
+    expiry timestamps.
+    """
+
+    table: str
+    column: str
+    retention: timedelta = timedelta(0)
+    key: str = "id"
+
+
+@dataclass(slots=True)
+class TableProgress:
+    """Counters for one table's sweeps."""
+
+    deleted_total: int = 0
+    chunks_total: int = 0
+    errors_total: int = 0
+    last_deleted: int = 0
+    last_run_at: float | None = None
+    last_duration_seconds: float | None = None
+    last_error: str | None = None
+    running: bool = False
+
+
+def policies_from_settings(
+    retention_days: Mapping[str, float],
+) -> list[RetentionPolicy]:
+    """Build policies for the tables in ``RETENTION_COLUMNS``."""
+    policies = []
+    for table, days in retention_days.items():
+        if table not in RETENTION_COLUMNS:
+            raise ValueError(f"No retention column known for table {table}")
+        policies.append(
+            RetentionPolicy(table, RETENTION_COLUMNS[table], timedelta(days=days))
+        )
+    return policies
+
+
+def delete_chunk_statement(policy: RetentionPolicy, dialect: str, after: bool) -> str:
+    """Build the statement deleting the next chunk in ``(column, key)`` order.
+
+    With ``after``, the chunk starts past a cursor so index entries of rows
+    deleted by earlier chunks, which stay until vacuumed, are not rescanned.
+    """
+    column, key = policy.column, policy.key
+    if dialect == "sqlite":
+        cursor = f"AND ({column}, {key}) > (?, ?) " if after else ""
+        return (
+            f"DELETE FROM {policy.table} WHERE rowid IN ("
+            f"SELECT rowid FROM {policy.table} WHERE {column} < ? {cursor}"
+            f"ORDER BY {column}, {key} LIMIT ?) "
+            f"RETURNING {column}, {key}"
+        )
+    cursor = f"AND ({column}, {key}) > ($2, $3) " if after else ""
+    limit = "$4" if after else "$2"
+    return (
+        f"DELETE FROM app.{policy.table} WHERE {key} IN ("
+        f"SELECT {key} FROM app.{policy.table} WHERE {column} < $1 {cursor}"
+        f"ORDER BY {column}, {key} LIMIT {limit} FOR UPDATE SKIP LOCKED) "
+        f"RETURNING {column}, {key}"
+    )
+
+
+class RetentionSweeper:
+    """Delete expired rows in small chunks without holding long locks.
+
+    Every ``interval`` seconds each policy's table is swept: rows past their
+    retention are deleted ``chunk_size`` at a time in ``(column, key)`` order,
+    each chunk in its own short transaction with ``lock_timeout`` (Postgres)
+    or the busy timeout (SQLite), sleeping ``pause`` seconds between chunks
+    so the primary and replicas keep up. Rows locked by other transactions
+    are skipped and picked up by a later run. A table whose chunk fails is
+    retried on the next run. Only one worker per server sweeps at a time,
+    coordinated by :func:`exclusive_lock`.
+    """
+
+    def __init__(
+        self,
+        policies: list[RetentionPolicy],
+        interval: float = 3600.0,
+        chunk_size: int = 1000,
+        pause: float = 0.1,
+        lock_timeout: float = 2.0,
+        lock_path: str | Path | None = None,
+        session_factory: SessionFactory = get_db,
+    ):
+        """Initialize the sweeper."""
+        self.policies = policies
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.lock_timeout = lock_timeout
+        self.configured_lock_path = Path(lock_path) if lock_path else None
+        self.session_factory = session_factory
+        self.progress = {policy.table: TableProgress() for policy in policies}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start sweeping every interval."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sweeping, abandoning the current chunk's transaction."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            lock_path = self.configured_lock_path or default_lock_path("retention")
+            with exclusive_lock(lock_path) as acquired:
+                if not acquired:
+                    logger.debug("Retention sweep running in another worker")
+                    continue
+                await self.sweep()
+
+    async def sweep(self) -> dict[str, int]:
+        """Sweep every table once and return the rows deleted per table."""
+        return {
+            policy.table: await self.sweep_table(policy) for policy in self.policies
+        }
+
+    async def sweep_table(self, policy: RetentionPolicy) -> int:
+        """Delete a table's expired rows chunk by chunk and return how many."""
+        progress = self.progress[policy.table]
+        progress.running = True
+        progress.last_deleted = 0
+        started = time.perf_counter()
+        cutoff = datetime.now(UTC) - policy.retention
+        cursor: tuple[Any, Any] | None = None
+        try:
+            while not lifecycle.draining:
+                rows = await self._delete_chunk(policy, cutoff, cursor)
+                progress.chunks_total += 1
+                progress.last_deleted += len(rows)
+                progress.deleted_total += len(rows)
+                if len(rows) < self.chunk_size:
+                    break
+                cursor = max((row[0], row[1]) for row in rows)
+                await asyncio.sleep(self.pause)
+            progress.last_error = None
+        except Exception as e:
+            progress.errors_total += 1
+            progress.last_error = str(e)
+            logger.warning(f"Retention sweep of {policy.table} stopped: {e}")
+        finally:
+            progress.running = False
+            progress.last_run_at = time.time()
+            progress.last_duration_seconds = time.perf_counter() - started
+        if progress.last_deleted:
+            logger.info(
+                f"Retention deleted {progress.last_deleted} rows from {policy.table}"
+            )
+        return progress.last_deleted
+
+    async def _delete_chunk(
+        self,
+        policy: RetentionPolicy,
+        cutoff: datetime,
+        cursor: tuple[Any, Any] | None,
+    ) -> list[Any]:
+        async with self.session_factory() as session:
+            statement = delete_chunk_statement(
+                policy, session.dialect, cursor is not None
+            )
+            if session.dialect == "sqlite":
+                params: list[Any] = [cutoff.isoformat(" ")]
+            else:
+                # Give up on rows held by long transactions instead of queueing
+                await session.execute(
+                    f"SET LOCAL lock_timeout = '{int(self.lock_timeout * 1000)}ms'"
+                )
+                params = [cutoff]
+            if cursor is not None:
+                params += list(cursor)
+            rows: list[Any] = await session.execute(
+                statement, [*params, self.chunk_size]
+            )
+        return rows
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get sweep progress per table."""
+        return {table: asdict(progress) for table, progress in self.progress.items()}
+
+
+# Shared retention sweeper for the worker process
+retention_sweeper = RetentionSweeper(
+    policies_from_settings(settings.RETENTION_DAYS),
+    interval=settings.RETENTION_INTERVAL_SECONDS,
+    chunk_size=settings.RETENTION_CHUNK_SIZE,
+    pause=settings.RETENTION_CHUNK_PAUSE_MS / 1000,
+    lock_timeout=settings.RETENTION_LOCK_TIMEOUT_MS / 1000,
+    lock_path=settings.RETENTION_LOCK_PATH,
+)
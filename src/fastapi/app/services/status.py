@@ -0,0 +1,126 @@
+"""Server-Sent Events stream of service status changes."""
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+from loguru import logger
+
+from app.core.broadcast import Broadcaster, Subscription
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+
+StatusProvider = Callable[[], Awaitable[dict[str, Any]]]
+
+HEARTBEAT = b": heartbeat\n\n"
+
+
+def encode_event(event: str, data: dict[str, Any]) -> bytes:
+    """Encode a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class StatusStream:
+    """Compute the status snapshot once per tick and push changes to subscribers.
+
+    However many clients are connected, the status is computed once per
+    interval by a single task, and only when it changes is it published.
+    Heartbeat comments keep idle connections open through proxies. Once the
+    worker starts draining, every stream is closed so clients reconnect to
+    another worker.
+    """
+
+    def __init__(
+        self,
+        provider: StatusProvider,
+        broadcaster: Broadcaster,
+        interval: float = 2.0,
+        heartbeat: float = 15.0,
+    ):
+        """Initialize the stream."""
+        self.provider = provider
+        self.broadcaster = broadcaster
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.latest: bytes | None = None
+        self._status: dict[str, Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the background ticker."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the ticker and end all streams."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.broadcaster.close()
+
+    async def subscribe(self) -> Subscription | None:
+        """Subscribe with the current status queued as the first event."""
+        subscription = self.broadcaster.subscribe()
+        if subscription is None:
+            return None
+        try:
+            if self._status is None:
+                await self.refresh()
+        except Exception:
+            self.broadcaster.unsubscribe(subscription)
+            raise
+        if subscription.queue.empty() and self.latest is not None:
+            subscription.queue.put_nowait(self.latest)
+        return subscription
+
+    async def refresh(self) -> bool:
+        """Recompute the status and publish it if it changed."""
+        status = await self.provider()
+        if status == self._status:
+            return False
+        self._status = status
+        self.latest = encode_event(
+            "status", status | {"timestamp": datetime.utcnow().isoformat()}
+        )
+        self.broadcaster.publish(self.latest)
+        return True
+
+    async def _run(self) -> None:
+        last_sent = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.broadcaster.subscribers:
+                # Nobody is listening; recompute on the next subscriber instead
+                self._status = None
+                continue
+            try:
+                if await self.refresh():
+                    last_sent = time.monotonic()
+            except Exception as e:
+                logger.error(f"Failed to compute status snapshot: {e}")
+
+            if lifecycle.draining:
+                self.broadcaster.close()
+            elif time.monotonic() - last_sent >= self.heartbeat:
+                self.broadcaster.publish(HEARTBEAT)
+                last_sent = time.monotonic()
+
+
+def create_status_stream(provider: StatusProvider) -> StatusStream:
+    """Create the status stream from settings."""
+    return StatusStream(
+        provider,
+        Broadcaster(
+            queue_size=settings.STATUS_STREAM_QUEUE_SIZE,
+            max_subscribers=settings.STATUS_STREAM_MAX_SUBSCRIBERS,
+        ),
+        interval=settings.STATUS_STREAM_INTERVAL_SECONDS,
+        heartbeat=settings.STATUS_STREAM_HEARTBEAT_SECONDS,
+    )
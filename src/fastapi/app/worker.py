@@ -0,0 +1,58 @@
+"""Standalone background job worker.
+
+Runs the job workers configured by ``JOB_QUEUES`` outside the web process::
+
+    python -m app.worker [--queue default --queue emails]
+"""
+
+import argparse
+import asyncio
+import signal
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.jobs import connect_job_queue, create_workers, job_queue
+
+
+async def run(queues: list[str] | None = None) -> None:
+    """Run workers until SIGINT or SIGTERM."""
+    await connect_job_queue()
+    workers = [
+        worker
+        for worker in create_workers(job_queue)
+        if not queues or worker.queue in queues
+    ]
+    if not workers:
+        raise SystemExit("No configured queues match the requested queues")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    for worker in workers:
+        worker.start()
+    await stop.wait()
+
+    logger.info("Stopping job workers")
+    await asyncio.gather(
+        *(worker.stop(settings.DRAIN_TIMEOUT_SECONDS) for worker in workers)
+    )
+    await job_queue.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments and run the workers."""
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument(
+        "--queue",
+        action="append",
+        help="Queue to work (repeatable, defaults to all of JOB_QUEUES)",
+    )
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.queue))
+
+
+if __name__ == "__main__":
+    main()
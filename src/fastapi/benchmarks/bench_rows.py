@@ -0,0 +1,102 @@
+"""Compare full model instances with compact rows for bulk results.
+
+Materializes 100k rows from tuples, as a database cursor returns them, once
+as validated ``BaseDBModel`` instances and once as generated slotted rows.
+Reports build time, retained memory (tracemalloc) and the cost of turning
+the whole result into JSON at the edge::
+
+    python -m benchmarks.bench_rows --rows 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from app.core.responses import TrustedJSONResponse
+from app.models.base import BaseDBModel
+from app.models.rows import row_type, rows_from_tuples, to_schema
+
+
+class Item(BaseDBModel):
+    """A representative table model."""
+
+    name: str
+    owner_id: int
+    price: float
+    active: bool
+
+
+def records(count: int) -> list[tuple[Any, ...]]:
+    """Tuples in field order, as returned by a cursor."""
+    now = datetime.utcnow()
+    return [(n, now, None, f"item-{n}", n % 100, n * 0.5, True) for n in range(count)]
+
+
+def measure(build: Callable[[], list[Any]]) -> tuple[list[Any], float, float]:
+    """Build a result and return it with its build time (ms) and size (MiB).
+
+    Time and memory are taken on separate builds since tracing allocations
+    slows the build down.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    result = build()
+    elapsed = (time.perf_counter() - started) * 1000
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size / 2**20
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Wall time of ``func`` in milliseconds."""
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = records(args.rows)
+    fields = list(Item.model_fields)
+    row_type(Item)  # Generate the row type outside the timed region
+
+    models, model_ms, model_mib = measure(
+        lambda: [Item(**dict(zip(fields, record, strict=True))) for record in data]
+    )
+    rows, row_ms, row_mib = measure(lambda: rows_from_tuples(Item, data))
+
+    model_json = timed(lambda: TrustedJSONResponse(models))
+    row_json = timed(lambda: TrustedJSONResponse(rows))
+    page_schema = timed(lambda: to_schema(rows[:100], Item))
+
+    print(f"{args.rows} rows")
+    print(f"{'':<18}{'models':>10}{'rows':>10}{'ratio':>8}")
+    print(
+        f"{'build (ms)':<18}{model_ms:>10.1f}{row_ms:>10.1f}{model_ms / row_ms:>7.1f}x"
+    )
+    print(
+        f"{'memory (MiB)':<18}{model_mib:>10.1f}{row_mib:>10.1f}"
+        f"{model_mib / row_mib:>7.1f}x"
+    )
+    print(
+        f"{'to JSON (ms)':<18}{model_json:>10.1f}{row_json:>10.1f}"
+        f"{model_json / row_json:>7.1f}x"
+    )
+    print(f"100-row page converted to the API schema: {page_schema:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
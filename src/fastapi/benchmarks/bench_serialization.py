@@ -0,0 +1,147 @@
+"""Compare FastAPI's response_model path with the trusted serializer fast path.
+
+Builds lists of 1k and 10k items, once as validated ``BaseResponse`` models
+returned through ``response_model`` and once as ``LeanResponse`` models returned
+in a ``TrustedJSONResponse``. "serialize" compares FastAPI's classic
+validate/dump/json.dumps path with the compiled serializer; "end-to-end"
+serves each list from an in-process app over an ASGI transport, where recent
+FastAPI versions already dump JSON directly::
+
+    python -m benchmarks.bench_serialization --repeat 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from app.core.responses import TrustedJSONResponse
+from app.schemas.base import BaseResponse, LeanResponse
+
+
+class Item(BaseResponse):
+    """Item schema on the existing validating base."""
+
+    id: int
+    name: str
+    price: float
+    tags: list[str]
+    created_at: datetime
+
+
+class LeanItem(LeanResponse):
+    """The same item schema on the lean base."""
+
+    id: int
+    name: str
+    price: float
+    tags: list[str]
+    created_at: datetime
+
+
+def rows(count: int) -> list[dict[str, Any]]:
+    """Raw rows as a service would produce them."""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": n,
+            "name": f"item-{n}",
+            "price": n * 1.5,
+            "tags": ["a", "b"],
+            "created_at": now,
+        }
+        for n in range(count)
+    ]
+
+
+def create_bench_app(data: list[dict[str, Any]]) -> FastAPI:
+    """App serving the same data through both paths."""
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[Item])
+    async def default() -> list[Item]:
+        return [Item(**row) for row in data]
+
+    @app.get("/trusted", response_model=list[LeanItem])
+    async def trusted() -> TrustedJSONResponse:
+        return TrustedJSONResponse([LeanItem(**row) for row in data])
+
+    return app
+
+
+def default_serialize(field: Any, content: Any) -> JSONResponse:
+    """FastAPI's classic path: validate, dump to Python, then json.dumps."""
+    value, errors = field.validate(content, {}, loc=("response",))
+    assert not errors
+    return JSONResponse(field.serialize(value, by_alias=True))
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def request_ms(client: httpx.AsyncClient, path: str, repeat: int) -> float:
+    """Median end-to-end request time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def bench(count: int, repeat: int) -> None:
+    """Benchmark one list size."""
+    data = rows(count)
+    validated = [Item(**row) for row in data]
+    trusted = [LeanItem(**row) for row in data]
+    field = create_model_field(name="Response", type_=list[Item], mode="serialization")
+
+    build_default = best_of(repeat, lambda: [Item(**row) for row in data])
+    build_trusted = best_of(repeat, lambda: [LeanItem(**row) for row in data])
+    dump_default = best_of(repeat, lambda: default_serialize(field, validated))
+    dump_trusted = best_of(repeat, lambda: TrustedJSONResponse(trusted))
+
+    transport = httpx.ASGITransport(app=create_bench_app(data))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        e2e_default = await request_ms(c, "/default", repeat)
+        e2e_trusted = await request_ms(c, "/trusted", repeat)
+
+    print(f"\n{count} items (median ms)")
+    print(f"{'':<14}{'default':>10}{'trusted':>10}{'speedup':>10}")
+    for label, default, fast in (
+        ("build", build_default, build_trusted),
+        ("serialize", dump_default, dump_trusted),
+        ("end-to-end", e2e_default, e2e_trusted),
+    ):
+        print(f"{label:<14}{default:>10.2f}{fast:>10.2f}{default / fast:>9.1f}x")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        asyncio.run(bench(count, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
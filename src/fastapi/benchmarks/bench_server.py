@@ -0,0 +1,135 @@
+"""Compare a default uvicorn process with the tuned server entry point.
+
+Starts each configuration on a free local port, drives ``/health`` with a
+fixed number of concurrent keep-alive clients and reports throughput and
+latency percentiles::
+
+    python -m benchmarks.bench_server --duration 10 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def configurations(port: int, workers: int | None) -> dict[str, list[str]]:
+    """Commands for the configurations under comparison."""
+    default = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--loop",
+        "asyncio",
+        "--http",
+        "h11",
+    ]
+    tuned = [sys.executable, "-m", "app.server"]
+    if workers:
+        tuned += ["--workers", str(workers)]
+    return {"default": default, "tuned": tuned}
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    """Wait for the server to answer health checks."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+async def drive(url: str, duration: float, concurrency: int) -> list[float]:
+    """Issue requests from concurrent clients and collect latencies."""
+    latencies: list[float] = []
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+
+        async def worker() -> None:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def summarize(name: str, latencies: list[float], duration: float) -> str:
+    """Format throughput and latency percentiles."""
+    ordered = sorted(latencies)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return (
+        f"{name:>8}: {len(ordered) / duration:9.1f} req/s  "
+        f"p50 {pct(0.5):7.2f} ms  p99 {pct(0.99):7.2f} ms"
+    )
+
+
+async def run(
+    name: str, command: list[str], port: int, args: argparse.Namespace
+) -> str:
+    """Benchmark a single configuration."""
+    env = {
+        **os.environ,
+        "ENVIRONMENT": "production",
+        "SECRET_KEY": "benchmark-secret-key",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+    }
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/health"
+    try:
+        await wait_ready(url)
+        await drive(url, 1.0, args.concurrency)  # Warm up
+        latencies = await drive(url, args.duration, args.concurrency)
+        return summarize(name, latencies, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main() -> None:
+    """Run all configurations and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, help="Worker count for tuned run")
+    args = parser.parse_args()
+
+    for name in ("default", "tuned"):
+        port = free_port()
+        command = configurations(port, args.workers)[name]
+        print(await run(name, command, port, args))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
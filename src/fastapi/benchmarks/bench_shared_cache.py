@@ -0,0 +1,160 @@
+"""Compare the shared-memory cache with per-process dicts and a local Redis.
+
+Forks ``--workers`` processes that each look up ``--ops`` keys drawn from a
+skewed key space of ``--keys`` JSON values, computing and storing a value on
+every miss, like workers warming a lookup cache:
+
+* dict: a dict per process, so every worker misses on every key once and
+  holds its own copy
+* shared: ``SharedCache``, one mapped file for all workers
+* redis: a Redis server at ``--redis-url``, when the ``redis`` package is
+  installed and the server is reachable
+
+::
+
+    python -m benchmarks.bench_shared_cache --workers 4 --ops 50000 --keys 2000
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.core.shared_cache import SharedCache
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional
+    redis = None
+
+# A lookup and a store; what the store returns is ignored
+Backend = tuple[Callable[[str], Any], Callable[[str, Any], object]]
+
+
+def value_for(key: str) -> dict[str, Any]:
+    """The value cached for a key, standing in for a lookup result."""
+    return {"key": key, "flags": ["beta", "dark-mode"], "limit": len(key) * 10}
+
+
+def dict_backend(_: argparse.Namespace) -> Backend:
+    """A cache private to the worker."""
+    cache: dict[str, Any] = {}
+    return cache.get, cache.__setitem__
+
+
+def shared_backend(args: argparse.Namespace) -> Backend:
+    """The shared-memory cache, mapped by every worker."""
+    cache = SharedCache(args.path, slots=args.slots, slot_bytes=256)
+    cache.open()
+    return cache.get, cache.set
+
+
+def redis_backend(args: argparse.Namespace) -> Backend:
+    """A Redis server over a local connection."""
+    client = redis.Redis.from_url(args.redis_url)
+
+    def get(key: str) -> Any:
+        value = client.get(key)
+        return None if value is None else json.loads(value)
+
+    def set_value(key: str, value: Any) -> None:
+        client.set(key, json.dumps(value, separators=(",", ":")))
+
+    return get, set_value
+
+
+BACKENDS = {"dict": dict_backend, "shared": shared_backend, "redis": redis_backend}
+
+
+def worker(name: str, args: argparse.Namespace, seed: int, results: Any) -> None:
+    """Run the lookups in one process and report misses and latencies."""
+    get, set_value = BACKENDS[name](args)
+    rng = random.Random(seed)
+    # Skewed like real lookups: a few hot keys, a long tail
+    keys = [
+        f"lookup:{int(rng.paretovariate(1.2)) % args.keys}" for _ in range(args.ops)
+    ]
+    latencies: list[float] = []
+    misses = 0
+    started = time.perf_counter()
+    for key in keys:
+        t = time.perf_counter()
+        if get(key) is None:
+            misses += 1
+            set_value(key, value_for(key))
+        latencies.append(time.perf_counter() - t)
+    results.put((time.perf_counter() - started, misses, statistics.median(latencies)))
+
+
+def run(name: str, args: argparse.Namespace) -> tuple[float, int, float]:
+    """Run every worker for a backend and return ops/s, misses and p50 (us)."""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(name, args, n, results))
+        for n in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    slowest = max(elapsed for elapsed, _, _ in reports)
+    return (
+        args.workers * args.ops / slowest,
+        sum(misses for _, misses, _ in reports),
+        statistics.median(p50 for _, _, p50 in reports) * 1e6,
+    )
+
+
+def redis_available(url: str) -> bool:
+    """Whether a Redis server answers at ``url``."""
+    if redis is None:
+        return False
+    try:
+        client = redis.Redis.from_url(url, socket_connect_timeout=0.5)
+        client.flushdb()
+        return True
+    except redis.RedisError:
+        return False
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--slots", type=int, default=8192)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    args = parser.parse_args()
+
+    names = ["dict", "shared"]
+    if redis_available(args.redis_url):
+        names.append("redis")
+    else:
+        print(f"Skipping redis: no server at {args.redis_url} or package missing")
+
+    entry_bytes = len(json.dumps(value_for("lookup:0000")))
+    print(f"{args.workers} workers x {args.ops} lookups over {args.keys} keys")
+    print(f"{'':<8}{'ops/s':>12}{'misses':>9}{'get p50 us':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        args.path = Path(tmp) / "bench.mmap"
+        for name in names:
+            ops, misses, p50 = run(name, args)
+            print(f"{name:<8}{ops:>12.0f}{misses:>9}{p50:>12.2f}")
+        size = SharedCache(args.path, slots=args.slots, slot_bytes=256).size
+    print(
+        f"Value copies: dict keeps one per worker (~{entry_bytes} B each), "
+        f"shared keeps one in a {size / 2**20:.1f} MiB file"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Compare the tuned SQLite backend with a naive SQLite configuration.
+
+Runs the same concurrent read/write mix against two fresh database files:
+
+* naive: a new connection per session with SQLite's defaults (rollback
+  journal, ``synchronous=FULL``, no mmap), run through ``asyncio.to_thread``
+* tuned: ``SQLiteDatabase`` with WAL, ``synchronous=NORMAL``, mmap, one
+  writer thread, reader connections and cached statements
+
+Each client performs ``--ops`` operations; a fraction ``--writes`` of them
+are single-row update transactions, the rest are point and range reads::
+
+    python -m benchmarks.bench_sqlite --clients 32 --ops 200 --writes 0.1
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from app.db.sqlite import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE items (
+    id INTEGER PRIMARY KEY,
+    owner_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX idx_items_owner ON items (owner_id);
+"""
+
+POINT_READ = "SELECT id, name, price FROM items WHERE id = ?"
+RANGE_READ = "SELECT id, name, price FROM items WHERE owner_id = ? LIMIT 50"
+WRITE = "UPDATE items SET price = price + 1 WHERE id = ?"
+
+
+def seed(path: Path, rows: int) -> None:
+    """Create the schema and insert ``rows`` items."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO items (id, owner_id, name, price) VALUES (?, ?, ?, ?)",
+        ((n, n % 1000, f"item-{n}", n * 0.5) for n in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+class NaiveDatabase:
+    """A connection per session with SQLite's default settings."""
+
+    def __init__(self, path: Path):
+        """Initialize the database."""
+        self.path = path
+
+    def _transaction(self, statement: str, params: Any, write: bool) -> None:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute(statement, params).fetchall()
+            if write:
+                conn.commit()
+        finally:
+            conn.close()
+
+    async def run(self, statement: str, params: Any, write: bool) -> None:
+        """Run one statement in its own session."""
+        await asyncio.to_thread(self._transaction, statement, params, write)
+
+
+class TunedDatabase:
+    """Sessions on :class:`SQLiteDatabase`."""
+
+    def __init__(self, database: SQLiteDatabase):
+        """Initialize the database."""
+        self.database = database
+
+    async def run(self, statement: str, params: Any, write: bool) -> None:
+        """Run one statement in its own session."""
+        session = self.database.session()
+        try:
+            await session.execute(statement, params)
+            await session.commit()
+        finally:
+            await session.close()
+
+
+async def workload(
+    run: Callable[[str, Any, bool], Awaitable[None]],
+    clients: int,
+    ops: int,
+    writes: float,
+    rows: int,
+) -> tuple[float, list[float], list[float]]:
+    """Run the mix and return wall time and read/write latencies (ms)."""
+    read_latencies: list[float] = []
+    write_latencies: list[float] = []
+
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(ops):
+            write = rng.random() < writes
+            if write:
+                statement, params = WRITE, (rng.randrange(rows),)
+            elif rng.random() < 0.5:
+                statement, params = POINT_READ, (rng.randrange(rows),)
+            else:
+                statement, params = RANGE_READ, (rng.randrange(1000),)
+            started = time.perf_counter()
+            await run(statement, params, write)
+            elapsed = (time.perf_counter() - started) * 1000
+            (write_latencies if write else read_latencies).append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return time.perf_counter() - started, read_latencies, write_latencies
+
+
+def p99(latencies: list[float]) -> float:
+    """99th percentile latency."""
+    return statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else 0.0
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Seed both databases, run the mix against each and print results."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        naive_path = Path(tmp) / "naive.db"
+        tuned_path = Path(tmp) / "tuned.db"
+        seed(naive_path, args.rows)
+        seed(tuned_path, args.rows)
+
+        naive = NaiveDatabase(naive_path)
+        results["naive"] = await workload(
+            naive.run, args.clients, args.ops, args.writes, args.rows
+        )
+
+        database = SQLiteDatabase(str(tuned_path), readers=args.readers)
+        await database.connect()
+        try:
+            tuned = TunedDatabase(database)
+            results["tuned"] = await workload(
+                tuned.run, args.clients, args.ops, args.writes, args.rows
+            )
+        finally:
+            await database.close()
+
+    total = args.clients * args.ops
+    print(
+        f"{args.clients} clients x {args.ops} ops, {args.writes:.0%} writes, "
+        f"{args.rows} rows"
+    )
+    print(
+        f"{'':<8}{'ops/s':>10}{'read p50':>10}{'read p99':>10}"
+        f"{'write p50':>11}{'write p99':>11}"
+    )
+    for name, (elapsed, reads, writes) in results.items():
+        print(
+            f"{name:<8}{total / elapsed:>10.0f}"
+            f"{statistics.median(reads):>10.2f}{p99(reads):>10.2f}"
+            f"{statistics.median(writes) if writes else 0:>11.2f}{p99(writes):>11.2f}"
+        )
+    speedup = results["naive"][0] / results["tuned"][0]
+    print(f"Tuned throughput: {speedup:.1f}x naive (latencies in ms)")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--writes", type=float, default=0.1)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=4)
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Shared test fixtures."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from app.db.sqlite import SQLiteDatabase, SQLiteSession
+
+
+@pytest.fixture
+async def sqlite_database(tmp_path, monkeypatch):
+    """Open an empty SQLite database and serve ``get_db`` sessions from it."""
+    database = SQLiteDatabase(str(tmp_path / "app.db"), readers=1)
+    await database.connect()
+    monkeypatch.setattr("app.db.session.sqlite_database", database)
+    yield database
+    await database.close()
+
+
+@pytest.fixture
+def statements(monkeypatch) -> list[str]:
+    """Record the statements executed through SQLite sessions."""
+    recorded: list[str] = []
+    execute = SQLiteSession.execute
+
+    async def recording_execute(self, statement: str, params: Any = None):
+        recorded.append(statement)
+        return await execute(self, statement, params)
+
+    monkeypatch.setattr(SQLiteSession, "execute", recording_execute)
+    return recorded
+
+
+@pytest.fixture
+def write(sqlite_database) -> Callable[..., Awaitable[None]]:
+    """Run one statement in its own transaction on the test database."""
+
+    async def write(statement: str, params: Any = ()) -> None:
+        await sqlite_database.begin(statement, params)
+        await sqlite_database.end(commit=True)
+
+    return write
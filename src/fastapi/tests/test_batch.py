@@ -0,0 +1,118 @@
+"""Test the batch request endpoint."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_batch_returns_results_in_order():
+    """Test that sub-requests run in-process and keep their status codes."""
+    response = client.post(
+        "/api/v1/batch",
+        json={
+            "requests": [
+                {"id": "health", "path": "/health"},
+                {"id": "ready", "path": "/ready"},
+                {"id": "env", "path": "/config/environment"},
+                {"id": "missing", "path": "/does-not-exist"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [r["id"] for r in results] == ["health", "ready", "env", "missing"]
+    assert [r["status"] for r in results] == [200, 200, 200, 404]
+    assert results[0]["body"]["status"] == "healthy"
+    assert results[2]["body"]["environment"]
+    # Sub-requests go to the router, not back through the middleware stack
+    assert "server-timing" not in results[0]["headers"]
+
+
+def test_batch_streams_ndjson():
+    """Test that results can be streamed one JSON line per item."""
+    response = client.post(
+        "/api/v1/batch?stream=true",
+        json={
+            "requests": [
+                {"id": "live", "path": "/live"},
+                {"id": "features", "path": "/config/features"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {line["id"] for line in lines} == {"live", "features"}
+    assert all(line["status"] == 200 for line in lines)
+
+
+def test_failed_dependency_short_circuits():
+    """Test that items depending on a failed item are not dispatched."""
+    response = client.post(
+        "/api/v1/batch",
+        json={
+            "requests": [
+                {"id": "a", "path": "/nope"},
+                {"id": "b", "path": "/health", "depends_on": ["a"]},
+            ]
+        },
+    )
+    results = response.json()["results"]
+    assert results[1]["status"] == 424
+
+
+def test_nested_batches_rejected():
+    """Test that a batch cannot dispatch another batch."""
+    response = client.post(
+        "/api/v1/batch",
+        json={"requests": [{"id": "x", "method": "POST", "path": "/api/v1/batch"}]},
+    )
+    assert response.json()["results"][0]["status"] == 400
+
+
+def test_streaming_endpoints_rejected():
+    """Test that an endpoint whose response never ends is not dispatched."""
+    response = client.post(
+        "/api/v1/batch",
+        json={
+            "requests": [
+                {"id": "stream", "path": "/status/stream"},
+                {"id": "live", "path": "/live"},
+            ]
+        },
+    )
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [400, 200]
+    assert results[0]["body"] == {"detail": "Streaming endpoints cannot be batched"}
+
+
+def test_batch_size_cap(monkeypatch):
+    """Test that oversized batches are rejected."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 2)
+    response = client.post(
+        "/api/v1/batch",
+        json={"requests": [{"id": str(n), "path": "/health"} for n in range(3)]},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "requests",
+    [
+        [{"id": "a", "path": "/health"}, {"id": "a", "path": "/live"}],
+        [{"id": "a", "path": "/health", "depends_on": ["b"]}],
+    ],
+)
+def test_invalid_ids_rejected(requests):
+    """Test that duplicate IDs and forward dependencies are rejected."""
+    response = client.post("/api/v1/batch", json={"requests": requests})
+    assert response.status_code == 400
@@ -47,6 +47,21 @@ def test_production_validation():
     with pytest.raises(ValueError, match="SECRET_KEY must be changed"):
         Settings(ENVIRONMENT=Environment.PRODUCTION, SECRET_KEY="your-secret-key-here")
 
+    # Only an explicit single worker is warned about
+    from loguru import logger
+
+    warnings: list[str] = []
+    sink = logger.add(lambda message: warnings.append(str(message)), level="WARNING")
+    try:
+        Settings(ENVIRONMENT=Environment.PRODUCTION, SECRET_KEY="production-key")
+        assert not any("multiple workers" in message for message in warnings)
+        Settings(
+            ENVIRONMENT=Environment.PRODUCTION, SECRET_KEY="production-key", WORKERS=1
+        )
+        assert any("multiple workers" in message for message in warnings)
+    finally:
+        logger.remove(sink)
+
 
 def test_cors_origins_parsing():
     """Test CORS origins parsing from different formats."""
@@ -202,6 +217,33 @@ def test_feature_flags_endpoint():
     assert "opentelemetry" in data
 
 
+async def test_feature_flags_are_shared_between_workers(tmp_path, monkeypatch):
+    """Test that workers serve one flag snapshot from the shared cache."""
+    from app.api import config
+    from app.core.config import settings
+    from app.core.shared_cache import SharedCache
+
+    worker = SharedCache(tmp_path / "cache.mmap", slots=16)
+    peer = SharedCache(tmp_path / "cache.mmap", slots=16)
+    worker.open()
+    peer.open()
+    monkeypatch.setattr(config, "shared_cache", worker)
+    try:
+        assert await config.get_feature_flags() == config.feature_flags(settings)
+        assert peer.get(config.FEATURE_FLAGS_KEY) == config.feature_flags(settings)
+
+        # A reload in another worker replaces the snapshot everyone serves
+        metrics = not settings.FEATURE_METRICS
+        reloaded = settings.model_copy(update={"FEATURE_METRICS": metrics})
+        monkeypatch.setattr(config, "shared_cache", peer)
+        config.publish_feature_flags(reloaded, {"FEATURE_METRICS"})
+        monkeypatch.setattr(config, "shared_cache", worker)
+        assert (await config.get_feature_flags())["metrics"] is metrics
+    finally:
+        await worker.close()
+        await peer.close()
+
+
 def test_env_file_loading():
     """Test loading configuration from environment variables."""
     # Set environment variables
@@ -0,0 +1,167 @@
+"""Test request deadlines and cancellation on client disconnect."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.deadlines import Deadline, DeadlineExceeded, budget, deadline
+from app.middleware.deadline import DeadlineMiddleware
+
+
+def create_slow_app(events: list[str], **options) -> FastAPI:
+    """Create an app with slow routes behind the deadline middleware."""
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow(seconds: float = 1.0):
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return {"ok": True}
+
+    @app.get("/tight", dependencies=[Depends(deadline(0.05))])
+    async def tight():
+        await asyncio.sleep(1)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(3):
+                await asyncio.sleep(0.05)
+                yield b"%d" % n
+
+        return StreamingResponse(chunks())
+
+    app.add_middleware(DeadlineMiddleware, **options)
+    return app
+
+
+def test_deadline_cancels_handler_with_504():
+    """Test that a handler past its deadline is cancelled and answered with 504."""
+    events: list[str] = []
+    client = TestClient(create_slow_app(events, default=0.05))
+
+    started = time.perf_counter()
+    response = client.get("/slow")
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+    assert time.perf_counter() - started < 0.5
+    assert events == ["cancelled"]
+
+
+def test_route_deadlines():
+    """Test per-route deadlines from prefixes and from a route dependency."""
+    events: list[str] = []
+    client = TestClient(create_slow_app(events, default=0, routes={"/slow": 0.5}))
+
+    assert client.get("/slow?seconds=0.01").status_code == 200
+    assert client.get("/slow?seconds=2").status_code == 504
+    assert client.get("/tight").status_code == 504
+
+
+def test_started_stream_is_not_cut_off():
+    """Test that the deadline only bounds the time to the response headers."""
+    client = TestClient(create_slow_app([], default=0.08))
+    response = client.get("/stream")
+    assert response.status_code == 200
+    assert response.content == b"012"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_handler():
+    """Test that a client disconnect cancels the running handler."""
+    events: list[str] = []
+    app = create_slow_app(events, default=0)
+    sent = []
+
+    async def receive():
+        if not sent:
+            sent.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/slow",
+        "raw_path": b"/slow",
+        "query_string": b"seconds=5",
+        "root_path": "",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+    started = time.perf_counter()
+    await app(scope, receive, send)
+
+    assert time.perf_counter() - started < 1
+    assert events == ["cancelled"]
+    assert sent == [True]  # No response for a client that is gone
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_downstream_timeouts():
+    """Test that downstream timeouts are capped at the remaining time."""
+    from app.core.deadlines import reset_deadline, set_deadline
+    from app.services.external_api import ExternalAPIClient
+
+    assert budget(10) == 10
+
+    token = set_deadline(Deadline.after(0.5))
+    try:
+        assert 0.4 < budget(10) <= 0.5
+        assert budget(0.1) == 0.1
+
+        client = ExternalAPIClient("http://upstream", timeout=10, connect_timeout=3)
+        timeout = client._attempt_timeout()
+        assert timeout is not None
+        assert timeout.read <= 0.5
+        assert timeout.connect <= 0.5
+    finally:
+        reset_deadline(token)
+
+    token = set_deadline(Deadline.after(0.001))
+    try:
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            budget(10)
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_cancel_interrupts_sqlite_statement(tmp_path):
+    """Test that cancelling a query stops it inside SQLite."""
+    from app.db.sqlite import SQLiteDatabase
+
+    database = SQLiteDatabase(str(tmp_path / "test.db"), readers=1)
+    await database.connect()
+    endless = (
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+        "SELECT count(*) FROM n"
+    )
+    try:
+        session = database.session()
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(session.execute(endless), 0.1)
+
+        # The only reader thread is free again, so the statement was stopped
+        started = time.perf_counter()
+        rows = await asyncio.wait_for(session.execute("SELECT 1 AS ok"), 2)
+        assert rows[0]["ok"] == 1
+        assert time.perf_counter() - started < 1
+    finally:
+        await database.close()
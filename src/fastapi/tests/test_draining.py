@@ -0,0 +1,127 @@
+"""Test graceful connection draining on shutdown."""
+
+import asyncio
+import os
+import signal
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.asyncio
+async def test_shutdown_runs_phases_in_order():
+    """Test that hooks run after draining, ordered by phase."""
+    from app.core.lifecycle import Lifecycle, ShutdownPhase
+
+    state = Lifecycle()
+    calls = []
+
+    def hook(name):
+        async def run():
+            calls.append(name)
+
+        return run
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    state.on_shutdown(ShutdownPhase.CACHE, "redis", hook("redis"))
+    state.on_shutdown(ShutdownPhase.DATABASE, "database", hook("database"))
+    state.on_shutdown(ShutdownPhase.FLUSH, "broken", failing)
+    state.on_shutdown(ShutdownPhase.FLUSH, "queue", hook("queue"))
+
+    await state.shutdown(drain_timeout=1)
+
+    assert state.draining is True
+    assert state.accepting_traffic is False
+    assert calls == ["queue", "database", "redis"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_inflight_requests():
+    """Test that draining waits for requests up to the deadline."""
+    from app.core.lifecycle import Lifecycle
+
+    state = Lifecycle()
+    state.request_started()
+    assert await state.wait_for_idle(timeout=0.05, poll=0.01) is False
+
+    async def finish_later():
+        await asyncio.sleep(0.02)
+        state.request_finished()
+
+    task = asyncio.create_task(finish_later())
+    assert await state.wait_for_idle(timeout=1, poll=0.01) is True
+    await task
+
+
+def test_request_tracking_middleware():
+    """Test that requests are counted while in flight."""
+    from app.core.lifecycle import Lifecycle
+    from app.middleware.draining import RequestTrackingMiddleware
+
+    state = Lifecycle()
+    app = FastAPI()
+
+    @app.get("/inflight")
+    async def inflight() -> dict[str, int]:
+        return {"inflight": state.inflight}
+
+    app.add_middleware(RequestTrackingMiddleware, state=state)
+    client = TestClient(app)
+
+    assert client.get("/inflight").json() == {"inflight": 1}
+    assert state.inflight == 0
+
+
+def test_ready_reports_not_ready_while_draining(monkeypatch):
+    """Test that /ready fails as soon as draining starts."""
+    from app.core.lifecycle import lifecycle
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(lifecycle, "draining", True)
+
+    response = client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["checks"]["accepting_traffic"] is False
+
+
+def test_lifespan_drains_and_restarts(monkeypatch):
+    """Test that lifespan shutdown drains and startup accepts traffic again."""
+    from app.core.config import settings
+    from app.core.lifecycle import lifecycle
+    from app.main import app
+
+    # Restore the shared state once the test finishes
+    monkeypatch.setattr(lifecycle, "draining", False)
+    # Ready right away rather than after warm-up
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+
+    with TestClient(app) as client:
+        assert client.get("/ready").json()["checks"]["accepting_traffic"] is True
+    assert lifecycle.draining is True
+
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_sigterm_flips_readiness_before_server_handler():
+    """Test that SIGTERM marks draining and then calls the server's handler."""
+    from app.core.lifecycle import Lifecycle
+
+    state = Lifecycle()
+    received = asyncio.Event()
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: received.set())
+    try:
+        state.install_signal_handler(grace_period=0.01)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0)
+        assert state.draining is True
+        await asyncio.wait_for(received.wait(), timeout=1)
+    finally:
+        signal.signal(signal.SIGTERM, original)
@@ -0,0 +1,219 @@
+"""Test the external API client against a local stub server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve scripted responses and record requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        """Handle a GET request."""
+        server = self.server
+        server.requests.append((self.path, self.headers.get("Authorization")))
+        server.peers.add(self.client_address)
+        status, headers = server.responses.pop(0) if server.responses else (200, {})
+        body = json.dumps({"path": self.path, "n": len(server.requests)}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence request logging."""
+
+
+@pytest.fixture
+def stub_server():
+    """Run a stub upstream on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.peers = set()
+    server.responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs):
+    """Create a client pointed at the stub server."""
+    from app.services.external_api import ExternalAPIClient
+
+    host, port = server.server_address
+    return ExternalAPIClient(
+        base_url=f"http://{host}:{port}",
+        api_key="secret",
+        http2=False,
+        retry_backoff=0.001,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_pooled_connection(stub_server):
+    """Test that requests are authenticated and share keep-alive connections."""
+    client = make_client(stub_server)
+    client.start()
+    try:
+        for _ in range(3):
+            response = await client.get("/items")
+            assert response.status_code == 200
+    finally:
+        await client.close()
+
+    assert stub_server.requests[0] == ("/items", "Bearer secret")
+    assert len(stub_server.peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_upstream_errors(stub_server):
+    """Test that idempotent requests retry on 503."""
+    stub_server.responses = [(503, {}), (503, {})]
+    client = make_client(stub_server, retries=2)
+    client.start()
+    try:
+        response = await client.get("/flaky")
+    finally:
+        await client.close()
+
+    assert response.status_code == 200
+    assert len(stub_server.requests) == 3
+    assert client.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers(stub_server):
+    """Test that the circuit fails fast while down and closes after a trial."""
+    from app.core.circuit_breaker import CircuitBreaker, CircuitState
+    from app.services.external_api import CircuitOpenError
+
+    stub_server.responses = [(500, {}), (500, {})]
+    breaker = CircuitBreaker("stub", failure_threshold=2, reset_timeout=0.05)
+    client = make_client(stub_server, retries=0, breaker=breaker)
+    client.start()
+    try:
+        for _ in range(2):
+            assert (await client.get("/down")).status_code == 500
+        assert breaker.state == CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await client.get("/down")
+        assert len(stub_server.requests) == 2
+
+        breaker._opened_at -= 0.05
+        assert (await client.get("/down")).status_code == 200
+        assert breaker.state == CircuitState.CLOSED
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_hold_the_circuit(stub_server, monkeypatch):
+    """Test that a half-open trial ending without an outcome frees the trial."""
+    import asyncio
+
+    from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+    breaker = CircuitBreaker("stub", failure_threshold=1, reset_timeout=0.05)
+    client = make_client(stub_server, retries=0, breaker=breaker)
+    client.start()
+    try:
+        breaker.record_failure()
+        breaker._opened_at -= 0.05
+        assert breaker.state == CircuitState.HALF_OPEN
+
+        async def cancelled(request):
+            raise asyncio.CancelledError
+
+        with monkeypatch.context() as patch:
+            patch.setattr(client, "_send", cancelled)
+            with pytest.raises(asyncio.CancelledError):
+                await client.get("/slow")
+        assert breaker.state == CircuitState.HALF_OPEN
+
+        assert (await client.get("/slow")).status_code == 200
+        assert breaker.state == CircuitState.CLOSED
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_upstream_counts_as_failure():
+    """Test that connection errors raise and trip the breaker."""
+    from app.core.circuit_breaker import CircuitBreaker
+    from app.services.external_api import ExternalAPIClient, ExternalAPIError
+
+    client = ExternalAPIClient(
+        base_url="http://127.0.0.1:1",
+        http2=False,
+        retries=0,
+        breaker=CircuitBreaker("down", failure_threshold=1),
+    )
+    client.start()
+    try:
+        with pytest.raises(ExternalAPIError):
+            await client.get("/")
+    finally:
+        await client.close()
+    assert client.breaker.state.value == "open"
+
+
+@pytest.mark.asyncio
+async def test_cache_honors_cache_control(stub_server):
+    """Test that GET responses are cached only when the upstream allows it."""
+    from app.services.external_api import ResponseCache
+
+    stub_server.responses = [
+        (200, {"Cache-Control": "public, max-age=60"}),
+        (200, {"Cache-Control": "no-store"}),
+        (200, {"Cache-Control": "no-store"}),
+    ]
+    client = make_client(stub_server, cache=ResponseCache())
+    client.start()
+    try:
+        first = await client.get("/cached")
+        second = await client.get("/cached")
+        assert first.json() == second.json()
+        assert len(stub_server.requests) == 1
+
+        await client.get("/uncached")
+        await client.get("/uncached")
+        assert len(stub_server.requests) == 3
+    finally:
+        await client.close()
+
+
+def test_cache_ttl_from_headers():
+    """Test TTL derivation from Cache-Control and Age."""
+    import httpx
+
+    from app.services.external_api import cache_ttl
+
+    def ttl(**headers):
+        return cache_ttl(httpx.Response(200, headers=headers))
+
+    assert ttl(**{"cache-control": "max-age=60"}) == 60
+    assert ttl(**{"cache-control": "max-age=60, s-maxage=10"}) == 10
+    assert ttl(**{"cache-control": "max-age=60", "age": "50"}) == 10
+    assert ttl(**{"cache-control": "private, max-age=60"}) is None
+    assert ttl(**{"cache-control": "max-age=0"}) is None
+    assert ttl() is None
+
+
+@pytest.mark.asyncio
+async def test_request_requires_started_client():
+    """Test that requests fail before lifespan starts the client."""
+    from app.services.external_api import ExternalAPIClient
+
+    with pytest.raises(RuntimeError, match="not started"):
+        await ExternalAPIClient(base_url="http://example.com").get("/")
@@ -0,0 +1,192 @@
+"""Test Idempotency-Key handling for mutating requests."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.services.idempotency import IdempotencyStore, KeyState, StoredResponse
+
+
+@pytest.fixture
+async def store(sqlite_database):
+    """Create a store on a fresh SQLite database."""
+    store = IdempotencyStore()
+    await store.setup()
+    return store
+
+
+def create_app(store: IdempotencyStore, **options) -> tuple[FastAPI, dict]:
+    """Create an app with a counting POST route behind the middleware."""
+    app = FastAPI()
+    state = {"calls": 0, "gate": None, "fail": 0}
+
+    @app.post("/api/v1/orders")
+    async def create_order(order: dict):
+        state["calls"] += 1
+        if state["gate"] is not None:
+            await state["gate"].wait()
+        if state["fail"]:
+            state["fail"] -= 1
+            raise HTTPException(status_code=503, detail="try again")
+        return {"order": order, "number": state["calls"]}
+
+    app.add_middleware(IdempotencyMiddleware, store=store, prefix="/api/v1", **options)
+    return app, state
+
+
+def create_batch_app(store: IdempotencyStore) -> tuple[FastAPI, dict]:
+    """Create :func:`create_app` with the batch endpoint mounted."""
+    from app.api.v1 import batch
+
+    app, state = create_app(store)
+    app.include_router(batch.router, prefix="/api/v1/batch")
+    return app, state
+
+
+def client(app: FastAPI) -> AsyncClient:
+    """Create a client for ``app``."""
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_retry_is_replayed(store):
+    """Test that a repeated request gets the stored response without running."""
+    app, state = create_app(store)
+    headers = {"Idempotency-Key": "k1"}
+    async with client(app) as c:
+        first = await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        second = await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        other = await c.post(
+            "/api/v1/orders",
+            json={"sku": 1},
+            headers={
+                "Idempotency-Key": "k1",
+                "Authorization": "Bearer other",
+            },
+        )
+        unkeyed = await c.post("/api/v1/orders", json={"sku": 1})
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json() == {"order": {"sku": 1}, "number": 1}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.headers["content-type"] == "application/json"
+    assert "idempotent-replayed" not in first.headers
+    # Keys are scoped per Authorization header, and unkeyed requests always run
+    assert other.json()["number"] == 2
+    assert unkeyed.json()["number"] == 3
+
+
+async def test_key_reused_for_different_request(store):
+    """Test that a key sent with a different body is rejected."""
+    app, state = create_app(store)
+    headers = {"Idempotency-Key": "k1"}
+    async with client(app) as c:
+        await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        response = await c.post("/api/v1/orders", json={"sku": 2}, headers=headers)
+        too_long = await c.post(
+            "/api/v1/orders", json={}, headers={"Idempotency-Key": "k" * 256}
+        )
+    assert response.status_code == 422
+    assert too_long.status_code == 400
+    assert state["calls"] == 1
+
+
+async def test_batch_sub_requests_do_not_inherit_the_key(store):
+    """Test that a keyed batch runs its mutating items once and replays whole."""
+    app, state = create_batch_app(store)
+    batch = {
+        "requests": [
+            {"id": "a", "method": "POST", "path": "/api/v1/orders", "body": {"n": 1}},
+            {
+                "id": "b",
+                "method": "POST",
+                "path": "/api/v1/orders",
+                "body": {"n": 2},
+                "headers": {"Idempotency-Key": "item-b"},
+            },
+        ]
+    }
+    headers = {"Idempotency-Key": "batch-1"}
+    async with client(app) as c:
+        first = await c.post("/api/v1/batch", json=batch, headers=headers)
+        second = await c.post("/api/v1/batch", json=batch, headers=headers)
+
+    assert first.status_code == 200
+    assert [r["status"] for r in first.json()["results"]] == [200, 200]
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert state["calls"] == 2
+
+
+async def test_concurrent_duplicates_wait_for_the_first(store):
+    """Test that duplicates in flight wait and share the first response."""
+    app, state = create_app(store)
+    state["gate"] = asyncio.Event()
+    headers = {"Idempotency-Key": "k1"}
+    async with client(app) as c:
+        requests = [
+            asyncio.create_task(
+                c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.1)
+        assert state["calls"] == 1
+        state["gate"].set()
+        responses = await asyncio.gather(*requests)
+
+    assert state["calls"] == 1
+    assert {r.json()["number"] for r in responses} == {1}
+    assert sum("idempotent-replayed" in r.headers for r in responses) == 2
+
+
+async def test_duplicate_gives_up_after_wait_timeout(store):
+    """Test that a duplicate gets a 409 once the first runs past the wait."""
+    app, state = create_app(store, wait_timeout=0.1)
+    state["gate"] = asyncio.Event()
+    headers = {"Idempotency-Key": "k1"}
+    async with client(app) as c:
+        first = asyncio.create_task(
+            c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        )
+        await asyncio.sleep(0.05)
+        duplicate = await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        state["gate"].set()
+        await first
+
+    assert duplicate.status_code == 409
+    assert duplicate.headers["retry-after"] == "1"
+
+
+async def test_server_errors_are_not_stored(store):
+    """Test that a retry after a 5xx runs the request again."""
+    app, state = create_app(store)
+    state["fail"] = 1
+    headers = {"Idempotency-Key": "k1"}
+    async with client(app) as c:
+        failed = await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+        retried = await c.post("/api/v1/orders", json={"sku": 1}, headers=headers)
+    assert failed.status_code == 503
+    assert retried.status_code == 200
+    assert state["calls"] == 2
+
+
+async def test_abandoned_and_expired_keys_are_taken_over(store):
+    """Test that locks and stored responses lapse after their timeouts."""
+    assert (await store.begin("k", "f"))[0] is KeyState.ACQUIRED
+    assert (await store.begin("k", "f"))[0] is KeyState.IN_PROGRESS
+
+    store.lock_timeout = 0
+    assert (await store.begin("k2", "f"))[0] is KeyState.ACQUIRED
+    assert (await store.begin("k2", "f"))[0] is KeyState.ACQUIRED
+
+    await store.complete("k2", "f", StoredResponse(201, [(b"x-a", b"1")], b"{}"))
+    state, stored = await store.begin("k2", "f")
+    assert state is KeyState.COMPLETED
+    assert stored == StoredResponse(201, [(b"x-a", b"1")], b"{}")
+
+    store.ttl = 0
+    await store.complete("k2", "f", stored)
+    assert (await store.begin("k2", "f"))[0] is KeyState.ACQUIRED
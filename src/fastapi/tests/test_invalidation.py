@@ -0,0 +1,275 @@
+"""Tests for the cross-worker cache invalidation bus."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.core.invalidation import (
+    InvalidationBus,
+    PostgresTransport,
+    RedisTransport,
+    create_invalidation_transport,
+    decode_payload,
+    encode_payloads,
+)
+from app.schemas.item_search import ItemSearchResults
+from app.services.base import BaseService
+from app.services.item_search import ItemSearchService
+
+
+class FakeHub:
+    """An in-memory channel shared by fake transports."""
+
+    def __init__(self):
+        """Initialize the hub."""
+        self.listeners = []
+        self.payloads = []
+
+
+class FakeTransport:
+    """Transport delivering payloads through a :class:`FakeHub`."""
+
+    def __init__(self, hub: FakeHub):
+        """Initialize the transport."""
+        self.hub = hub
+        self.fail_publish = False
+        self.refuse_connect = False
+        self.connects = 0
+        self._lost = asyncio.Event()
+
+    async def listen(self, on_connect, on_message):
+        """Deliver hub payloads until :meth:`drop` is called."""
+        if self.refuse_connect:
+            raise ConnectionError("refused")
+        self._lost = asyncio.Event()
+        self.hub.listeners.append(on_message)
+        self.connects += 1
+        try:
+            on_connect()
+            await self._lost.wait()
+            raise ConnectionError("dropped")
+        finally:
+            self.hub.listeners.remove(on_message)
+
+    async def publish(self, payload: str) -> None:
+        """Send a payload to every listener, including the sender."""
+        if self.fail_publish:
+            raise ConnectionError("publish failed")
+        self.hub.payloads.append(payload)
+        for on_message in list(self.hub.listeners):
+            on_message(payload)
+
+    def drop(self) -> None:
+        """Simulate a lost connection."""
+        self._lost.set()
+
+
+def create_bus(events: list, **kwargs) -> InvalidationBus:
+    """Create a bus that records the events passed to its handler."""
+    bus = InvalidationBus(reconnect_min=0.01, reconnect_max=0.05, **kwargs)
+    bus.subscribe("test", lambda entity, entity_id: events.append((entity, entity_id)))
+    return bus
+
+
+async def wait_for(condition) -> None:
+    """Wait until a condition holds."""
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition not met")
+
+
+def test_payloads_round_trip_and_stay_under_the_size_limit():
+    """Test that events are packed into compact, bounded payloads."""
+    events = [("item", i) for i in range(100)] + [("user", "ab-12"), ("item", None)]
+    payloads = encode_payloads("w1", events, max_bytes=200)
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= 200 for payload in payloads)
+    decoded = [event for p in payloads for event in decode_payload(p)[1]]
+    assert decoded == events
+    assert decode_payload(payloads[0])[0] == "w1"
+    assert decode_payload(encode_payloads("w1", events, flush=True)[0]) == ("w1", None)
+    assert encode_payloads("w1", [("x" * 300, 1)], max_bytes=200) == [
+        encode_payloads("w1", [], flush=True)[0]
+    ]
+    with pytest.raises(ValueError):
+        decode_payload('{"e": []}')
+
+
+async def test_events_reach_other_workers_but_not_the_sender():
+    """Test that published events are evicted by peers only."""
+    hub, sent, received = FakeHub(), [], []
+    sender, peer = create_bus(sent), create_bus(received)
+    sender.start(FakeTransport(hub))
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: sender.connected and peer.connected)
+
+    sender.publish("item", 3)
+    sender.publish("item", 3)
+    sender.publish("item")
+    await wait_for(lambda: received)
+
+    assert received == [("item", 3), ("item", None)]
+    assert sent == []
+    assert len(hub.payloads) == 1
+    assert sender.snapshot()["published_total"] == 2
+    assert peer.snapshot()["received_total"] == 1
+    await sender.stop()
+    await peer.stop()
+
+
+async def test_overflow_is_sent_as_a_full_flush():
+    """Test that too many unsent events collapse into one flush."""
+    hub, received = FakeHub(), []
+    sender, peer = create_bus([], max_pending=3), create_bus(received)
+    peer.start(FakeTransport(hub))
+    sender.start(FakeTransport(hub))
+    await wait_for(lambda: sender.connected and peer.connected)
+
+    for item_id in range(5):
+        sender.publish("item", item_id)
+    await wait_for(lambda: received)
+
+    assert received == [(None, None)]
+    assert peer.flushes_total == 1
+    await sender.stop()
+    await peer.stop()
+
+
+async def test_reconnect_flushes_and_resends_pending_events():
+    """Test that a dropped listener flushes caches and catches up on reconnect."""
+    hub, flushed, received = FakeHub(), [], []
+    transport = FakeTransport(hub)
+    bus, peer = create_bus(flushed), create_bus(received)
+    bus.start(transport)
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: bus.connected and peer.connected)
+
+    transport.refuse_connect = True
+    transport.drop()
+    await wait_for(lambda: not bus.connected)
+    bus.publish("item", 7)
+    await wait_for(lambda: len(flushed) >= 2)
+    assert set(flushed) == {(None, None)}
+    assert received == []
+
+    transport.refuse_connect = False
+    await wait_for(lambda: bus.connected)
+    await wait_for(lambda: received)
+
+    assert bus.reconnects_total == 1
+    assert received == [("item", 7)]
+    assert bus.snapshot()["pending"] == 0
+    await bus.stop()
+    await peer.stop()
+
+
+async def test_failed_publish_is_retried():
+    """Test that events stay queued until they are sent."""
+    hub, received = FakeHub(), []
+    transport = FakeTransport(hub)
+    bus, peer = create_bus([]), create_bus(received)
+    bus.start(transport)
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: bus.connected and peer.connected)
+
+    transport.fail_publish = True
+    bus.publish("item", 1)
+    await wait_for(lambda: bus.errors_total)
+    bus.publish("item", 2)
+    transport.fail_publish = False
+    await wait_for(lambda: len(received) == 2)
+
+    assert received == [("item", 1), ("item", 2)]
+    await bus.stop()
+    await peer.stop()
+
+
+async def test_stop_sends_queued_events():
+    """Test that stopping the bus sends what is still queued."""
+    hub, received = FakeHub(), []
+    bus, peer = create_bus([]), create_bus(received)
+    bus.start(FakeTransport(hub))
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: bus.connected and peer.connected)
+
+    bus.publish("item", 4)
+    await bus.stop()
+
+    assert received == [("item", 4)]
+    assert bus.snapshot()["transport"] is None
+    await peer.stop()
+
+
+async def test_service_writes_publish_invalidations(monkeypatch):
+    """Test that BaseService writes are published to the other workers."""
+    hub, received = FakeHub(), []
+    bus, peer = create_bus([]), create_bus(received)
+    monkeypatch.setattr("app.services.base.invalidation_bus", bus)
+    bus.start(FakeTransport(hub))
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: bus.connected and peer.connected)
+
+    service = BaseService("item")
+    await service.update(3, {"name": "x"})
+    await service.create({"name": "y"})
+    await wait_for(lambda: len(received) == 2)
+
+    assert received == [("item", 3), ("item", None)]
+    await bus.stop()
+    await peer.stop()
+
+
+def test_publish_without_a_transport_is_a_no_op():
+    """Test that a bus that was never started queues nothing."""
+    bus = create_bus([])
+    bus.publish("item", 1)
+    assert bus.snapshot()["pending"] == 0
+
+
+async def test_local_handlers_run_for_own_writes():
+    """Test that item search results are dropped for local and remote writes."""
+    hub = FakeHub()
+    search = ItemSearchService(cache_ttl=60)
+    bus, peer = create_bus([]), create_bus([])
+    peer_search = ItemSearchService(cache_ttl=60)
+    bus.subscribe("item search", search.evict, local=True)
+    peer.subscribe("item search", peer_search.evict, local=True)
+    bus.start(FakeTransport(hub))
+    peer.start(FakeTransport(hub))
+    await wait_for(lambda: bus.connected and peer.connected)
+
+    for service in (search, peer_search):
+        service.cache.set("shoes", ItemSearchResults(items=[]))
+    bus.publish("user", 1)
+    await wait_for(lambda: peer.received_total == 1)
+    assert len(search.cache) == len(peer_search.cache) == 1
+
+    bus.publish("item", 1)
+    assert len(search.cache) == 0
+    await wait_for(lambda: len(peer_search.cache) == 0)
+
+    search.cache.set("shoes", ItemSearchResults(items=[]))
+    peer.flush()
+    bus.flush()
+    assert len(search.cache) == 0
+    await bus.stop()
+    await peer.stop()
+
+
+def test_transport_selection(monkeypatch):
+    """Test that Redis is preferred, then Postgres, then no transport."""
+    monkeypatch.setattr("app.core.invalidation.find_spec", lambda name: object())
+    sqlite = Settings(DATABASE_URL="sqlite:///./app.db", REDIS_URL=None)
+    postgres = Settings(DATABASE_URL="postgresql://db/app", REDIS_URL=None)
+    redis = Settings(DATABASE_URL="postgresql://db/app", REDIS_URL="redis://r:6379")
+
+    assert create_invalidation_transport(sqlite) is None
+    assert isinstance(create_invalidation_transport(postgres), PostgresTransport)
+    assert isinstance(create_invalidation_transport(redis), RedisTransport)
+
+    monkeypatch.setattr("app.core.invalidation.find_spec", lambda name: None)
+    assert create_invalidation_transport(redis) is None
@@ -0,0 +1,172 @@
+"""Test full-text item search."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services.item_search import (
+    ItemSearchService,
+    decode_cursor,
+    encode_cursor,
+    match_expression,
+    search_statement,
+)
+
+ITEMS = [
+    ("Running shoes", "Light shoes for road running", "a", 1),
+    ("Trail shoes", "Grippy soles for running off road", "a", 1),
+    ("Rain jacket", "Packs into its own pocket, good for running", "b", 1),
+    ("Old shoes", "Worn out", "b", 0),
+    ("Water bottle", None, "a", 1),
+]
+
+
+@pytest.fixture
+async def database(sqlite_database, write):
+    """Create an items table written before the index exists."""
+    await write(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT, description TEXT, "
+        "owner_id TEXT, is_active BOOLEAN)"
+    )
+    for item in ITEMS[:3]:
+        await write(
+            "INSERT INTO items (title, description, owner_id, is_active) "
+            "VALUES (?, ?, ?, ?)",
+            item,
+        )
+    return sqlite_database
+
+
+@pytest.fixture
+async def service(database, write):
+    """Index the items, then add more through the triggers."""
+    service = ItemSearchService()
+    assert await service.setup()
+    for item in ITEMS[3:]:
+        await write(
+            "INSERT INTO items (title, description, owner_id, is_active) "
+            "VALUES (?, ?, ?, ?)",
+            item,
+        )
+    return service
+
+
+def titles(results) -> list[str]:
+    """Get the titles of a page of results."""
+    return [hit.title for hit in results.items]
+
+
+async def test_search_ranks_title_matches_first(service):
+    """Test that all words must match and title matches outrank others."""
+    results = await service.search("shoes")
+    assert set(titles(results)) == {"Running shoes", "Trail shoes", "Old shoes"}
+
+    results = await service.search("running")
+    assert titles(results)[0] == "Running shoes"
+    assert titles(results)[-1] == "Rain jacket"
+    assert [hit.rank for hit in results.items] == sorted(
+        (hit.rank for hit in results.items), reverse=True
+    )
+    # Stemming matches "running" to "run"
+    assert titles(await service.search("run road", prefix=False)) == [
+        "Running shoes",
+        "Trail shoes",
+    ]
+
+
+async def test_prefix_and_filters(service):
+    """Test prefix matching of the last word and the owner/active filters."""
+    assert titles(await service.search("bott")) == ["Water bottle"]
+    assert titles(await service.search("bott", prefix=False)) == []
+    assert titles(await service.search("shoes", owner_id="b")) == ["Old shoes"]
+    assert set(titles(await service.search("shoes", is_active=True))) == {
+        "Running shoes",
+        "Trail shoes",
+    }
+    assert titles(await service.search("shoes", owner_id="b", is_active=True)) == []
+    # Query syntax in the text is treated as plain words
+    assert titles(await service.search('shoes" OR "jacket*')) == []
+
+
+async def test_index_follows_updates_and_deletes(service, write):
+    """Test that the triggers keep the FTS5 index in sync with items."""
+    await write(
+        "UPDATE items SET title = 'Racing flats', description = NULL WHERE id = 1",
+    )
+    await write("DELETE FROM items WHERE title = 'Trail shoes'")
+    assert titles(await service.search("shoes")) == ["Old shoes"]
+    assert titles(await service.search("flats")) == ["Racing flats"]
+
+
+async def test_keyset_pagination(service):
+    """Test that cursors page through every match exactly once."""
+    seen = []
+    cursor = None
+    for _ in range(4):
+        page = await service.search("running", limit=1, cursor=cursor)
+        seen += titles(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert cursor is None
+    assert len(seen) == 3
+    assert seen == titles(await service.search("running", limit=10))
+    assert decode_cursor((await service.search("s", limit=1)).next_cursor)
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await service.search("shoes", cursor="not-a-cursor")
+    for key in ([1], {"id": 1}, None, True):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await service.search("shoes", cursor=encode_cursor(1.0, key))
+
+
+async def test_result_cache(database, write):
+    """Test that repeated queries are served from the cache until the TTL."""
+    service = ItemSearchService(cache_ttl=60)
+    await service.setup()
+    first = await service.search("shoes")
+    await write("DELETE FROM items")
+
+    assert await service.search("shoes") is first
+    assert service.snapshot() == {"cached": 1, "hits": 1, "misses": 1}
+    service.cache.clear()
+    assert titles(await service.search("shoes")) == []
+
+
+async def test_search_endpoint(service, monkeypatch):
+    """Test the search endpoint and its cursor and owner validation."""
+    monkeypatch.setattr("app.api.v1.items.item_search", service)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(
+            "/api/v1/items/search", params={"q": "shoes", "limit": 2}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) == 2
+        assert body["next_cursor"]
+
+        for cursor in ("x", encode_cursor(1.0, [1])):
+            response = await client.get(
+                "/api/v1/items/search", params={"q": "shoes", "cursor": cursor}
+            )
+            assert response.status_code == 400
+
+        response = await client.get(
+            "/api/v1/items/search", params={"q": "shoes", "owner_id": "b"}
+        )
+        assert response.status_code == 422
+
+
+def test_postgres_statement():
+    """Test the Postgres statement uses the tsvector and numbered placeholders."""
+    statement = search_statement(
+        "postgresql", owner_id=True, is_active=False, after=True
+    )
+    assert "to_tsquery('english', $1)" in statement
+    assert "search_vector @@ query AND owner_id = $2::uuid" in statement
+    assert "WHERE (rank, key) < ($3, $4) ORDER BY rank DESC, key DESC LIMIT $5" in (
+        statement
+    )
+    assert match_expression(["trail", "sho"], "postgresql", True) == "'trail' & 'sho':*"
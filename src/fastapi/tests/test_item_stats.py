@@ -0,0 +1,103 @@
+"""Test the trigger-maintained per-owner item aggregates."""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services.item_stats import ItemStatsService
+
+
+@pytest.fixture
+async def database(sqlite_database, write):
+    """Create an items table on the test database."""
+    await write(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, owner_id TEXT, "
+        "is_active BOOLEAN DEFAULT 1, price NUMERIC, tax NUMERIC)"
+    )
+    return sqlite_database
+
+
+@pytest.fixture
+async def service(database):
+    """Create the aggregate table and triggers."""
+    service = ItemStatsService()
+    assert await service.setup()
+    return service
+
+
+async def stats(service: ItemStatsService, owner_id: str) -> tuple:
+    """Get an owner's aggregates as a tuple."""
+    result = await service.get(owner_id)
+    return (result.item_count, result.active_count, result.price_total)
+
+
+async def test_writes_keep_aggregates_current(service, write):
+    """Test that inserts, updates and deletes apply deltas per owner."""
+    for owner, price in [("a", "10.50"), ("a", "4.50"), ("b", "7")]:
+        await write(
+            "INSERT INTO items (owner_id, price, tax) VALUES (?, ?, 1)",
+            (owner, price),
+        )
+    assert await stats(service, "a") == (2, 2, Decimal("15"))
+    assert (await service.get("a")).tax_total == Decimal(2)
+
+    await write("UPDATE items SET is_active = 0 WHERE id = 1")
+    assert await stats(service, "a") == (2, 1, Decimal("15"))
+
+    # Moving an item subtracts it from one owner and adds it to the other
+    await write("UPDATE items SET owner_id = 'b', price = 5 WHERE id = 2")
+    assert await stats(service, "a") == (1, 0, Decimal("10.5"))
+    assert await stats(service, "b") == (2, 2, Decimal("12"))
+
+    await write("DELETE FROM items WHERE owner_id = 'b'")
+    assert await stats(service, "b") == (0, 0, Decimal(0))
+    assert await stats(service, "nobody") == (0, 0, Decimal(0))
+    assert await service.reconcile() == {"corrected": 0, "removed": 1}
+
+
+async def test_reconcile_corrects_drift(service, write):
+    """Test that drifted and orphaned aggregate rows are fixed."""
+    await write("INSERT INTO items (owner_id, price) VALUES ('a', 3)")
+    await write("INSERT INTO items (owner_id, price) VALUES ('b', 4)")
+    await write("DROP TRIGGER owner_item_stats_insert")
+    await write("INSERT INTO items (owner_id, price) VALUES ('a', 2)")
+    await write("UPDATE owner_item_stats SET item_count = 9 WHERE owner_id = 'b'")
+    await write("INSERT INTO owner_item_stats (owner_id, item_count) VALUES ('c', 1)")
+
+    assert await service.reconcile() == {"corrected": 2, "removed": 1}
+    assert await stats(service, "a") == (2, 2, Decimal(5))
+    assert await stats(service, "b") == (1, 1, Decimal(4))
+    assert await service.reconcile() == {"corrected": 0, "removed": 0}
+    assert service.last_result == {"corrected": 0, "removed": 0}
+
+
+async def test_setup_skips_databases_without_items(sqlite_database):
+    """Test that no aggregate table is created before the items table exists."""
+    assert not await ItemStatsService().setup()
+
+
+async def test_item_stats_endpoint(service, write, monkeypatch):
+    """Test that the endpoint answers from the aggregate row."""
+    monkeypatch.setattr("app.api.v1.owners.item_stats", service)
+    owner_id = str(uuid.uuid4())
+    await write(
+        "INSERT INTO items (owner_id, price, tax) VALUES (?, 8, 2)", (owner_id,)
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(f"/api/v1/owners/{owner_id}/item-stats")
+        # Owner IDs are UUIDs; anything else is refused before the query
+        malformed = await client.get("/api/v1/owners/a/item-stats")
+    assert malformed.status_code == 422
+    assert response.status_code == 200
+    assert response.json() == {
+        "owner_id": owner_id,
+        "item_count": 1,
+        "active_count": 1,
+        "price_total": "8",
+        "tax_total": "2",
+    }
@@ -0,0 +1,198 @@
+"""Test the background job queue on the SQLite fallback store."""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+async def job_queue(tmp_path):
+    """Create a job queue backed by a temporary SQLite database."""
+    from app.db.job_store import SQLiteJobStore
+    from app.services.jobs import JobQueue
+
+    queue = JobQueue()
+    await queue.connect(SQLiteJobStore(str(tmp_path / "jobs.db")))
+    yield queue
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_claim_by_priority_and_run_at(job_queue):
+    """Test that claims return due jobs, highest priority first."""
+    job_queue.task("noop")(lambda: None)
+    store = job_queue.store
+
+    low = await job_queue.enqueue("noop", priority=0)
+    high = await job_queue.enqueue("noop", priority=10)
+    await job_queue.enqueue("noop", priority=99, delay=60)
+    await job_queue.enqueue("noop", queue="other")
+
+    jobs = await store.claim("default", 10, 30, "worker-1")
+    assert [job.id for job in jobs] == [high, low]
+    assert all(job.attempts == 1 for job in jobs)
+
+    # Claimed jobs are invisible to other workers
+    assert await store.claim("default", 10, 30, "worker-2") == []
+
+    # Jobs of equal priority are handed out in run_at order
+    later = await job_queue.enqueue("noop", delay=0.02)
+    sooner = await job_queue.enqueue("noop")
+    await asyncio.sleep(0.03)
+    jobs = await store.claim("default", 10, 30, "worker-1")
+    assert [job.id for job in jobs] == [sooner, later]
+
+
+@pytest.mark.asyncio
+async def test_expired_visibility_timeout_is_reclaimed(job_queue):
+    """Test that jobs from a crashed worker become claimable again."""
+    job_queue.task("noop")(lambda: None)
+    store = job_queue.store
+
+    await job_queue.enqueue("noop")
+    [job] = await store.claim("default", 1, 0.01, "crashed")
+    await asyncio.sleep(0.02)
+
+    [reclaimed] = await store.claim("default", 1, 30, "worker-2")
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+    # The crashed worker can no longer complete the job
+    await store.complete(job.id, "crashed")
+    assert (await store.status(job.id)).value == "running"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_do_not_overlap(job_queue):
+    """Test that concurrent claimers never receive the same job."""
+    job_queue.task("noop")(lambda: None)
+    for _ in range(20):
+        await job_queue.enqueue("noop")
+
+    batches = await asyncio.gather(
+        *(job_queue.store.claim("default", 5, 30, f"w{i}") for i in range(6))
+    )
+    ids = [job.id for batch in batches for job in batch]
+    assert len(ids) == 20
+    assert len(set(ids)) == 20
+
+
+def test_retry_backoff_grows_with_jitter():
+    """Test exponential backoff bounds."""
+    from app.services.jobs import retry_delay
+
+    for attempts in range(1, 6):
+        delay = retry_delay(attempts, base=1.0, cap=10.0)
+        assert 0 <= delay <= min(10.0, 2 ** (attempts - 1))
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_with_concurrency_cap(job_queue):
+    """Test that a worker processes jobs without exceeding its cap."""
+    from app.services.jobs import JobWorker
+
+    running = 0
+    peak = 0
+    done = []
+
+    @job_queue.task("work")
+    async def work(n: int) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        done.append(n)
+
+    worker = JobWorker(job_queue, concurrency=3, batch_size=2, poll_interval=0.01)
+    worker.start()
+    for n in range(10):
+        await job_queue.enqueue("work", {"n": n})
+
+    for _ in range(200):
+        if len(done) == 10:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert sorted(done) == list(range(10))
+    assert peak <= 3
+    assert worker.processed == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_job_retries_then_fails(job_queue):
+    """Test that failing jobs are retried until max attempts."""
+    from app.models.job import JobStatus
+    from app.services.jobs import JobWorker
+
+    calls = 0
+
+    @job_queue.task("flaky")
+    async def flaky() -> None:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("upstream unavailable")
+
+    job_id = await job_queue.enqueue("flaky", max_attempts=3)
+    worker = JobWorker(job_queue, poll_interval=0.01, retry_backoff=0.001)
+    worker.start()
+    for _ in range(200):
+        if await job_queue.store.status(job_id) == JobStatus.FAILED:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert calls == 3
+    assert await job_queue.store.status(job_id) == JobStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_enqueue_requires_connection():
+    """Test that enqueue fails before the queue is connected."""
+    from app.services.jobs import JobQueue
+
+    queue = JobQueue()
+    with pytest.raises(RuntimeError, match="not connected"):
+        await queue.enqueue("anything")
+
+
+def test_job_store_for_url():
+    """Test store selection from the database URL."""
+    from app.db.job_store import PostgresJobStore, SQLiteJobStore, create_job_store
+
+    assert isinstance(
+        create_job_store("postgresql://u:p@localhost/db"), PostgresJobStore
+    )
+    store = create_job_store("sqlite:///./jobs.db")
+    assert isinstance(store, SQLiteJobStore)
+    assert store.path == "./jobs.db"
+    with pytest.raises(ValueError):
+        create_job_store("mysql://localhost/db")
+
+
+def test_postgres_claim_order():
+    """Test that Postgres claims are handed out in priority and run_at order."""
+    from app.db.job_store import POSTGRES_CLAIM
+
+    claim, _, order = POSTGRES_CLAIM.rpartition("FROM claimed")
+    assert "FOR UPDATE SKIP LOCKED" in claim
+    assert order.strip() == "ORDER BY priority DESC, run_at"
+
+
+def test_workers_run_inside_lifespan(monkeypatch, tmp_path):
+    """Test that lifespan connects the queue and stops workers on shutdown."""
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.core.lifecycle import lifecycle
+    from app.main import create_app
+    from app.services.jobs import job_queue
+
+    monkeypatch.setattr(settings, "JOBS_ENABLED", True)
+    monkeypatch.setattr(settings, "JOBS_DATABASE_URL", f"sqlite:///{tmp_path}/j.db")
+    monkeypatch.setattr(lifecycle, "draining", False)
+
+    with TestClient(create_app()):
+        assert job_queue.store is not None
+    assert job_queue.store is None
@@ -0,0 +1,110 @@
+"""Test the write-behind buffer for last login times."""
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.db.sqlite import SQLiteDatabase
+from app.services.last_login import LastLoginBuffer, bulk_update_statement
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def database(sqlite_database, write):
+    """Create a users table on the test database."""
+    await write(
+        "CREATE TABLE users (id TEXT PRIMARY KEY, last_login TEXT, updated_at TEXT)"
+    )
+    for n in range(5):
+        await write("INSERT INTO users (id) VALUES (?)", (f"u{n}",))
+    return sqlite_database
+
+
+async def last_logins(database: SQLiteDatabase) -> dict[str, str | None]:
+    """Read the stored last login per user."""
+    rows = await database.read("SELECT id, last_login FROM users ORDER BY id")
+    return {row["id"]: row["last_login"] for row in rows}
+
+
+async def test_logins_are_coalesced_into_one_update(database, statements):
+    """Test that many logins become one bulk UPDATE with the latest times."""
+    buffer = LastLoginBuffer(precision=60)
+    for minute in range(10):
+        for n in range(3):
+            buffer.record(f"u{n}", T0 + timedelta(minutes=minute))
+    assert buffer.pending == 3
+
+    assert await buffer.flush() == 3
+    assert len(statements) == 1
+    assert statements[0].startswith("WITH v(id, last_login, stale_before) AS (VALUES")
+    latest = (T0 + timedelta(minutes=9)).isoformat(" ")
+    assert await last_logins(database) == {
+        "u0": latest,
+        "u1": latest,
+        "u2": latest,
+        "u3": None,
+        "u4": None,
+    }
+
+
+async def test_precision_skips_recent_updates(database):
+    """Test that logins within the precision of the stored value are skipped."""
+    buffer = LastLoginBuffer(precision=300)
+    buffer.record("u0", T0)
+    await buffer.flush()
+
+    buffer.record("u0", T0 + timedelta(minutes=2))
+    assert buffer.pending == 0
+    assert buffer.skipped == 1
+
+    # Another worker's value within the window is left alone by the statement
+    other = LastLoginBuffer(precision=300)
+    other.record("u0", T0 + timedelta(minutes=3))
+    await other.flush()
+    assert (await last_logins(database))["u0"] == T0.isoformat(" ")
+
+    later = T0 + timedelta(minutes=6)
+    buffer.record("u0", later)
+    await buffer.flush()
+    assert (await last_logins(database))["u0"] == later.isoformat(" ")
+
+
+async def test_batches_and_stop_flushes(database, statements):
+    """Test that pending logins are split into batches and written on stop."""
+    buffer = LastLoginBuffer(interval=60, batch_size=2)
+    buffer.start()
+    for n in range(5):
+        buffer.record(f"u{n}", T0)
+    await buffer.stop()
+
+    assert len(statements) == 3
+    assert set((await last_logins(database)).values()) == {T0.isoformat(" ")}
+    assert buffer.snapshot()["written"] == 5
+
+
+async def test_failed_flush_is_retried():
+    """Test that logins from a failed flush are kept for the next one."""
+
+    @asynccontextmanager
+    async def failing_factory():
+        raise RuntimeError("database unavailable")
+        yield  # pragma: no cover
+
+    buffer = LastLoginBuffer(session_factory=failing_factory)
+    buffer.record("u0", T0)
+    assert await buffer.flush() == 0
+    buffer.record("u0", T0 - timedelta(minutes=1))
+
+    assert buffer.pending == 1
+    assert buffer.failed_flushes == 1
+    assert buffer._pending["u0"] == T0
+
+
+def test_postgres_statement():
+    """Test the bulk statement for Postgres binds three typed values per user."""
+    statement = bulk_update_statement("postgresql", 2)
+    assert "FROM (VALUES ($1::uuid, $2::timestamptz, $3::timestamptz), " in statement
+    assert "($4::uuid, $5::timestamptz, $6::timestamptz))" in statement
+    assert statement.startswith("UPDATE app.users AS u SET last_login")
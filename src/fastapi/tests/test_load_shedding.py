@@ -0,0 +1,148 @@
+"""Test adaptive concurrency limiting and load shedding."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+
+def test_aimd_limit_adjustment():
+    """Test additive increase on fast requests and backoff on slow ones."""
+    from app.core.concurrency import AdaptiveConcurrencyLimiter
+
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=10, min_limit=2, max_limit=12, latency_target=0.1
+    )
+
+    # Idle workers do not grow the limit
+    limiter.on_complete(0.01)
+    assert limiter.limit == 10
+
+    limiter.inflight = 8
+    for _ in range(30):
+        limiter.on_complete(0.01)
+    assert limiter.limit == 12  # Capped at max_limit
+
+    limiter.on_complete(0.5)
+    assert limiter.limit == 10
+    for _ in range(50):
+        limiter.on_complete(0.01, failed=True)
+    assert limiter.limit == 2  # Floored at min_limit
+    assert limiter.limit_changes > 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_wait_queue():
+    """Test that waiters get freed slots and overflow is shed."""
+    from app.core.concurrency import AdaptiveConcurrencyLimiter
+
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=1, min_limit=1, queue_size=1, queue_timeout=0.5
+    )
+    assert await limiter.acquire() is True
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    # The queue is full, so the next request is shed immediately
+    assert await limiter.acquire() is False
+
+    limiter.release()
+    assert await waiter is True
+    assert limiter.inflight == 1
+
+    limiter.queue_timeout = 0.01
+    assert await limiter.acquire() is False
+    assert limiter.shed_total == 2
+    assert limiter.accepted_total == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_its_slot():
+    """Test that a waiter cancelled after being handed a slot gives it back."""
+    from app.core.concurrency import AdaptiveConcurrencyLimiter
+
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=1, min_limit=1, queue_size=1, queue_timeout=0.5
+    )
+    assert await limiter.acquire() is True
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # Hand the slot over, then cancel the waiter before it resumes
+    limiter.release()
+    assert limiter.inflight == 1
+    waiter.cancel()
+    try:
+        # Python < 3.12 wait_for returns the result instead of cancelling
+        acquired = await waiter
+    except asyncio.CancelledError:
+        acquired = False
+    if acquired:
+        limiter.release()
+
+    assert limiter.inflight == 0
+    assert limiter.queued == 0
+    assert await limiter.acquire() is True
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_retry_after():
+    """Test that excess requests get 503 while probes bypass shedding."""
+    from app.core.concurrency import AdaptiveConcurrencyLimiter
+    from app.middleware.load_shedding import LoadSheddingMiddleware
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, queue_size=0)
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict[str, str]:
+        await release.wait()
+        return {"status": "done"}
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    app.add_middleware(LoadSheddingMiddleware, limiter=limiter, retry_after=3)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/slow"))
+        while limiter.inflight == 0:
+            await asyncio.sleep(0.001)
+
+        shed = await client.get("/slow")
+        assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert shed.headers["retry-after"] == "3"
+
+        probe = await client.get("/health")
+        assert probe.status_code == status.HTTP_200_OK
+
+        release.set()
+        assert (await first).status_code == status.HTTP_200_OK
+
+    assert limiter.shed_total == 1
+    assert limiter.inflight == 0
+
+
+def test_metrics_export(monkeypatch):
+    """Test that limiter counters are exported as Prometheus metrics."""
+    from app.core.config import settings
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "FEATURE_METRICS", True)
+    client = TestClient(create_app())
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert "# TYPE app_requests_shed_total counter" in response.text
+    assert "app_concurrency_limit{worker=" in response.text
+
+    response = client.get("/admin/concurrency")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) >= {"limit", "inflight", "shed_total"}
@@ -0,0 +1,89 @@
+"""Test the event loop lag monitor."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def test_lag_percentiles_and_histogram():
+    """Test that recorded lag is summarized as percentiles and buckets."""
+    from app.core.loop_monitor import LoopLagMonitor
+
+    monitor = LoopLagMonitor()
+    assert monitor.percentiles() is None
+
+    for lag_ms in range(1, 101):
+        monitor.record(lag_ms / 1000)
+
+    percentiles = monitor.percentiles()
+    assert percentiles["p50"] == pytest.approx(51)
+    assert percentiles["p99"] == pytest.approx(100)
+    assert percentiles["max"] == pytest.approx(100)
+
+    histogram = monitor.histogram()
+    assert histogram["le_1ms"] == 1
+    assert histogram["le_100ms"] == 50
+    assert sum(histogram.values()) == 100
+
+
+def test_sustained_lag_fails_liveness():
+    """Test that lag above the limit for the whole window fails liveness."""
+    from app.core.loop_monitor import LoopLagMonitor
+
+    monitor = LoopLagMonitor(liveness_limit=0.05, liveness_window=0)
+    monitor.record(0.01)
+    assert monitor.is_alive() is True
+
+    monitor.record(0.2)
+    assert monitor.is_alive() is False
+
+    # A single healthy sample resets the window
+    monitor.record(0.01)
+    assert monitor.is_alive() is True
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_detected():
+    """Test that the stack of a blocking call is captured."""
+    from app.core.loop_monitor import LoopLagMonitor
+
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)  # Block the loop
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert monitor.blocked_count >= 1
+    assert "test_blocking_call_detected" in monitor.last_blocked_stack
+    assert monitor.max_lag >= 0.2
+    assert monitor.running is False
+
+
+def test_liveness_reports_loop_lag():
+    """Test that /live includes lag percentiles while the monitor runs."""
+    from app.core.loop_monitor import LoopLagMonitor
+    from app.main import app
+
+    monitor = LoopLagMonitor()
+    monitor.record(0.002)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.api.health.loop_monitor", monitor)
+        client = TestClient(app)
+
+        response = client.get("/live")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["loop_lag_ms"]["p50"] == pytest.approx(2)
+
+        monitor.liveness_limit = 0.001
+        monitor.liveness_window = 0
+        monitor.record(0.5)
+        response = client.get("/live")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["status"] == "not_alive"
@@ -0,0 +1,160 @@
+"""Test memory diagnostics and the worker control channel."""
+
+import asyncio
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def profiler():
+    """Create a memory profiler and stop tracing afterwards."""
+    from app.core.memory import MemoryProfiler
+
+    profiler = MemoryProfiler(max_snapshots=2)
+    yield profiler
+    tracemalloc.stop()
+
+
+def test_diff_finds_growing_allocation_site(profiler):
+    """Test that a snapshot diff ranks the leaking site first."""
+    profiler.start(frames=1)
+    base = profiler.snapshot()["id"]
+
+    leak = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+
+    diff = profiler.diff(base)
+    top = diff["top"][0]
+    assert top["site"].startswith("test_memory.py:")
+    assert top["size_diff_bytes"] >= 2000 * 1024
+    assert diff["size_diff_bytes"] >= 2000 * 1024
+
+
+def test_snapshots_are_bounded(profiler):
+    """Test that old snapshots are dropped and stopping clears them."""
+    profiler.start()
+    ids = [profiler.snapshot(limit=1)["id"] for _ in range(3)]
+
+    assert [s["id"] for s in profiler.status()["snapshots"]] == ids[1:]
+    with pytest.raises(KeyError):
+        profiler.diff(ids[0])
+
+    status = profiler.stop()
+    assert status["tracing"] is False
+    assert status["snapshots"] == []
+
+
+def test_snapshot_requires_tracing(profiler):
+    """Test that snapshots are refused while tracemalloc is stopped."""
+    with pytest.raises(ValueError):
+        profiler.snapshot()
+
+
+def test_gc_and_object_counts(profiler):
+    """Test GC stats and counting objects by type."""
+    stats = profiler.run("gc", {})
+    assert len(stats["generations"]) == 3
+
+    class Marker:
+        pass
+
+    markers = [Marker() for _ in range(500)]  # noqa: F841
+    counts = profiler.run("objects", {"limit": 1000})
+    assert counts["types"][f"{__name__}.{Marker.__qualname__}"] == 500
+
+    with pytest.raises(ValueError):
+        profiler.run("explode", {})
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_worker(tmp_path):
+    """Test that a command runs in every listening worker."""
+    from app.core.worker_control import WorkerControlChannel
+
+    channels = [WorkerControlChannel(tmp_path, poll_interval=0.01) for _ in range(3)]
+    for n, channel in enumerate(channels):
+        channel.pid = 1000 + n  # Stand-ins for separate worker processes
+
+        async def handler(command, params, n=n):
+            return {"worker": n, "command": command, **params}
+
+        channel.register("test", handler)
+        channel._task = asyncio.create_task(channel._poll())
+
+    try:
+        await asyncio.sleep(0.02)
+        results = await channels[0].broadcast("test", "ping", {"x": 1}, timeout=2)
+    finally:
+        for channel in channels:
+            await channel.stop()
+
+    assert sorted(results) == [1000, 1001, 1002]
+    assert results[1002] == {"worker": 2, "command": "ping", "x": 1}
+    # Commands and results are cleaned up once collected
+    assert list(tmp_path.glob("*.json")) == []
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reports_silent_workers(tmp_path):
+    """Test that workers that do not answer are reported, not waited on forever."""
+    from app.core.worker_control import WorkerControlChannel
+
+    channel = WorkerControlChannel(tmp_path, poll_interval=0.01)
+    channel.start()
+    (tmp_path / "worker-4242").touch()  # Registered but never answers
+    try:
+        results = await channel.broadcast("missing", "ping", {}, timeout=0.2)
+    finally:
+        await channel.stop()
+
+    assert results[4242]["error"] == "Worker did not respond"
+    assert "No handler" in results[channel.pid]["error"]
+
+
+def test_memory_endpoints(monkeypatch, tmp_path):
+    """Test the admin endpoints for this worker and for all workers."""
+    from app.core.config import settings
+    from app.core.lifecycle import lifecycle
+    from app.core.worker_control import worker_control
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "FEATURE_ADMIN_PANEL", True)
+    monkeypatch.setattr(lifecycle, "draining", False)
+    monkeypatch.setattr(worker_control, "configured_directory", tmp_path)
+
+    try:
+        with TestClient(create_app()) as client:
+            response = client.post("/admin/memory/tracemalloc/start?frames=2")
+            assert response.status_code == 200
+            (worker,) = response.json()["workers"].values()
+            assert worker["tracing"] is True
+
+            response = client.post("/admin/memory/snapshots?limit=5")
+            (worker,) = response.json()["workers"].values()
+            assert len(worker["top"]) == 5
+
+            response = client.get("/admin/memory/snapshots/diff?base=nope")
+            assert response.status_code == 404
+
+            response = client.get("/admin/memory/snapshots/diff?all_workers=true")
+            assert response.status_code == 200
+            (worker,) = response.json()["workers"].values()
+            assert "size_diff_bytes" in worker
+
+            response = client.get("/admin/memory/gc?all_workers=true")
+            assert response.status_code == 200
+
+            response = client.get("/admin/memory/objects?limit=3")
+            (worker,) = response.json()["workers"].values()
+            assert len(worker["types"]) == 3
+    finally:
+        tracemalloc.stop()
+
+
+def test_memory_endpoints_require_admin_panel():
+    """Test that memory diagnostics are off unless the admin panel is enabled."""
+    from app.main import app
+
+    response = TestClient(app).get("/admin/memory")
+    assert response.status_code == 403
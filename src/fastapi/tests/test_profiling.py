@@ -0,0 +1,141 @@
+"""Test the request profiling middleware and admin endpoints."""
+
+import time
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+
+def busy_wait(seconds: float) -> None:
+    """Keep the event loop thread busy."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def profiled_app():
+    """Create an app with the profiling middleware installed."""
+    from app.core.profiling import ProfileStore
+    from app.middleware.profiling import ProfilingMiddleware
+
+    store = ProfileStore()
+    app = FastAPI()
+
+    @app.get("/work/{item_id}")
+    async def work(item_id: int) -> dict[str, int]:
+        busy_wait(0.05)
+        return {"item_id": item_id}
+
+    app.add_middleware(
+        ProfilingMiddleware, on_demand=True, every_n=2, interval=0.001, store=store
+    )
+    return app, store
+
+
+def test_on_demand_profile(profiled_app):
+    """Test that a request with X-Profile is profiled and stored."""
+    app, store = profiled_app
+    client = TestClient(app)
+
+    response = client.get("/work/1", headers={"X-Profile": "1"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"item_id": 1}
+
+    profile = store.get(response.headers["x-profile-id"])
+    assert profile is not None
+    assert profile.route == "/work/{item_id}"
+    assert sum(profile.samples.values()) > 0
+    assert any(frame[0] == "busy_wait" for stack in profile.samples for frame in stack)
+
+
+def test_continuous_profiling_aggregates_per_route(profiled_app):
+    """Test that one request in N is profiled and merged per route."""
+    app, store = profiled_app
+    client = TestClient(app)
+
+    for item_id in range(4):
+        response = client.get(f"/work/{item_id}")
+        assert "x-profile-id" not in response.headers
+
+    routes = store.list_routes()
+    assert routes["/work/{item_id}"]["requests"] == 2
+    assert store.list_profiles() == []
+
+
+def test_profile_header_ignored_in_production(profiled_app):
+    """Test that the header is not honored in production without a token."""
+    from unittest.mock import patch
+
+    from app.core.config import Environment
+
+    app, store = profiled_app
+    client = TestClient(app)
+
+    with patch("app.middleware.profiling.settings") as mock_settings:
+        mock_settings.ENVIRONMENT = Environment.PRODUCTION
+        mock_settings.is_production = True
+        mock_settings.FEATURE_ADMIN_PANEL = True
+        mock_settings.PROFILING_TOKEN = None
+        response = client.get("/work/1", headers={"X-Profile": "1"})
+        assert "x-profile-id" not in response.headers
+
+        # An empty token, as loaded from PROFILING_TOKEN=, is no token
+        mock_settings.PROFILING_TOKEN = ""
+        response = client.get("/work/1", headers={"X-Profile": ""})
+        assert "x-profile-id" not in response.headers
+
+        mock_settings.PROFILING_TOKEN = "secret"
+        response = client.get("/work/1", headers={"X-Profile": ""})
+        assert "x-profile-id" not in response.headers
+        response = client.get("/work/1", headers={"X-Profile": "secret"})
+        assert "x-profile-id" in response.headers
+
+
+def test_speedscope_export():
+    """Test the speedscope rendering of samples."""
+    from app.core.profiling import to_collapsed, to_speedscope
+
+    stack_a = (("main", "app.py", 1), ("handler", "api.py", 10))
+    stack_b = (("main", "app.py", 1),)
+    samples = Counter({stack_a: 3, stack_b: 1})
+
+    data = to_speedscope(samples, "test", interval=0.001)
+    assert len(data["shared"]["frames"]) == 2
+    profile = data["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert profile["endValue"] == pytest.approx(4.0)
+
+    collapsed = to_collapsed(samples).splitlines()
+    assert collapsed[0] == "main (app.py:1);handler (api.py:10) 3"
+
+
+def test_admin_profile_endpoints():
+    """Test fetching stored profiles through the admin API."""
+    from app.core.profiling import Profile, profile_store
+    from app.main import app
+
+    profile = Profile(
+        route="/health",
+        interval=0.001,
+        duration=0.01,
+        samples=Counter({(("main", "app.py", 1),): 5}),
+    )
+    profile_store.add(profile)
+
+    client = TestClient(app)
+    response = client.get("/admin/profiles")
+    assert response.status_code == status.HTTP_200_OK
+    assert profile.id in [p["id"] for p in response.json()["profiles"]]
+
+    response = client.get(f"/admin/profiles/{profile.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["profiles"][0]["samples"] == [[0]]
+
+    response = client.get(f"/admin/profiles/{profile.id}?format=collapsed")
+    assert response.text == "main (app.py:1) 5"
+
+    response = client.get("/admin/profiles/missing")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,109 @@
+"""Test per-request query accounting and Server-Timing headers."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def test_normalize_sql():
+    """Test that literals are replaced and whitespace collapsed."""
+    from app.db.instrumentation import normalize_sql
+
+    statement = """
+        SELECT *  FROM app.users
+        WHERE email = 'a@b.com' AND id IN (1, 2, 3) LIMIT 10
+    """
+    assert normalize_sql(statement) == (
+        "SELECT * FROM app.users WHERE email = ? AND id IN (...) LIMIT ?"
+    )
+    # Placeholders and identifiers with digits are left alone
+    assert normalize_sql("SELECT col1 FROM t2 WHERE a = $1") == (
+        "SELECT col1 FROM t2 WHERE a = $1"
+    )
+
+
+def test_param_shape_hides_values():
+    """Test that bind parameters are described by type only."""
+    from app.db.instrumentation import param_shape
+
+    assert param_shape(None) is None
+    assert param_shape((1, "secret", None)) == ["int", "str", "NoneType"]
+    assert param_shape({"email": "secret"}) == {"email": "str"}
+
+
+@pytest.mark.asyncio
+async def test_query_stats_tracking():
+    """Test that executed statements are counted for the active request."""
+    from app.db.instrumentation import (
+        get_query_stats,
+        reset_query_tracking,
+        start_query_tracking,
+    )
+    from app.db.session import get_db
+
+    assert get_query_stats() is None
+
+    token = start_query_tracking()
+    try:
+        async with get_db() as db:
+            await db.execute("SELECT 1")
+            await db.execute("SELECT 2")
+        stats = get_query_stats()
+        assert stats is not None
+        assert stats.count == 2
+        assert stats.total_time >= 0
+    finally:
+        reset_query_tracking(token)
+
+    assert get_query_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_slow_query_explained_outside_production():
+    """Test that slow read statements are explained when enabled."""
+    from app.db.instrumentation import record_query
+
+    class FakeSession:
+        dialect = "postgresql"
+
+        def __init__(self):
+            self.explained = []
+
+        async def explain(self, statement, params=None):
+            self.explained.append(statement)
+            return "Seq Scan on users"
+
+    session = FakeSession()
+    with patch("app.db.instrumentation.settings") as mock_settings:
+        mock_settings.DB_SLOW_QUERY_THRESHOLD_MS = 10
+        mock_settings.DB_EXPLAIN_SLOW_QUERIES = True
+        mock_settings.DB_EXPLAIN_SAMPLE_RATE = 1.0
+        mock_settings.is_production = False
+
+        await record_query("SELECT * FROM users", None, 0.5, session)
+        await record_query("DELETE FROM users", None, 0.5, session)
+        await record_query("SELECT 1", None, 0.001, session)
+
+        mock_settings.is_production = True
+        await record_query("SELECT * FROM items", None, 0.5, session)
+
+    assert session.explained == ["SELECT * FROM users"]
+
+
+def test_server_timing_header():
+    """Test that responses carry DB timing in a Server-Timing header."""
+    from app.main import app
+
+    client = TestClient(app)
+    response = client.get("/ready")
+
+    assert response.status_code == status.HTTP_200_OK
+    server_timing = response.headers["server-timing"]
+    assert 'desc="1 queries"' in server_timing
+    assert "db;dur=" in server_timing
+    assert "app;dur=" in server_timing
+
+    response = client.get("/health")
+    assert 'desc="0 queries"' in response.headers["server-timing"]
@@ -0,0 +1,185 @@
+"""Test the HTTP response cache and its middleware."""
+
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+from starlette.datastructures import Headers
+
+from app.core.http_cache import HTTPCache, cache_response
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.services.base import BaseService
+
+
+def create_cached_app(cache: HTTPCache, calls: list[str]) -> FastAPI:
+    """Create an app with cached and uncached routes behind the middleware."""
+    app = FastAPI()
+
+    @app.get("/items", dependencies=[Depends(cache_response(60, tags=["item"]))])
+    async def items(a: str = "", b: str = ""):
+        calls.append("items")
+        return {"a": a, "b": b, "call": len(calls)}
+
+    @app.get(
+        "/slow",
+        dependencies=[Depends(cache_response(0.3, stale=60))],
+    )
+    async def slow():
+        calls.append("slow")
+        await asyncio.sleep(0.05)
+        return {"call": len(calls)}
+
+    @app.get(
+        "/me",
+        dependencies=[Depends(cache_response(60, vary=["authorization"]))],
+    )
+    async def me():
+        calls.append("me")
+        return {"call": len(calls)}
+
+    @app.get("/uncached")
+    async def uncached():
+        calls.append("uncached")
+        return {"call": len(calls)}
+
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    return app
+
+
+def create_client(app: FastAPI) -> httpx.AsyncClient:
+    """Create a client calling the app in process."""
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+async def test_miss_then_hit():
+    """Test that an opted-in route is computed once and then served from memory."""
+    cache, calls = HTTPCache(), []
+    async with create_client(create_cached_app(cache, calls)) as client:
+        first = await client.get("/items?b=2&a=1")
+        second = await client.get("/items?a=1&b=2")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["age"] == "0"
+    assert second.json() == first.json()
+    assert "cache-tag" not in first.headers
+    assert "cache-tag" not in second.headers
+    assert calls == ["items"]
+    assert cache.snapshot()["hits"] == 1
+
+
+async def test_uncached_routes_and_credentials_bypass():
+    """Test that routes without s-maxage and credentialed requests are not cached."""
+    cache, calls = HTTPCache(), []
+    async with create_client(create_cached_app(cache, calls)) as client:
+        uncached = [await client.get("/uncached") for _ in range(2)]
+        await client.get("/items")
+        response = await client.get("/items", headers={"Authorization": "Bearer x"})
+        missing = await client.get("/missing")
+
+    # Only responses the cache could store are labelled
+    assert all("x-cache" not in r.headers for r in [*uncached, response, missing])
+    assert calls == ["uncached", "uncached", "items", "items"]
+
+
+async def test_vary_keys_entries_by_header():
+    """Test that a route varying on a header is cached per header value."""
+    cache, calls = HTTPCache(), []
+    async with create_client(create_cached_app(cache, calls)) as client:
+        alice = [
+            await client.get("/me", headers={"Authorization": "alice"})
+            for _ in range(2)
+        ]
+        bob = await client.get("/me", headers={"Authorization": "bob"})
+
+    assert [r.headers["x-cache"] for r in alice] == ["MISS", "HIT"]
+    assert bob.headers["x-cache"] == "MISS"
+    assert bob.json() != alice[0].json()
+    assert calls == ["me", "me"]
+
+
+async def test_stale_while_revalidate_refreshes_once():
+    """Test that stale hits are served at once while one request refreshes."""
+    cache, calls = HTTPCache(), []
+    app = create_cached_app(cache, calls)
+    async with create_client(app) as client:
+        first = await client.get("/slow")
+        await asyncio.sleep(0.35)
+
+        stale = await asyncio.gather(*(client.get("/slow") for _ in range(5)))
+        assert all(r.headers["x-cache"] == "STALE" for r in stale)
+        assert all(r.json() == first.json() for r in stale)
+
+        # Let the background refresh finish
+        await asyncio.sleep(0.1)
+        fresh = await client.get("/slow")
+
+    assert calls == ["slow", "slow"]
+    assert fresh.headers["x-cache"] == "HIT"
+    assert fresh.json() != first.json()
+    assert cache.snapshot()["stale_hits"] == 5
+
+
+async def test_purge_during_refresh_is_not_undone():
+    """Test that a refresh started before a purge does not store its response."""
+    cache, calls = HTTPCache(), []
+    app = create_cached_app(cache, calls)
+    async with create_client(app) as client:
+        await client.get("/slow")
+        await asyncio.sleep(0.35)
+
+        stale = await client.get("/slow")
+        cache.purge(prefix="/slow")
+        # Let the background refresh finish
+        await asyncio.sleep(0.1)
+        after = await client.get("/slow")
+
+    assert stale.headers["x-cache"] == "STALE"
+    assert after.headers["x-cache"] == "MISS"
+    assert calls == ["slow", "slow", "slow"]
+
+
+def test_size_bounded_eviction():
+    """Test that the least recently used entries are evicted past max_bytes."""
+    cache = HTTPCache(max_bytes=4096, max_entry_bytes=2048)
+    headers = Headers()
+    response_headers = [(b"cache-control", b"s-maxage=60")]
+
+    for n in range(4):
+        base = cache.base_key("GET", f"/items/{n}", b"")
+        assert cache.store(
+            base, "GET", f"/items/{n}", headers, 200, response_headers, b"x" * 1000
+        )
+        if n == 1:
+            # Touch the first entry so the second is evicted before it
+            assert cache.lookup(cache.base_key("GET", "/items/0", b"")) is not None
+
+    assert cache.size <= cache.max_bytes
+    assert cache.evictions == 1
+    assert cache.lookup(cache.base_key("GET", "/items/0", b"")) is not None
+    assert cache.lookup(cache.base_key("GET", "/items/1", b"")) is None
+
+    base = cache.base_key("GET", "/large", b"")
+    assert not cache.store(
+        base, "GET", "/large", headers, 200, response_headers, b"x" * 4096
+    )
+
+
+async def test_service_writes_purge_tagged_responses(monkeypatch):
+    """Test that BaseService writes purge responses tagged for the model."""
+    cache, calls = HTTPCache(), []
+    monkeypatch.setattr("app.services.base.response_cache", cache)
+    service = BaseService("item")
+    assert service.cache_tags(3) == {"item", "item:3"}
+
+    async with create_client(create_cached_app(cache, calls)) as client:
+        await client.get("/items")
+        await service.update(3, {"name": "x"})
+        response = await client.get("/items")
+
+    assert response.headers["x-cache"] == "MISS"
+    assert calls == ["items", "items"]
+    assert cache.purge(prefix="/items") == 1
+    assert cache.snapshot()["entries"] == 0
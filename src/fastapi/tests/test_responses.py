@@ -0,0 +1,49 @@
+"""Test the trusted JSON response fast path."""
+
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+
+def test_trusted_response_matches_default_encoding():
+    """Test that compiled serialization matches FastAPI's JSON output."""
+    from app.core.responses import TrustedJSONResponse
+    from app.schemas.health import LivenessResponse
+
+    model = LivenessResponse(
+        status="alive",
+        timestamp=datetime(2024, 1, 2, 3, 4, 5),
+        uptime_seconds=1.5,
+        loop_lag_ms={"p50": 0.1, "p90": 0.2, "p99": 0.3, "max": 0.4},
+    )
+    response = TrustedJSONResponse(model)
+
+    assert json.loads(response.body) == jsonable_encoder(model)
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_trusted_response_serializes_lists():
+    """Test that lists of models use a cached list serializer."""
+    from app.core.responses import TrustedJSONResponse, list_adapter
+    from app.schemas.base import LeanResponse
+
+    class Row(LeanResponse):
+        id: int
+        name: str
+
+    rows = [Row(id=n, name=f"row-{n}") for n in range(3)]
+    response = TrustedJSONResponse(rows)
+
+    assert json.loads(response.body) == [r.model_dump() for r in rows]
+    assert list_adapter(Row) is list_adapter(Row)
+    assert json.loads(TrustedJSONResponse([]).body) == []
+    assert json.loads(TrustedJSONResponse({"plain": 1}).body) == {"plain": 1}
+
+
+def test_lean_response_skips_assignment_validation():
+    """Test that the lean base does not validate on assignment."""
+    from app.schemas.base import BaseResponse, LeanResponse
+
+    assert BaseResponse.model_config["validate_assignment"] is True
+    assert not LeanResponse.model_config.get("validate_assignment", False)
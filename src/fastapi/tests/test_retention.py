@@ -0,0 +1,119 @@
+"""Test the chunked retention sweeper."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.api.metrics import collect_metrics
+from app.db.sqlite import SQLiteDatabase
+from app.services.retention import (
+    RetentionPolicy,
+    RetentionSweeper,
+    delete_chunk_statement,
+    policies_from_settings,
+)
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+async def database(sqlite_database):
+    """Fill the test database with expired and live sessions and audit rows."""
+    database = sqlite_database
+    await database.begin(
+        "CREATE TABLE sessions (id INTEGER PRIMARY KEY, token TEXT, expires_at TEXT)"
+    )
+    await database.write(
+        "CREATE TABLE audit_logs (id INTEGER PRIMARY KEY, action TEXT, created_at TEXT)"
+    )
+    await database.write("CREATE INDEX idx_sessions_expires ON sessions (expires_at)")
+    for n in range(25):
+        # 20 expired sessions, several sharing an expiry time, and 5 live ones
+        expires = NOW + timedelta(hours=1 if n >= 20 else -(n // 3) - 1)
+        await database.write(
+            "INSERT INTO sessions (token, expires_at) VALUES (?, ?)",
+            (f"t{n}", expires.isoformat(" ")),
+        )
+        created = NOW - timedelta(days=100 if n % 2 else 1)
+        await database.write(
+            "INSERT INTO audit_logs (action, created_at) VALUES (?, ?)",
+            ("login", created.isoformat(" ")),
+        )
+    await database.end(commit=True)
+    return database
+
+
+def create_sweeper(**options) -> RetentionSweeper:
+    """Create a sweeper over the sessions and audit logs in the test database."""
+    policies = policies_from_settings({"sessions": 0, "audit_logs": 90})
+    return RetentionSweeper(policies, **options)
+
+
+async def count(database: SQLiteDatabase, table: str) -> int:
+    """Count the rows left in a table."""
+    return (await database.read(f"SELECT count(*) FROM {table}"))[0][0]
+
+
+async def test_sweep_deletes_expired_rows_in_chunks(database, statements):
+    """Test that expired rows go in keyset-ordered chunks and live rows stay."""
+    sweeper = create_sweeper(chunk_size=6, pause=0)
+
+    assert await sweeper.sweep() == {"sessions": 20, "audit_logs": 12}
+    assert await count(database, "sessions") == 5
+    assert await count(database, "audit_logs") == 13
+
+    session_statements = [s for s in statements if "FROM sessions" in s]
+    # 6 + 6 + 6 + 2 rows; every chunk after the first resumes past a cursor
+    assert len(session_statements) == 4
+    assert "(expires_at, id) > (?, ?)" not in session_statements[0]
+    assert all("(expires_at, id) > (?, ?)" in s for s in session_statements[1:])
+
+    progress = sweeper.snapshot()
+    assert progress["sessions"]["deleted_total"] == 20
+    assert progress["sessions"]["chunks_total"] == 4
+    assert progress["audit_logs"]["last_deleted"] == 12
+    assert progress["audit_logs"]["last_error"] is None
+
+    assert await sweeper.sweep() == {"sessions": 0, "audit_logs": 0}
+    assert sweeper.snapshot()["sessions"]["deleted_total"] == 20
+
+
+async def test_failed_table_is_reported_and_others_still_swept(database):
+    """Test that an error stops one table's sweep without affecting others."""
+    await database.begin("DROP TABLE sessions")
+    await database.end(commit=True)
+    sweeper = create_sweeper(chunk_size=100, pause=0)
+
+    assert await sweeper.sweep() == {"sessions": 0, "audit_logs": 12}
+    progress = sweeper.snapshot()["sessions"]
+    assert progress["errors_total"] == 1
+    assert "no such table" in progress["last_error"]
+
+
+async def test_progress_metrics(database, monkeypatch):
+    """Test that sweep progress is exported as Prometheus metrics."""
+    sweeper = create_sweeper(chunk_size=100, pause=0)
+    monkeypatch.setattr("app.api.metrics.retention_sweeper", sweeper)
+    assert not any("app_retention" in family for family in collect_metrics())
+
+    await sweeper.sweep()
+    metrics = "\n".join(collect_metrics())
+    assert 'app_retention_deleted_rows_total{worker="' in metrics
+    assert 'table="sessions"} 20' in metrics
+
+
+def test_postgres_statement_skips_locked_rows():
+    """Test the Postgres chunk statement uses a cursor and SKIP LOCKED."""
+    policy = RetentionPolicy("sessions", "expires_at")
+    statement = delete_chunk_statement(policy, "postgresql", after=True)
+    assert statement.startswith("DELETE FROM app.sessions WHERE id IN (")
+    assert "(expires_at, id) > ($2, $3)" in statement
+    assert "LIMIT $4 FOR UPDATE SKIP LOCKED" in statement
+    assert "$5" not in statement
+    assert "LIMIT $2" in delete_chunk_statement(policy, "postgresql", after=False)
+
+
+def test_unknown_table_is_rejected():
+    """Test that only tables with a known retention column are accepted."""
+    with pytest.raises(ValueError, match="users"):
+        policies_from_settings({"users": 30})
@@ -0,0 +1,54 @@
+"""Test compact row types."""
+
+import json
+from datetime import datetime
+
+from app.models.base import BaseDBModel
+
+
+class Widget(BaseDBModel):
+    """Model used to generate rows."""
+
+    name: str
+    price: float
+
+
+NOW = datetime(2024, 1, 1)
+
+
+def test_row_type_mirrors_model_fields():
+    """Test that the generated row is slotted and follows field order."""
+    from app.models.rows import row_type
+
+    row = row_type(Widget)
+    assert row is row_type(Widget)
+    assert row.__slots__ == ("id", "created_at", "updated_at", "name", "price")
+    assert not hasattr(row(1, NOW, None, "a", 1.0), "__dict__")
+
+
+def test_rows_convert_to_schema_at_the_edge():
+    """Test that rows validate into the API schema."""
+    from app.models.rows import rows_from_mappings, rows_from_tuples, to_schema
+
+    rows = rows_from_tuples(Widget, [(1, NOW, None, "a", 1.5)])
+    rows += rows_from_mappings(
+        Widget,
+        [{"id": 2, "created_at": NOW, "updated_at": None, "name": "b", "price": 2}],
+    )
+
+    widgets = to_schema(rows, Widget)
+    assert [w.id for w in widgets] == [1, 2]
+    assert isinstance(widgets[1].price, float)
+
+
+def test_rows_serialize_like_models():
+    """Test that rows render the same JSON as the model."""
+    from app.core.responses import TrustedJSONResponse
+    from app.models.rows import rows_from_tuples
+
+    rows = rows_from_tuples(Widget, [(1, NOW, None, "a", 1.5)])
+    model = Widget(id=1, created_at=NOW, name="a", price=1.5)
+
+    assert json.loads(TrustedJSONResponse(rows).body) == [
+        json.loads(model.model_dump_json())
+    ]
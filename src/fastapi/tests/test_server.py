@@ -0,0 +1,85 @@
+"""Test the production server entry point."""
+
+import json
+
+import pytest
+
+
+def test_cgroup_v2_quota(tmp_path):
+    """Test reading a cgroup v2 CPU quota."""
+    from app.server import available_cpus, cgroup_cpu_limit
+
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_limit(tmp_path) == pytest.approx(1.5)
+    assert available_cpus(tmp_path) <= 2
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    """Test reading a cgroup v1 CPU quota."""
+    from app.server import cgroup_cpu_limit
+
+    cpu = tmp_path / "cpu"
+    cpu.mkdir()
+    (cpu / "cpu.cfs_quota_us").write_text("200000")
+    (cpu / "cpu.cfs_period_us").write_text("100000")
+    assert cgroup_cpu_limit(tmp_path) == pytest.approx(2.0)
+
+    (cpu / "cpu.cfs_quota_us").write_text("-1")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_workers_derived_from_cpu_quota(tmp_path):
+    """Test that the worker count follows the CPU quota unless WORKERS is set."""
+    from app.core.config import Settings
+    from app.server import build_options
+
+    (tmp_path / "cpu.max").write_text("100000 100000\n")
+
+    options = build_options(Settings(), cgroup_root=tmp_path)
+    assert options["workers"] == 1
+
+    options = build_options(Settings(WORKERS=3), cgroup_root=tmp_path)
+    assert options["workers"] == 3
+
+    options = build_options(Settings(WORKERS=3), workers=5, cgroup_root=tmp_path)
+    assert options["workers"] == 5
+
+
+def test_tuned_options_from_settings():
+    """Test that server options are read from settings."""
+    from app.core.config import Settings
+    from app.server import build_options
+
+    settings = Settings(
+        HOST="127.0.0.1",
+        PORT=9000,
+        SERVER_BACKLOG=512,
+        SERVER_KEEP_ALIVE_SECONDS=15,
+        SERVER_MAX_REQUESTS=5000,
+        SERVER_MAX_REQUESTS_JITTER=500,
+        DRAIN_TIMEOUT_SECONDS=20,
+    )
+    options = build_options(settings, workers=2, preload=True)
+
+    assert options["bind"] == "127.0.0.1:9000"
+    assert options["backlog"] == 512
+    assert options["keepalive"] == 15
+    assert options["max_requests"] == 5000
+    assert options["max_requests_jitter"] == 500
+    assert options["graceful_timeout"] >= 20
+    assert options["preload_app"] is True
+    assert options["loop"] in ("uvloop", "asyncio")
+    assert options["http"] in ("httptools", "h11")
+
+
+def test_print_config(capsys):
+    """Test that the CLI prints the derived options."""
+    from app.server import main
+
+    main(["--workers", "2", "--preload", "--print-config"])
+    options = json.loads(capsys.readouterr().out)
+    assert options["workers"] == 2
+    assert options["preload_app"] is True
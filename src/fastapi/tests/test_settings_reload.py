@@ -0,0 +1,141 @@
+"""Test reloading settings at runtime."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+
+
+@pytest.fixture
+def reloader(tmp_path, monkeypatch):
+    """Create a reloader for a private settings instance and env file."""
+    from app.core.settings_reload import SettingsReloader
+
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    env_file = tmp_path / ".env"
+    env_file.write_text("LOG_LEVEL=INFO\n")
+    return SettingsReloader(Settings(_env_file=env_file), env_file=env_file)
+
+
+@pytest.mark.asyncio
+async def test_reload_applies_changes_in_place(reloader):
+    """Test that reloadable changes are swapped in and subscribers notified."""
+    target = reloader.target
+    notified = []
+    reloader.subscribe("test", lambda config, changed: notified.append(changed))
+
+    reloader.env_file.write_text("LOG_LEVEL=DEBUG\nBATCH_MAX_REQUESTS=5\nPORT=9999\n")
+    result = await reloader.reload()
+
+    assert result == {
+        "applied": ["BATCH_MAX_REQUESTS", "LOG_LEVEL"],
+        "restart_required": ["PORT"],
+    }
+    assert reloader.target is target
+    assert target.LOG_LEVEL.value == "DEBUG"
+    assert target.BATCH_MAX_REQUESTS == 5
+    assert target.PORT == 8000
+    assert notified == [{"BATCH_MAX_REQUESTS", "LOG_LEVEL"}]
+
+
+@pytest.mark.asyncio
+async def test_invalid_settings_are_rejected(reloader):
+    """Test that a config failing validation leaves settings untouched."""
+    from app.core.settings_reload import SettingsReloadError
+
+    before = dict(reloader.target.__dict__)
+    reloader.env_file.write_text("LOG_LEVEL=DEBUG\nBATCH_MAX_REQUESTS=0\n")
+
+    with pytest.raises(SettingsReloadError) as exc_info:
+        await reloader.reload()
+
+    assert exc_info.value.errors[0]["loc"] == ("BATCH_MAX_REQUESTS",)
+    assert reloader.target.__dict__ == before
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_block_others(reloader):
+    """Test that one subscriber's error does not stop the others."""
+    seen = []
+
+    def broken(config, changed):
+        raise RuntimeError("boom")
+
+    reloader.subscribe("broken", broken)
+    reloader.subscribe("ok", lambda config, changed: seen.append(changed))
+    reloader.env_file.write_text("LOG_LEVEL=WARNING\n")
+
+    await reloader.reload()
+    assert seen == [{"LOG_LEVEL"}]
+
+
+@pytest.mark.asyncio
+async def test_env_file_watch(reloader):
+    """Test that editing the env file triggers a reload."""
+    reloader.start_watching(0.01)
+    await asyncio.sleep(0.02)
+    reloader.env_file.write_text("LOG_LEVEL=ERROR\n")
+    for _ in range(100):
+        if reloader.reloads:
+            break
+        await asyncio.sleep(0.01)
+    await reloader.stop_watching()
+
+    assert reloader.target.LOG_LEVEL.value == "ERROR"
+
+
+def test_limiter_retuned_within_bounds():
+    """Test that reconfiguring the limiter clamps its current limit."""
+    from app.core.concurrency import AdaptiveConcurrencyLimiter
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=100, max_limit=200)
+    limiter.configure(
+        min_limit=2, max_limit=10, latency_target=0.1, queue_size=5, queue_timeout=0.1
+    )
+    assert limiter.limit == 10
+    assert limiter.queue_size == 5
+
+
+def test_cors_follows_reload(monkeypatch, tmp_path):
+    """Test that the admin endpoint reloads CORS origins without a restart."""
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.core.settings_reload import settings_reloader
+    from app.main import create_app
+
+    saved = dict(settings.__dict__)
+    env_file = tmp_path / ".env"
+    env_file.write_text("")
+    monkeypatch.setattr(settings_reloader, "env_file", env_file)
+    monkeypatch.delenv("ALLOWED_ORIGINS", raising=False)
+
+    def preflight(client):
+        return client.options(
+            "/health",
+            headers={
+                "Origin": "https://new.example.com",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+
+    try:
+        client = TestClient(create_app())
+        assert preflight(client).status_code == 400
+
+        env_file.write_text('ALLOWED_ORIGINS=["https://new.example.com"]\n')
+        response = client.post("/admin/settings/reload")
+        assert response.status_code == 200
+        assert "ALLOWED_ORIGINS" in response.json()["applied"]
+
+        response = preflight(client)
+        assert response.status_code == 200
+        assert (
+            response.headers["access-control-allow-origin"] == "https://new.example.com"
+        )
+
+        env_file.write_text("BATCH_MAX_REQUESTS=0\n")
+        assert client.post("/admin/settings/reload").status_code == 400
+    finally:
+        object.__setattr__(settings, "__dict__", saved)
@@ -0,0 +1,145 @@
+"""Test the shared-memory cache used across workers."""
+
+import multiprocessing
+import time
+
+import pytest
+
+from app.core.shared_cache import SEQ, SharedCache
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    """Open a small cache in a temp file."""
+    cache = SharedCache(tmp_path / "cache.mmap", slots=16, slot_bytes=128, ways=4)
+    cache.open()
+    yield cache
+    await cache.close()
+
+
+def fill_from_child(path: str) -> None:
+    """Write entries from another process."""
+    cache = SharedCache(path, slots=16, slot_bytes=128, ways=4)
+    cache.open()
+    for n in range(3):
+        cache.set(f"child-{n}", {"n": n})
+
+
+async def test_get_set_delete(cache):
+    """Test storing, overwriting and deleting values."""
+    assert cache.get("flags") is None
+    assert cache.set("flags", {"beta": True})
+    assert cache.get("flags") == {"beta": True}
+    assert cache.set("flags", {"beta": False})
+    assert cache.get("flags") == {"beta": False}
+    assert cache.delete("flags")
+    assert not cache.delete("flags")
+    assert cache.get("flags", "missing") == "missing"
+    assert not cache.set("large", "x" * 200)
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+async def test_ttl_expiry(cache):
+    """Test that expired entries are not returned."""
+    cache.set("short", 1, ttl=0.05)
+    cache.set("forever", 2)
+    assert cache.get("short") == 1
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert cache.get("forever") == 2
+    assert cache.snapshot()["entries"] == 1
+
+
+async def test_get_or_set(cache):
+    """Test that the factory only runs on a miss."""
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return [1, 2]
+
+    assert await cache.get_or_set("lookup", factory) == [1, 2]
+    assert await cache.get_or_set("lookup", factory) == [1, 2]
+    assert len(calls) == 1
+
+
+async def test_clock_eviction_keeps_recently_used(tmp_path):
+    """Test that a full set evicts an entry that was not read since its insert."""
+    cache = SharedCache(tmp_path / "one-set.mmap", slots=4, slot_bytes=128, ways=4)
+    cache.open()
+    try:
+        for n in range(4):
+            cache.set(f"k{n}", n)
+        for n in (0, 2, 3):
+            assert cache.get(f"k{n}") == n
+        cache.set("k4", 4)
+        assert cache.get("k1") is None
+        assert [cache.get(f"k{n}") for n in (0, 2, 3, 4)] == [0, 2, 3, 4]
+    finally:
+        await cache.close()
+
+
+async def test_shared_between_processes_and_reopen(cache):
+    """Test that entries written by another process are visible and persist."""
+    process = multiprocessing.get_context("fork").Process(
+        target=fill_from_child, args=(str(cache.path),)
+    )
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+    assert [cache.get(f"child-{n}") for n in range(3)] == [
+        {"n": 0},
+        {"n": 1},
+        {"n": 2},
+    ]
+
+    # A recycled worker maps the same file and finds the entries
+    replacement = SharedCache(cache.path, slots=16, slot_bytes=128, ways=4)
+    replacement.open()
+    try:
+        assert replacement.get("child-1") == {"n": 1}
+    finally:
+        await replacement.close()
+
+
+async def test_half_written_slot_is_skipped_and_recovered(cache):
+    """Test that a slot left mid-write by a dead worker is a miss, then reused."""
+    cache.set("torn", "value")
+    offset = next(
+        cache._slot(set_index, way)[1]
+        for set_index in range(cache.sets)
+        for way in range(cache.ways)
+        if SEQ.unpack_from(cache._mm, cache._slot(set_index, way)[1])[0]
+    )
+    seq = SEQ.unpack_from(cache._mm, offset)[0]
+    SEQ.pack_into(cache._mm, offset, seq + 1)
+
+    assert cache.get("torn") is None
+    assert cache.set("torn", "again")
+    assert cache.get("torn") == "again"
+    assert SEQ.unpack_from(cache._mm, offset)[0] % 2 == 0
+
+
+async def test_changed_geometry_resets_file(cache):
+    """Test that a cache with different slot settings gets a new file.
+
+    A worker still mapping the old file keeps working with it.
+    """
+    cache.set("key", 1)
+
+    resized = SharedCache(cache.path, slots=8, slot_bytes=64, ways=4)
+    resized.open()
+    reopened = SharedCache(cache.path, slots=8, slot_bytes=64, ways=4)
+    reopened.open()
+    try:
+        assert resized.get("key") is None
+        assert cache.path.stat().st_size == resized.size
+        assert cache.get("key") == 1
+        cache.set("old", 2)
+        resized.set("new", 3)
+        assert reopened.get("new") == 3
+        assert reopened.get("old") is None
+        assert list(cache.path.parent.glob(".*.tmp")) == []
+    finally:
+        await resized.close()
+        await reopened.close()
@@ -0,0 +1,118 @@
+"""Test the SQLite database backend."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+async def database(tmp_path):
+    """Open a tuned SQLite database in a temporary directory."""
+    from app.db.sqlite import SQLiteDatabase
+
+    db = SQLiteDatabase(str(tmp_path / "test.db"), readers=2, busy_timeout=0.2)
+    await db.connect()
+    session = db.session()
+    await session.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    await session.commit()
+    yield db
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_tuned(database):
+    """Test that the writer uses WAL and readers are read-only."""
+    journal = await database.write("PRAGMA journal_mode", ())
+    assert journal[0][0] == "wal"
+
+    synchronous = await database.read("SELECT * FROM pragma_synchronous", ())
+    assert synchronous[0][0] == 1  # NORMAL
+
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        await database.read("DELETE FROM items", ())
+
+
+@pytest.mark.asyncio
+async def test_session_reads_its_own_writes(database):
+    """Test that reads after a write see the uncommitted transaction."""
+    writer = database.session()
+    await writer.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+    rows = await writer.execute("SELECT name FROM items")
+    assert [row["name"] for row in rows] == ["a"]
+
+    # Other sessions read the last committed snapshot without blocking
+    reader = database.session()
+    assert await reader.execute("SELECT name FROM items") == []
+
+    await writer.commit()
+    rows = await reader.execute("SELECT name FROM items")
+    assert [row["name"] for row in rows] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_writes(database):
+    """Test that get_db-style rollback releases the writer."""
+    session = database.session()
+    await session.execute("INSERT INTO items (name) VALUES ('gone')")
+    await session.close()
+
+    other = database.session()
+    await other.execute("INSERT INTO items (name) VALUES ('kept')")
+    await other.commit()
+
+    rows = await database.read("SELECT name FROM items", ())
+    assert [row["name"] for row in rows] == ["kept"]
+
+
+@pytest.mark.asyncio
+async def test_writer_busy_timeout(database):
+    """Test that a second writer gives up after the busy timeout."""
+    holder = database.session()
+    await holder.execute("INSERT INTO items (name) VALUES ('x')")
+
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        await database.session().execute("INSERT INTO items (name) VALUES ('y')")
+
+    await holder.commit()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions(database):
+    """Test that concurrent writers are serialized and readers keep working."""
+
+    async def insert(n):
+        session = database.session()
+        await session.execute("INSERT INTO items (name) VALUES (?)", (str(n),))
+        await session.commit()
+
+    async def count():
+        rows = await database.session().execute("SELECT count(*) AS n FROM items")
+        return rows[0]["n"]
+
+    await asyncio.gather(*(insert(n) for n in range(20)), *(count() for _ in range(20)))
+    assert await count() == 20
+
+
+@pytest.mark.asyncio
+async def test_explain_returns_query_plan(database):
+    """Test that slow-query explain works on SQLite."""
+    plan = await database.session().explain("SELECT * FROM items WHERE id = ?", (1,))
+    assert "items" in plan
+
+
+@pytest.mark.asyncio
+async def test_get_db_uses_sqlite_url(monkeypatch, tmp_path):
+    """Test that get_db hands out SQLite sessions for sqlite:/// URLs."""
+    from app.core.config import settings
+    from app.db import session
+
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/app.db")
+    await session.init_db()
+    try:
+        async with session.get_db() as db:
+            assert db.dialect == "sqlite"
+            assert (await db.execute("SELECT 1 AS ok"))[0]["ok"] == 1
+    finally:
+        await session.close_db()
+    assert session.sqlite_database is None
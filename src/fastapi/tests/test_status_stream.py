@@ -0,0 +1,122 @@
+"""Test the status broadcaster and Server-Sent Events stream."""
+
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_broadcast_fans_out_shared_message():
+    """Test that one published message reaches every subscriber."""
+    from app.core.broadcast import Broadcaster
+
+    broadcaster = Broadcaster(queue_size=4)
+    subscriptions = [broadcaster.subscribe() for _ in range(1000)]
+
+    message = b"event: status\ndata: {}\n\n"
+    broadcaster.publish(message)
+
+    received = [s.queue.get_nowait() for s in subscriptions]
+    assert all(m is message for m in received)
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_are_dropped():
+    """Test that subscribers whose queue fills up are disconnected."""
+    from app.core.broadcast import Broadcaster
+
+    broadcaster = Broadcaster(queue_size=2)
+    slow = broadcaster.subscribe()
+    fast = broadcaster.subscribe()
+
+    for n in range(3):
+        broadcaster.publish(b"%d" % n)
+        await fast.queue.get()
+
+    assert slow.closed
+    assert slow not in broadcaster.subscribers
+    assert [m async for m in slow] == []
+    assert broadcaster.dropped_total == 1
+    assert fast in broadcaster.subscribers
+
+
+def test_subscriber_limit():
+    """Test that subscriptions are refused at capacity."""
+    from app.core.broadcast import Broadcaster
+
+    broadcaster = Broadcaster(max_subscribers=1)
+    assert broadcaster.subscribe() is not None
+    assert broadcaster.subscribe() is None
+
+
+@pytest.mark.asyncio
+async def test_publishes_only_changes_with_heartbeats():
+    """Test that the ticker computes once per tick and publishes on change."""
+    from app.core.broadcast import Broadcaster
+    from app.services.status import HEARTBEAT, StatusStream
+
+    calls = 0
+    state = {"ready": True}
+
+    async def provider():
+        nonlocal calls
+        calls += 1
+        return dict(state)
+
+    stream = StatusStream(provider, Broadcaster(), interval=0.01, heartbeat=0.05)
+    subscriptions = [await stream.subscribe() for _ in range(50)]
+    assert calls == 1
+
+    stream.start()
+    await asyncio.sleep(0.03)
+    state["ready"] = False
+    await asyncio.sleep(0.1)
+
+    queue = subscriptions[0].queue
+    messages = [queue.get_nowait() for _ in range(queue.qsize())]
+    await stream.stop()
+    events = [m for m in messages if m != HEARTBEAT]
+    assert len(events) == 2
+    assert json.loads(events[1].split(b"data: ")[1])["ready"] is False
+    assert HEARTBEAT in messages
+    # The snapshot is computed once per tick, not once per subscriber
+    assert calls < 20
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_sends_snapshot_first(monkeypatch):
+    """Test that a new stream starts with the current status."""
+    from app.api import status
+    from app.core.lifecycle import lifecycle
+
+    monkeypatch.setattr(lifecycle, "draining", False)
+    monkeypatch.setattr(status.status_stream, "_status", None)
+
+    response = await status.stream_status()
+    assert response.media_type == "text/event-stream"
+
+    body = response.body_iterator
+    assert (await anext(body)).startswith(b"retry: ")
+    event = await anext(body)
+    assert event.startswith(b"event: status\n")
+    snapshot = json.loads(event.split(b"data: ")[1])
+    assert snapshot["ready"] is True
+    assert snapshot["checks"]["database"] is True
+
+    await body.aclose()
+    assert not status.status_stream.broadcaster.subscribers
+
+
+@pytest.mark.asyncio
+async def test_stream_refused_while_draining(monkeypatch):
+    """Test that draining workers do not accept new streams."""
+    from fastapi import HTTPException
+
+    from app.api import status
+    from app.core.lifecycle import lifecycle
+
+    monkeypatch.setattr(lifecycle, "draining", True)
+    with pytest.raises(HTTPException) as exc_info:
+        await status.stream_status()
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,108 @@
+"""Test the startup warm-up and the readiness it gates."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.core.responses import list_adapter
+from app.core.warmup import WarmUp, api_routes, warm_serializers
+from app.db.sqlite import SQLiteDatabase
+from app.main import app
+
+
+class Widget(BaseModel):
+    """A model only served in lists."""
+
+    name: str
+
+
+def create_app() -> tuple[FastAPI, dict[str, int]]:
+    """Create an app with a counting route."""
+    test_app = FastAPI()
+    calls = {"features": 0}
+
+    @test_app.get("/features", response_model=dict[str, bool])
+    async def features():
+        calls["features"] += 1
+        return {"docs": True}
+
+    @test_app.get("/widgets", response_model=list[Widget])
+    async def widgets():
+        return []
+
+    return test_app, calls
+
+
+async def test_warm_up_runs_steps():
+    """Test that serializers are built and paths requested once."""
+    test_app, calls = create_app()
+    list_adapter.cache_clear()
+    warmup = WarmUp()
+
+    await warmup.run(test_app, ["/features"], db_connections=0)
+
+    assert calls["features"] == 1
+    assert list_adapter.cache_info().currsize == 1
+    assert set(warmup.steps) == {"database", "serializers", "requests"}
+    assert test_app.openapi_schema is not None
+
+
+def test_all_api_routes_are_found():
+    """Test that routes of nested routers are listed."""
+    paths = {route.path for route in api_routes(app)}
+    assert {"/ready", "/admin/retention", "/api/v1/items/search"} <= paths
+    assert warm_serializers(app) > 0
+
+
+async def test_ready_reports_not_ready_until_warm(monkeypatch):
+    """Test that readiness is withheld while the warm-up runs."""
+    warmup = WarmUp()
+    monkeypatch.setattr("app.api.health.warmup", warmup)
+    release = asyncio.Event()
+
+    async def slow_run(*args):
+        await release.wait()
+
+    monkeypatch.setattr(warmup, "run", slow_run)
+    warmup.start(app)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["checks"]["warmed_up"] is False
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert (await client.get("/ready")).json()["checks"]["warmed_up"] is True
+    await warmup.stop()
+
+
+async def test_timeout_marks_warm_up_done(monkeypatch):
+    """Test that a stuck warm-up stops withholding readiness."""
+    warmup = WarmUp()
+
+    async def stuck(*args):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(warmup, "run", stuck)
+    warmup.start(app, timeout=0.05)
+    assert warmup.pending
+    await asyncio.sleep(0.1)
+    assert not warmup.pending
+    await warmup.stop()
+
+
+@pytest.mark.parametrize("count", [1, 3])
+async def test_open_readers(tmp_path, count):
+    """Test that reader connections are opened up front, one per thread."""
+    database = SQLiteDatabase(str(tmp_path / "warm.db"), readers=3)
+    await database.connect()
+    try:
+        assert await database.open_readers(count) == count
+        assert await database.open_readers(5) == 3
+    finally:
+        await database.close()
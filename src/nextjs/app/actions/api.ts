@@ -3,6 +3,8 @@
 import { HealthResponse, ReadinessResponse, LivenessResponse, ConfigResponse } from "@/types/api";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+// Give up on slow calls; closing the connection cancels the work on the API
+const API_TIMEOUT_MS = Number(process.env.API_TIMEOUT_MS) || 10000;
 
 async function fetchFromAPI<T>(endpoint: string): Promise<T> {
   const url = `${API_URL}${endpoint}`;
@@ -14,6 +16,7 @@ async function fetchFromAPI<T>(endpoint: string): Promise<T> {
         "Content-Type": "application/json",
       },
       cache: "no-store",
+      signal: AbortSignal.timeout(API_TIMEOUT_MS),
     });
 
     if (!response.ok) {
@@ -41,4 +44,52 @@ export async function getServerLiveness(): Promise<LivenessResponse> {
 
 export async function getServerConfig(): Promise<ConfigResponse> {
   return fetchFromAPI<ConfigResponse>("/api/config");
-}
\ No newline at end of file
+}
+
+interface BatchResult<T> {
+  id: string;
+  status: number;
+  body: T;
+}
+
+export interface ServerStatus {
+  health: HealthResponse;
+  readiness: ReadinessResponse;
+  liveness: LivenessResponse;
+  config: ConfigResponse;
+}
+
+/**
+ * Fetch health, readiness, liveness and config in a single round trip.
+ */
+export async function getServerStatus(): Promise<ServerStatus> {
+  const url = `${API_URL}/api/v1/batch`;
+  const requests = [
+    { id: "health", path: "/health" },
+    { id: "readiness", path: "/ready" },
+    { id: "liveness", path: "/live" },
+    { id: "config", path: "/config" },
+  ];
+
+  try {
+    const response = await fetch(url, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ requests }),
+      cache: "no-store",
+      signal: AbortSignal.timeout(API_TIMEOUT_MS),
+    });
+
+    if (!response.ok) {
+      throw new Error(`API request failed: ${response.status} ${response.statusText}`);
+    }
+
+    const { results } = (await response.json()) as { results: BatchResult<unknown>[] };
+    return Object.fromEntries(results.map((result) => [result.id, result.body])) as unknown as ServerStatus;
+  } catch (error) {
+    console.error("Error fetching server status:", error);
+    throw error;
+  }
+}
@@ -1,38 +1,15 @@
 "use client";
 
-import { useEffect, useState } from "react";
 import { Card, CardContent } from "@/components/ui/card";
 import { Loading } from "@/components/common/loading";
-import { healthService } from "@/services/health";
-import { HealthResponse } from "@/types/api";
+import { useStatusStream } from "@/hooks/useStatusStream";
 import { CheckCircle2, XCircle, AlertCircle, Activity } from "lucide-react";
 import { cn } from "@/lib/utils";
 
 export function ApiStatus() {
-  const [status, setStatus] = useState<HealthResponse | null>(null);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
-
-  useEffect(() => {
-    const checkHealth = async () => {
-      try {
-        setLoading(true);
-        setError(null);
-        const response = await healthService.getHealth();
-        setStatus(response);
-      } catch (err) {
-        setError("Unable to connect to API");
-        console.error("Health check failed:", err);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    checkHealth();
-    // Refresh every 30 seconds
-    const interval = setInterval(checkHealth, 30000);
-    return () => clearInterval(interval);
-  }, []);
+  // Status changes are pushed by the API instead of polled every 30 seconds
+  const { status, isLoading: loading, isError } = useStatusStream();
+  const error = isError ? "Unable to connect to API" : null;
 
   if (loading) {
     return (
@@ -47,7 +24,7 @@ export function ApiStatus() {
     );
   }
 
-  const isHealthy = status?.status === "healthy";
+  const isHealthy = status?.health === "healthy" && status.ready && status.alive;
   const statusIcon = error ? (
     <XCircle className="h-5 w-5 text-destructive" />
   ) : isHealthy ? (
@@ -79,7 +56,7 @@ export function ApiStatus() {
               <span>Version: {status.version}</span>
               {status.timestamp && (
                 <span>
-                  Last checked: {new Date(status.timestamp).toLocaleTimeString()}
+                  Last changed: {new Date(status.timestamp).toLocaleTimeString()}
                 </span>
               )}
             </div>
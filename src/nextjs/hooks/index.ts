@@ -1,3 +1,4 @@
 export { useApi } from "./useApi";
 export { useDebounce } from "./useDebounce";
-export { useLocalStorage } from "./useLocalStorage";
\ No newline at end of file
+export { useLocalStorage } from "./useLocalStorage";
+export { useStatusStream } from "./useStatusStream";
\ No newline at end of file
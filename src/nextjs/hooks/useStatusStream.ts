@@ -0,0 +1,31 @@
+import { useEffect, useState } from "react";
+import { StatusSnapshot } from "@/types/api";
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+
+/**
+ * Subscribe to pushed status changes instead of polling the probe endpoints.
+ * EventSource reconnects on its own using the retry delay sent by the server.
+ */
+export function useStatusStream() {
+  const [status, setStatus] = useState<StatusSnapshot | null>(null);
+  const [isError, setIsError] = useState(false);
+
+  useEffect(() => {
+    const source = new EventSource(`${API_URL}/api/status/stream`);
+
+    source.addEventListener("status", (event) => {
+      setStatus(JSON.parse((event as MessageEvent).data));
+      setIsError(false);
+    });
+    source.onerror = () => setIsError(true);
+
+    return () => source.close();
+  }, []);
+
+  return {
+    status,
+    isLoading: status === null && !isError,
+    isError,
+  };
+}
@@ -34,6 +34,17 @@ export interface ConfigResponse {
   version: string;
 }
 
+export interface StatusSnapshot {
+  health: "healthy" | "unhealthy";
+  ready: boolean;
+  checks: Record<string, boolean>;
+  alive: boolean;
+  version: string;
+  environment: string;
+  features: Record<string, boolean>;
+  timestamp: string;
+}
+
 export interface ApiErrorResponse {
   detail: string;
   status?: number;